@@ -1,5 +1,30 @@
+import importlib
 import importlib.metadata
+from typing import Any
 
-__version__: str = importlib.metadata.version("pelc")
+__all__: list[str] = [
+    "batch_eplet_comp", "batch_eplet_comp_aux", "core", "eplet_database", "output_type", "result_cache",
+    "simple_comparison"
+]
 
-from . import batch_eplet_comp, batch_eplet_comp_aux, output_type
+
+def __getattr__(name: str) -> Any:
+    """
+    The version and the submodules are only loaded on first access, so that importing pelc (or pelc.core) doesn't
+    import pandas.
+
+    :param name: "__version__" or name of a submodule of pelc
+    :return: the version of pelc or the submodule
+    """
+    if name == "__version__":
+        return importlib.metadata.version("pelc")
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    """
+    :return: public attributes of pelc, including the submodules that are not imported yet
+    """
+    return sorted(set(globals()) | set(__all__) | {"__version__"})
@@ -0,0 +1,44 @@
+import re
+from functools import lru_cache
+
+
+_NULL_ALLELE_PATTERN: re.Pattern = re.compile(r"^(.*\*).*N$")
+_DRB345_GHOST_ALLELES: tuple[str, ...] = ("DRB3*", "DRB4*", "DRB5*")
+
+
+@lru_cache(maxsize=1 << 16)
+def _normalise_allele(allele: str) -> str:
+    """
+    :param allele: allele name
+    :return: the allele as _normalise_typings replaces it (null alleles are replaced by the ghost allele of their
+             locus, and the DRB3*, DRB4* and DRB5* ghost alleles by DRB345*)
+
+    The results are cached, so that repeated runs over the same cohort do not rewrite its alleles again.
+    """
+    allele = _NULL_ALLELE_PATTERN.sub(r"\1", allele)
+    if allele in _DRB345_GHOST_ALLELES:
+        return "DRB345*"
+    return allele
+
+
+_LOCUS_DISPATCH: dict[str, str] = {
+    # allele prefix: suffix of the eplets of the locus
+    "A": "ABC",
+    "B": "ABC",
+    "C": "ABC",
+    "DR": "DR",
+    "DQ": "DQ",
+    "DP": "DP",
+}
+
+
+def _allele_locus(allele: str) -> str | None:
+    """
+    :param allele: allele (e.g. "A*01:01" or "DRB1*04:05")
+    :return: key of _LOCUS_DISPATCH the allele belongs to ("A", "B", "C", "DR", "DQ" or "DP"), None if undefined
+    """
+    if allele[0:2] in _LOCUS_DISPATCH:
+        return allele[0:2]
+    if allele[0] in _LOCUS_DISPATCH:
+        return allele[0]
+    return None
@@ -0,0 +1,523 @@
+import json
+import os
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TypeVar
+
+import numpy as np
+
+from pelc._alleles import _LOCUS_DISPATCH, _allele_locus
+from pelc._cache import _file_hash
+
+
+_WORD_DTYPE: np.dtype = np.dtype("<u8")
+# bitsets are stored as little-endian 64-bit words: eplet id i is bit i % 64 of word i // 64
+_BITS_PER_WORD: int = 64
+_DETAILS_CHUNK_SIZE: int = 65536
+# number of rows unpacked at once when the mismatching eplets are converted back to their names
+_CROSS_BLOCK_WORDS: int = 1 << 16
+# maximum number of (donor, recipient) pairs of a block of the cross-product mismatches
+EPLET_LOCI: tuple[str, ...] = ("ABC", "DR", "DQ", "DP", "i2")
+EPLET_INDEX_FILE_NAME: str = "eplet_index.bin"
+# compiled EpletIndex shipped in the data folder (cf. pelc.eplet_database.compile_eplet_index)
+_INDEX_FILE_MAGIC: bytes = b"PELCIDX1"
+_INDEX_FILE_ALIGNMENT: int = 64
+_INDEX_FORMAT_VERSION: int = 3
+# to be incremented whenever the content of the compiled EpletIndex changes for the same csv files
+
+
+def _eplet_index_source_paths(directory_path: str) -> list[str]:
+    """
+    :param directory_path: path to where the data folder is located
+    :return: paths to the csv files of the EpRegistry database the EpletIndex is compiled from
+    """
+    return [f"{directory_path}/data/{locus}.csv" for locus in _LOCUS_DISPATCH] + [f"{directory_path}/data/ep_data.csv"]
+
+
+def _eplet_index_source_hashes(directory_path: str) -> dict[str, str]:
+    """
+    :param directory_path: path to where the data folder is located
+    :return: hash of each csv file of the EpRegistry database (file name: hash)
+    """
+    return {os.path.basename(path): _file_hash(path) for path in _eplet_index_source_paths(directory_path)}
+
+
+def _pack_bitsets(is_set: np.ndarray, n_words: int) -> np.ndarray:
+    """
+    :param is_set: boolean numpy.ndarray of shape (number of rows, number of eplets)
+    :param n_words: number of 64-bit words of each bitset
+
+    :return: numpy.ndarray of shape (number of rows, n_words) with the corresponding bitsets
+    """
+    padded: np.ndarray = np.zeros((is_set.shape[0], n_words * _BITS_PER_WORD), dtype=bool)
+    padded[:, :is_set.shape[1]] = is_set
+
+    return np.packbits(padded, axis=1, bitorder="little").view(_WORD_DTYPE)
+
+
+def _eplet_mask(
+        eplet_loci: np.ndarray,
+        verified_mask: np.ndarray,
+        verified_or_questionable_mask: np.ndarray,
+        class_i: bool = True,
+        class_ii: bool = True,
+        verified_only: bool = False,
+        include_questionable: bool = False,
+        interlocus2: bool = True
+) -> np.ndarray:
+    """
+    :param eplet_loci: locus of each eplet id ("ABC", "DR", "DQ", "DP" or "i2" for interlocus eplets)
+    :param verified_mask: bitset of the antibody-verified eplets
+    :param verified_or_questionable_mask: bitset of the antibody-verified eplets, questionable ones included
+    :param class_i: keep class I eplets?
+    :param class_ii: keep class II eplets?
+    :param verified_only: keep only antibody-verified eplets?
+    :param include_questionable: also keep questionable antibody-verified eplets? Ignored if verified_only is False.
+    :param interlocus2: keep interlocus eplets? (only relevant for HLA of class II)
+
+    :return: bitset (numpy.ndarray of shape (number of words,)) of the eplets that should be taken into account
+    """
+    is_kept: np.ndarray = np.ones(len(eplet_loci), dtype=bool)
+    if not class_i:
+        is_kept &= eplet_loci != "ABC"
+    if not class_ii:
+        is_kept &= eplet_loci == "ABC"
+    if not interlocus2:
+        is_kept &= eplet_loci != "i2"
+
+    mask: np.ndarray = _pack_bitsets(is_kept[np.newaxis, :], len(verified_mask))[0]
+    if verified_only:
+        if include_questionable:
+            mask &= verified_or_questionable_mask
+        else:
+            mask &= verified_mask
+
+    return mask
+
+
+_BYTE_POPCOUNTS: np.ndarray = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(axis=1)
+# number of set bits of each byte value (used when numpy.bitwise_count is not available, i.e. numpy < 2.0)
+
+
+def _word_popcount(words: np.ndarray) -> np.ndarray:
+    """
+    :param words: numpy.ndarray of 64-bit words
+    :return: numpy.ndarray of the same shape with the number of set bits of each word
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    return _BYTE_POPCOUNTS[np.ascontiguousarray(words).view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1)
+
+
+def _popcount(bitsets: np.ndarray) -> np.ndarray:
+    """
+    :param bitsets: numpy.ndarray of shape (..., number of words)
+    :return: numpy.ndarray of shape (...) with the number of eplets in each bitset
+    """
+    return _word_popcount(bitsets).sum(axis=-1, dtype=np.int64)
+
+
+def _repertoires(codes: np.ndarray, bitsets: np.ndarray) -> np.ndarray:
+    """
+    :param codes: numpy.ndarray of shape (number of typings, number of alleles) with the row of each allele in bitsets
+                  (-1 for no allele)
+    :param bitsets: numpy.ndarray of shape (number of alleles, number of words) with the eplets of each allele
+
+    :return: numpy.ndarray of shape (len(codes), number of words): bitwise OR of the bitsets of the alleles of each row
+    """
+    # one allele column at a time, so that only one (number of typings, number of words) block is gathered at once
+    repertoires: np.ndarray = np.zeros((len(codes), bitsets.shape[1]), dtype=_WORD_DTYPE)
+    column: int
+    for column in range(codes.shape[1]):
+        column_codes: np.ndarray = codes[:, column]
+        if (column_codes >= 0).all():
+            repertoires |= bitsets[column_codes]
+        else:
+            np.bitwise_or(
+                repertoires, bitsets[column_codes], out=repertoires, where=(column_codes >= 0)[:, np.newaxis]
+            )
+
+    return repertoires
+
+
+def _mismatches(
+        donor_codes: np.ndarray,
+        recipient_codes: np.ndarray,
+        bitsets: np.ndarray,
+        mask: np.ndarray
+) -> np.ndarray:
+    """
+    :param donor_codes: numpy.ndarray of shape (number of pairs, number of alleles) with the row of each donor allele
+                        in bitsets
+    :param recipient_codes: same for the recipients, row-aligned with donor_codes
+    :param bitsets: numpy.ndarray of shape (number of alleles, number of words) with the eplets of each allele
+    :param mask: bitset of the eplets to take into account
+
+    :return: numpy.ndarray of shape (number of pairs, number of words) with the eplets that are present on the donor's
+             HLA molecules but not on the recipient's ones
+    """
+    return _repertoires(donor_codes, bitsets) & ~_repertoires(recipient_codes, bitsets) & mask
+
+
+_ROW_HASH_MULTIPLIER: np.uint64 = np.uint64(0x9E3779B97F4A7C15)
+# odd 64-bit constant of the polynomial hash of the rows of allele codes (cf. _distinct_genotypes)
+
+
+def _distinct_genotypes(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :param codes: numpy.ndarray of shape (number of typings, number of alleles) with the row of each allele in bitsets
+
+    :return: distinct genotypes (numpy.ndarray of shape (number of distinct genotypes, number of alleles), the alleles
+             of each genotype being sorted, so that the order of the columns doesn't matter) and the position of the
+             genotype of each typing in it
+    """
+    sorted_codes: np.ndarray = np.ascontiguousarray(np.sort(codes, axis=1))
+    if sorted_codes.shape[1] == 0:
+        return sorted_codes[:min(len(sorted_codes), 1)], np.zeros(len(sorted_codes), dtype=np.int64)
+
+    # rows are grouped by a 64-bit hash (much faster to sort than the rows themselves), then compared as a whole
+    row_hashes: np.ndarray = np.zeros(len(sorted_codes), dtype=np.uint64)
+    column: int
+    for column in range(sorted_codes.shape[1]):
+        row_hashes *= _ROW_HASH_MULTIPLIER
+        row_hashes += sorted_codes[:, column].astype(np.uint64)
+    first_positions: np.ndarray
+    inverse: np.ndarray
+    _, first_positions, inverse = np.unique(row_hashes, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    if len(first_positions) < len(sorted_codes) and not (sorted_codes[first_positions][inverse] == sorted_codes).all():
+        # hash collision (only possible if some rows were grouped together)
+        rows: np.ndarray = sorted_codes.view(np.dtype((np.void, sorted_codes.dtype.itemsize * sorted_codes.shape[1])))
+        _, first_positions, inverse = np.unique(rows.ravel(), return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+
+    return sorted_codes[first_positions], inverse
+
+
+def _distinct_pairs(
+        donor_codes: np.ndarray,
+        recipient_codes: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :param donor_codes: numpy.ndarray of shape (number of pairs, number of alleles) with the row of each donor allele
+                        in bitsets
+    :param recipient_codes: same for the recipients, row-aligned with donor_codes
+
+    :return: distinct donor genotypes, distinct recipient genotypes (cf. _distinct_genotypes), position of the donor
+             genotype and of the recipient genotype of each distinct pair, and position of the distinct pair of each
+             original pair (so that the results of the distinct pairs are scattered back with result[pair_inverse])
+    """
+    donor_genotypes, donor_inverse = _distinct_genotypes(donor_codes)
+    recipient_genotypes, recipient_inverse = _distinct_genotypes(recipient_codes)
+
+    if len(donor_genotypes) == len(donor_codes) or len(recipient_genotypes) == len(recipient_codes):
+        # all the pairs are distinct
+        return donor_genotypes, recipient_genotypes, donor_inverse, recipient_inverse, np.arange(len(donor_codes))
+
+    pair_ids: np.ndarray = donor_inverse.astype(np.int64) * max(len(recipient_genotypes), 1) + recipient_inverse
+    distinct_pair_ids: np.ndarray
+    pair_inverse: np.ndarray
+    distinct_pair_ids, pair_inverse = np.unique(pair_ids, return_inverse=True)
+    pair_donors, pair_recipients = np.divmod(distinct_pair_ids, max(len(recipient_genotypes), 1))
+
+    return donor_genotypes, recipient_genotypes, pair_donors, pair_recipients, pair_inverse.ravel()
+
+
+def _cross_mismatch_counts(
+        donor_repertoires: np.ndarray,
+        recipient_repertoires: np.ndarray,
+        masks: list[np.ndarray],
+        out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Number of mismatching eplets of every donor against every recipient, computed word by word and by blocks so that
+    the memory used doesn't depend on the number of donors and recipients.
+
+    :param donor_repertoires: numpy.ndarray of shape (number of donors, number of words)
+    :param recipient_repertoires: numpy.ndarray of shape (number of recipients, number of words)
+    :param masks: bitsets of the eplets to count, one count matrix is computed for each of them
+    :param out: numpy.ndarray of shape (len(masks), number of donors, number of recipients) to write the counts to (e.g.
+                a view of a numpy.memmap). If None, a new one is allocated.
+
+    :return: numpy.ndarray of shape (len(masks), number of donors, number of recipients) (out if it was given)
+    """
+    n_donors: int = len(donor_repertoires)
+    n_recipients: int = len(recipient_repertoires)
+    counts: np.ndarray
+    if out is None:
+        counts = np.zeros((len(masks), n_donors, n_recipients), dtype=np.int32)
+    else:
+        counts = out
+        counts[...] = 0
+
+    # one contiguous row per word
+    donor_words: np.ndarray = np.ascontiguousarray(donor_repertoires.T)
+    not_recipient_words: np.ndarray = np.ascontiguousarray(~recipient_repertoires.T)
+
+    recipients_block_size: int = max(1, min(n_recipients, _CROSS_BLOCK_WORDS))
+    donors_block_size: int = max(1, _CROSS_BLOCK_WORDS // recipients_block_size)
+    donors_start: int
+    recipients_start: int
+    word: int
+    for donors_start in range(0, n_donors, donors_block_size):
+        donors_stop: int = min(n_donors, donors_start + donors_block_size)
+        for recipients_start in range(0, n_recipients, recipients_block_size):
+            recipients_stop: int = min(n_recipients, recipients_start + recipients_block_size)
+            for word in range(len(donor_words)):
+                mismatches: np.ndarray = (
+                    donor_words[word, donors_start:donors_stop, np.newaxis]
+                    & not_recipient_words[word, np.newaxis, recipients_start:recipients_stop]
+                )
+                mask_number: int
+                mask: np.ndarray
+                for mask_number, mask in enumerate(masks):
+                    if mask[word] != 0:  # nothing to count otherwise
+                        counts[mask_number, donors_start:donors_stop, recipients_start:recipients_stop] += (
+                            _word_popcount(mismatches & mask[word])
+                        )
+
+    return counts
+
+
+def _bitsets_to_eplet_names(bitsets: np.ndarray, eplet_names: np.ndarray) -> list[list[str]]:
+    """
+    :param bitsets: numpy.ndarray of shape (number of rows, number of words)
+    :param eplet_names: name of each eplet id
+
+    :return: for each row, list of the names of the eplets of the bitset (in eplet id order, i.e. sorted by position)
+    """
+    eplet_lists: list[list[str]] = []
+    n_eplets: int = len(eplet_names)
+    start: int
+    for start in range(0, len(bitsets), _DETAILS_CHUNK_SIZE):
+        chunk: np.ndarray = np.ascontiguousarray(bitsets[start:start + _DETAILS_CHUNK_SIZE], dtype=_WORD_DTYPE)
+        is_set: np.ndarray = np.unpackbits(chunk.view(np.uint8), axis=1, bitorder="little")[:, :n_eplets]
+        rows, eplet_ids = np.nonzero(is_set)
+        names: list[str] = eplet_names[eplet_ids].tolist()
+        boundaries: np.ndarray = np.searchsorted(rows, np.arange(len(chunk) + 1))
+        eplet_lists += [names[boundaries[i]:boundaries[i + 1]] for i in range(len(chunk))]
+
+    return eplet_lists
+
+
+def _read_eplet_index_header(path: str) -> tuple[dict, int]:
+    """
+    :param path: path to a file written by _write_eplet_index
+    :return: json header of the file and position of the first array in the file
+
+    :raises ValueError: if the file is not an EpletIndex file
+    """
+    with open(path, "rb") as file:
+        if file.read(len(_INDEX_FILE_MAGIC)) != _INDEX_FILE_MAGIC:
+            raise ValueError(f"{path} is not an EpletIndex file.")
+        header_length: int = int.from_bytes(file.read(8), "little")
+        header: dict = json.loads(file.read(header_length))
+
+    data_start: int = (
+        -(-(len(_INDEX_FILE_MAGIC) + 8 + header_length) // _INDEX_FILE_ALIGNMENT) * _INDEX_FILE_ALIGNMENT
+    )
+    return header, data_start
+
+
+def _read_eplet_index_arrays(path: str) -> tuple[dict, dict[str, np.ndarray]]:
+    """
+    :param path: path to a file written by _write_eplet_index
+    :return: json header of the file and its arrays, memory-mapped (read-only, shared between processes) and not loaded
+
+    :raises ValueError: if the file is not an EpletIndex file or if it was compiled by another version of pelc
+    """
+    header, data_start = _read_eplet_index_header(path)
+    if header.get("format_version") != _INDEX_FORMAT_VERSION:
+        raise ValueError(f"{path} was compiled by another version of pelc.")
+
+    arrays: dict[str, np.ndarray] = {}
+    name: str
+    array_header: dict
+    for name, array_header in header["arrays"].items():
+        dtype: np.dtype = np.dtype(array_header["dtype"])
+        shape: tuple[int, ...] = tuple(array_header["shape"])
+        if np.prod(shape) == 0:
+            arrays[name] = np.zeros(shape, dtype=dtype)  # empty arrays can't be memory-mapped
+        else:
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=data_start + array_header["offset"], shape=shape
+            )
+
+    return header, arrays
+
+
+def _shipped_eplet_index_path(directory_path: str, source_hashes: dict[str, str]) -> str | None:
+    """
+    :param directory_path: path to where the data folder is located
+    :param source_hashes: hashes of the csv files of the data folder (cf. _eplet_index_source_hashes)
+
+    :return: path to the compiled EpletIndex shipped in the data folder, None if there is none or if it is not up to
+             date with the csv files or with this version of pelc
+    """
+    shipped_path: str = f"{directory_path}/data/{EPLET_INDEX_FILE_NAME}"
+    if not os.path.exists(shipped_path):
+        return None
+    shipped_header: dict = _read_eplet_index_header(shipped_path)[0]
+    if (
+        shipped_header.get("format_version") != _INDEX_FORMAT_VERSION
+        or shipped_header.get("source_hashes") != source_hashes
+    ):
+        return None
+    return shipped_path
+
+
+@dataclass(frozen=True)
+class EpletBitsets:
+    """
+    Compiled EpRegistry index, without pandas: every known allele is mapped to a fixed-width bitset over a global
+    eplet-id space (cf. pelc._eplet_index.EpletIndex, which adds the conversion of typing pandas.DataFrames).
+
+    The names are kept encoded (numpy bytes arrays, memory-mapped when the index is read from a file) and only decoded
+    when they are needed: the eplet names when the mismatching eplets are listed, and the allele names one locus table
+    at a time, when alleles of this locus are looked up.
+
+    :param encoded_eplet_names: name of each eplet id, as it appears in the outputs (e.g. b"9F_ABC" or b"RQ26Y")
+    :param encoded_eplet_loci: locus of each eplet id (b"ABC", b"DR", b"DQ", b"DP" or b"i2" for interlocus eplets)
+    :param verified_mask: bitset of the antibody-verified eplets
+    :param verified_or_questionable_mask: bitset of the antibody-verified eplets, questionable ones included
+    :param encoded_allele_names: name of all the known alleles (ghost alleles included), in the order of the bitsets
+                                 rows
+    :param bitsets: numpy.ndarray of shape (number of alleles, number of words) with the eplets of each allele
+    :param locus_rows: rows (start, stop) of the alleles of each EpRegistry locus table ("A", "B", "C", "DR", "DQ" and
+                       "DP") in encoded_allele_names and bitsets
+    """
+    encoded_eplet_names: np.ndarray
+    encoded_eplet_loci: np.ndarray
+    verified_mask: np.ndarray
+    verified_or_questionable_mask: np.ndarray
+    encoded_allele_names: np.ndarray
+    bitsets: np.ndarray
+    locus_rows: dict[str, tuple[int, int]]
+    _locus_allele_rows: dict[str, dict[str, int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # row of each allele of each locus table that has been looked up (cf. locus_allele_rows)
+
+    @property
+    def n_words(self) -> int:
+        """
+        :return: number of 64-bit words of each bitset
+        """
+        return self.bitsets.shape[1]
+
+    @cached_property
+    def eplet_names(self) -> np.ndarray:
+        """
+        :return: name of each eplet id (object numpy.ndarray of str), decoded on first use
+        """
+        return self.encoded_eplet_names.astype(str).astype(object)
+
+    @cached_property
+    def eplet_loci(self) -> np.ndarray:
+        """
+        :return: locus of each eplet id (object numpy.ndarray of str), decoded on first use
+        """
+        return self.encoded_eplet_loci.astype(str).astype(object)
+
+    def mask(
+            self,
+            class_i: bool = True,
+            class_ii: bool = True,
+            verified_only: bool = False,
+            include_questionable: bool = False,
+            interlocus2: bool = True
+    ) -> np.ndarray:
+        """
+        :param class_i: keep class I eplets?
+        :param class_ii: keep class II eplets?
+        :param verified_only: keep only antibody-verified eplets?
+        :param include_questionable: also keep questionable antibody-verified eplets? Ignored if verified_only is False.
+        :param interlocus2: keep interlocus eplets? (only relevant for HLA of class II)
+
+        :return: bitset (numpy.ndarray of shape (number of words,)) of the eplets that should be taken into account
+        """
+        return _eplet_mask(
+            self.eplet_loci,
+            self.verified_mask,
+            self.verified_or_questionable_mask,
+            class_i,
+            class_ii,
+            verified_only,
+            include_questionable,
+            interlocus2
+        )
+
+    def locus_mask(self, locus: str) -> np.ndarray:
+        """
+        :param locus: locus of the eplets (one of EPLET_LOCI)
+        :return: bitset (numpy.ndarray of shape (number of words,)) of the eplets of the locus
+        """
+        return _pack_bitsets((self.eplet_loci == locus)[np.newaxis, :], self.n_words)[0]
+
+    def locus_allele_names(self, locus: str) -> list[str]:
+        """
+        :param locus: EpRegistry locus table ("A", "B", "C", "DR", "DQ" or "DP")
+        :return: names of the alleles of the locus table (ghost alleles included), in the order of the bitsets rows
+        """
+        start, stop = self.locus_rows[locus]
+        return self.encoded_allele_names[start:stop].astype(str).tolist()
+
+    def locus_allele_rows(self, locus: str) -> dict[str, int]:
+        """
+        :param locus: EpRegistry locus table ("A", "B", "C", "DR", "DQ" or "DP")
+        :return: row in self.bitsets of each allele of the locus table (ghost alleles included), decoded on first use
+                 so that only the loci that are looked up pay for their names and their hash table
+        """
+        if locus not in self._locus_allele_rows:
+            start: int = self.locus_rows[locus][0]
+            self._locus_allele_rows[locus] = {
+                allele: start + row for row, allele in enumerate(self.locus_allele_names(locus))
+            }
+        return self._locus_allele_rows[locus]
+
+    def allele_rows(self, alleles: list[object]) -> np.ndarray:
+        """
+        :param alleles: allele names (already normalised, cf. _normalise_allele), possibly not strings
+        :return: numpy.ndarray (int32) with the row of each allele in self.bitsets, -1 for the alleles that are not in
+                 the EpRegistry database. Each allele is only looked up in the locus table of its prefix.
+        """
+        rows: np.ndarray = np.full(len(alleles), -1, dtype=np.int32)
+        position: int
+        allele: object
+        for position, allele in enumerate(alleles):
+            locus: str | None = _allele_locus(allele) if isinstance(allele, str) and allele else None
+            if locus is not None and locus in self.locus_rows:
+                rows[position] = self.locus_allele_rows(locus).get(allele, -1)  # type: ignore # allele is a str
+
+        return rows
+
+    def allele_names(self, rows: np.ndarray) -> list[str]:
+        """
+        :param rows: rows of alleles in self.bitsets
+        :return: name of each of these alleles (only these names are decoded)
+        """
+        return self.encoded_allele_names[rows].astype(str).tolist()
+
+
+_EpletBitsetsT = TypeVar("_EpletBitsetsT", bound=EpletBitsets)
+
+
+def _read_eplet_bitsets(path: str, eplet_bitsets_type: type[_EpletBitsetsT]) -> _EpletBitsetsT:
+    """
+    :param path: path to a file written by _write_eplet_index
+    :param eplet_bitsets_type: EpletBitsets or one of its subclasses (e.g. EpletIndex)
+
+    :return: the eplet_bitsets_type read from the file, whose arrays are memory-mapped (read-only, shared between
+             processes) and not loaded (the names are only decoded on first use)
+
+    :raises ValueError: if the file is not an EpletIndex file or if it was compiled by another version of pelc
+    """
+    header, arrays = _read_eplet_index_arrays(path)
+
+    return eplet_bitsets_type(
+        encoded_eplet_names=arrays["eplet_names"],
+        encoded_eplet_loci=arrays["eplet_loci"],
+        verified_mask=arrays["verified_mask"],
+        verified_or_questionable_mask=arrays["verified_or_questionable_mask"],
+        encoded_allele_names=arrays["allele_names"],
+        bitsets=arrays["bitsets"],
+        locus_rows={locus: (rows[0], rows[1]) for locus, rows in header["locus_rows"].items()},
+    )
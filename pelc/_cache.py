@@ -0,0 +1,177 @@
+import hashlib
+import importlib.metadata
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from functools import lru_cache
+from typing import Any, Callable, TypeVar
+
+
+T = TypeVar("T")
+
+CACHE_DIRECTORY_ENVIRONMENT_VARIABLE: str = "PELC_CACHE_DIR"
+
+
+def _default_cache_directory() -> str:
+    """
+    :return: the cache directory to use when none is given: $PELC_CACHE_DIR if set, otherwise the user cache directory
+             of the platform (%LOCALAPPDATA%\\pelc\\Cache, ~/Library/Caches/pelc or $XDG_CACHE_HOME/pelc)
+    """
+    if os.environ.get(CACHE_DIRECTORY_ENVIRONMENT_VARIABLE):
+        return os.environ[CACHE_DIRECTORY_ENVIRONMENT_VARIABLE]
+    if sys.platform == "win32":
+        return os.path.join(
+            os.environ.get("LOCALAPPDATA", os.path.expanduser("~\\AppData\\Local")), "pelc", "Cache"
+        )
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/pelc")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "pelc")
+
+
+@lru_cache(maxsize=1)
+def _pelc_version() -> str:
+    """
+    :return: installed version of pelc ("unknown" if pelc is not installed, e.g. when run from the sources)
+    """
+    try:
+        return importlib.metadata.version("pelc")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+@lru_cache(maxsize=1)
+def _pandas_version() -> str:
+    """
+    :return: installed version of pandas (read from its metadata, so that pandas is not imported)
+    """
+    try:
+        return importlib.metadata.version("pandas")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _file_hash(path: str) -> str:
+    """
+    :param path: path to a file
+    :return: sha256 hex digest of the content of the file
+    """
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _cache_key(source_paths: list[str], *parameters: object) -> str:
+    """
+    :param source_paths: files the cached object is built from
+    :param parameters: any other parameter the cached object depends on
+
+    :return: key that changes as soon as the content of one of the sources, one of the parameters, the version of pelc
+             or the version of pandas changes
+    """
+    key_parts: list[str] = [_file_hash(path) for path in source_paths]
+    key_parts += [repr(parameter) for parameter in parameters]
+    key_parts += [f"pelc={_pelc_version()}", f"pandas={_pandas_version()}"]
+
+    return hashlib.sha256("\n".join(key_parts).encode()).hexdigest()[:32]
+
+
+def _pickle_dump(obj: object, path: str) -> None:
+    """
+    :param obj: object to pickle
+    :param path: destination path
+    """
+    with open(path, "wb") as file:
+        pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _pickle_load(path: str) -> Any:
+    """
+    :param path: path to a pickle file
+    :return: unpickled object
+    """
+    with open(path, "rb") as file:
+        return pickle.load(file)
+
+
+def _write_atomically(obj: T, path: str, write: Callable[[T, str], None] = _pickle_dump) -> None:
+    """
+    Writes obj in a temporary file of the destination directory then renames it, so that other processes either see
+    the complete file or no file at all.
+
+    :param obj: object to write
+    :param path: destination path
+    :param write: function writing obj to a given path (pickle by default)
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    os.close(file_descriptor)
+    try:
+        write(obj, temporary_path)
+        with open(temporary_path, "rb+") as file:
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def _cached(
+        name: str,
+        source_paths: list[str],
+        parameters: tuple[object, ...],
+        build: Callable[[], T],
+        cache_directory: str | None = None,
+        write: Callable[[T, str], None] = _pickle_dump,
+        read: Callable[[str], T] = _pickle_load,
+        extension: str = ".pickle"
+) -> T:
+    """
+    :param name: human-readable prefix of the cache file name
+    :param source_paths: files the object is built from (their content is part of the cache key)
+    :param parameters: any other parameter the object depends on (part of the cache key)
+    :param build: function building the object when it is not in the cache (or when the cached file is unreadable)
+    :param cache_directory: cache directory. If None, cf. _default_cache_directory.
+    :param write: function writing the object to a given path (pickle by default)
+    :param read: function reading the object from a given path (pickle by default)
+    :param extension: extension of the cache file
+
+    :return: the cached object, or the newly built one (which is then cached if the cache directory is writable)
+    """
+    if cache_directory is None:
+        cache_directory = _default_cache_directory()
+    cache_path: str = os.path.join(cache_directory, f"{name}_{_cache_key(source_paths, *parameters)}{extension}")
+
+    if os.path.exists(cache_path):
+        try:
+            return read(cache_path)
+        except Exception as exception:  # noqa, any reading error means that the file has to be rebuilt
+            logging.warning(f"Cache file {cache_path} could not be read ({exception!r}), it will be rebuilt.")
+
+    obj: T = build()
+    try:
+        os.makedirs(cache_directory, exist_ok=True)
+        _write_atomically(obj, cache_path, write)
+    except OSError as exception:
+        logging.warning(f"Cache file {cache_path} could not be written ({exception!r}), caching is disabled.")
+
+    return obj
+
+
+def clear_cache(cache_directory: str | None = None) -> None:
+    """
+    Deletes all the cached files of the pelc cache directory.
+
+    :param cache_directory: cache directory. If None, cf. _default_cache_directory.
+    """
+    if cache_directory is None:
+        cache_directory = _default_cache_directory()
+    if not os.path.isdir(cache_directory):
+        return
+
+    file_name: str
+    for file_name in os.listdir(cache_directory):
+        if file_name.endswith(".pickle") or file_name.endswith(".bin"):
+            os.remove(os.path.join(cache_directory, file_name))
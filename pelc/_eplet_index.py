@@ -0,0 +1,279 @@
+import json
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from pelc._alleles import _DRB345_GHOST_ALLELES, _normalise_allele
+from pelc._bitsets import (
+    EpletBitsets,
+    _BITS_PER_WORD,
+    _INDEX_FILE_ALIGNMENT,
+    _INDEX_FILE_MAGIC,
+    _INDEX_FORMAT_VERSION,
+    _WORD_DTYPE,
+    _bitsets_to_eplet_names,
+    _pack_bitsets,
+    _read_eplet_bitsets,
+    _repertoires,
+)
+from pelc._open_epregistry_databases import EpletConfirmationIndex
+from pelc.batch_eplet_comp_aux import _extract_key_to_rank_eplets
+
+
+@dataclass(frozen=True)
+class EpletIndex(EpletBitsets):
+    """
+    Compiled EpRegistry index (cf. EpletBitsets), with the conversion of typing pandas.DataFrames to allele codes.
+    Eplet ids are assigned by increasing position (cf. _extract_key_to_rank_eplets), the order of the eplets in the
+    outputs.
+    """
+
+    def allele_genes(self, rows: np.ndarray) -> list[str]:
+        """
+        :param rows: rows of alleles in self.bitsets
+        :return: gene of each of these alleles (e.g. "A", "DRB1" or "DQA1", with "DRB345" for the DRB3, DRB4 and DRB5
+                 alleles)
+        """
+        drb345_genes: set[str] = {allele[:-1] for allele in _DRB345_GHOST_ALLELES}
+        genes: list[str] = [allele.split("*")[0] for allele in self.allele_names(rows)]
+        return ["DRB345" if gene in drb345_genes else gene for gene in genes]
+
+    def typing_codes(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        :param df: typing pandas.DataFrame (donors or recipients), as inputted by the user
+
+        :return: numpy.ndarray (int32) of the same shape as df with the row of each allele in self.bitsets once
+                 normalised (cf. _normalise_typings), -1 for the alleles that are not in the EpRegistry database
+
+        Each distinct allele is normalised and looked up only once, whatever the number of typings.
+        """
+        codes: np.ndarray
+        unique_alleles: np.ndarray
+        codes, unique_alleles = pd.factorize(df.to_numpy(dtype=object).ravel())
+        unique_codes: np.ndarray = self.allele_rows(
+            [_normalise_allele(allele) if isinstance(allele, str) else allele for allele in unique_alleles]
+        )
+        # missing alleles have the code -1, i.e. the trailing -1, and are then replaced by the ghost allele of their
+        # column
+        typing_codes: np.ndarray = np.append(unique_codes, np.int32(-1))[codes].reshape(df.shape)
+        ghost_codes: np.ndarray = self.allele_rows([column[:-3] + "*" for column in df.columns])
+
+        return np.where((codes == -1).reshape(df.shape), ghost_codes[np.newaxis, :], typing_codes)
+
+
+def _eplet_display_name(eplet: str, locus: str) -> str:
+    """
+    :param eplet: raw eplet name, as in the EpRegistry database (e.g. "9F" or "RQ26Y")
+    :param locus: locus of the eplet ("ABC", "DR", "DQ", "DP" or "i2")
+
+    :return: name of the eplet as it appears in the outputs (e.g. "9F_ABC" or "RQ26Y")
+    """
+    if locus == "i2":
+        return eplet
+    return f"{eplet}_{locus}"
+
+
+def _build_eplet_index(
+        df_a: pd.DataFrame,
+        df_b: pd.DataFrame,
+        df_c: pd.DataFrame,
+        df_dr: pd.DataFrame,
+        df_dq: pd.DataFrame,
+        df_dp: pd.DataFrame,
+        df_data: pd.DataFrame,
+        confirmation_index: EpletConfirmationIndex
+) -> EpletIndex:
+    """
+    :param df_a: reference dataframe HLA A
+    :param df_b: reference dataframe HLA B
+    :param df_c: reference dataframe HLA C
+    :param df_dr: reference dataframe HLA DRB1
+    :param df_dq: reference dataframe HLA DQB1
+    :param df_dp: reference dataframe HLA DPB1
+    :param df_data: reference pandas.DataFrame with details about all the eplets (as returned by _open_ep_data)
+    :param confirmation_index: EpletConfirmationIndex of df_data (cf. _build_confirmation_index), the verified masks
+                               are built from
+
+    :return: the compiled EpletIndex of all the alleles of the reference dataframes
+    """
+    eplet_names: list[str] = [
+        _eplet_display_name(eplet, locus) for eplet, locus in zip(df_data["eplet"], df_data["locus"])
+    ]
+    eplet_loci: list[str] = df_data["locus"].tolist()
+    eplet_keys: list[tuple[str, str]] = list(zip(df_data["eplet"], df_data["locus"]))
+    eplet_ids: dict[str, int] = {eplet_name: eplet_id for eplet_id, eplet_name in enumerate(eplet_names)}
+
+    locus_tables: list[tuple[pd.DataFrame, str, str]] = [
+        (df_a, "A", "ABC"), (df_b, "B", "ABC"), (df_c, "C", "ABC"), (df_dr, "DR", "DR"), (df_dq, "DQ", "DQ"),
+        (df_dp, "DP", "DP")
+    ]
+    locus_rows: dict[str, tuple[int, int]] = {}
+
+    allele_rows: list[np.ndarray] = []
+    eplet_columns: list[np.ndarray] = []
+    allele_names: list[str] = []
+    for df_ref, table, suffix in locus_tables:
+        values: np.ndarray = df_ref.to_numpy(dtype=object)
+        rows, columns = np.nonzero(pd.notna(values))
+        raw_eplets, inverse = np.unique(values[rows, columns].astype(str), return_inverse=True)
+        raw_eplet_ids: list[int] = []
+        eplet: str
+        for eplet in raw_eplets.tolist():
+            locus: str = "i2" if eplet[0] in ["R", "Q", "P"] else suffix
+            eplet_name: str = _eplet_display_name(eplet, locus)
+            if eplet_name not in eplet_ids:
+                # eplet missing from ep_data.csv: it is kept but can never be considered as antibody-verified
+                eplet_ids[eplet_name] = len(eplet_names)
+                eplet_names.append(eplet_name)
+                eplet_loci.append(locus)
+                eplet_keys.append((eplet, locus))
+            raw_eplet_ids.append(eplet_ids[eplet_name])
+        allele_rows.append(rows + len(allele_names))
+        eplet_columns.append(np.array(raw_eplet_ids, dtype=np.intp)[inverse.ravel()])
+        locus_rows[table] = (len(allele_names), len(allele_names) + len(df_ref))
+        allele_names += df_ref.index.tolist()
+
+    # Eplet ids are reassigned in the order the details are sorted in (by position, cf. _extract_key_to_rank_eplets),
+    # so that the eplets of a bitset are listed already sorted
+    rank_order: np.ndarray = np.argsort(
+        np.array([_extract_key_to_rank_eplets(eplet_name) for eplet_name in eplet_names]), kind="stable"
+    )
+    ranked_eplet_ids: np.ndarray = np.empty(len(rank_order), dtype=np.intp)
+    ranked_eplet_ids[rank_order] = np.arange(len(rank_order))
+    eplet_names = [eplet_names[eplet_id] for eplet_id in rank_order.tolist()]
+    eplet_loci = [eplet_loci[eplet_id] for eplet_id in rank_order.tolist()]
+    eplet_keys = [eplet_keys[eplet_id] for eplet_id in rank_order.tolist()]
+
+    n_words: int = -(-len(eplet_names) // _BITS_PER_WORD)
+    is_set: np.ndarray = np.zeros((len(allele_names), len(eplet_names)), dtype=bool)
+    is_set[np.concatenate(allele_rows), ranked_eplet_ids[np.concatenate(eplet_columns)]] = True
+
+    is_verified: np.ndarray = np.array(
+        [
+            [key in confirmation_index.confirmed for key in eplet_keys],
+            [key in confirmation_index.confirmed_or_questionable for key in eplet_keys],
+        ],
+        dtype=bool,
+    )
+    verified_masks: np.ndarray = _pack_bitsets(is_verified, n_words)
+
+    return EpletIndex(
+        encoded_eplet_names=np.array(eplet_names, dtype=bytes),
+        encoded_eplet_loci=np.array(eplet_loci, dtype=bytes),
+        verified_mask=verified_masks[0],
+        verified_or_questionable_mask=verified_masks[1],
+        encoded_allele_names=np.array(allele_names, dtype=bytes),
+        bitsets=_pack_bitsets(is_set, n_words),
+        locus_rows=locus_rows,
+    )
+
+
+def _code_repertoires(codes: np.ndarray, eplet_index: EpletIndex) -> np.ndarray:
+    """
+    :param codes: numpy.ndarray of shape (number of typings, number of alleles) with the row of each allele in
+                  eplet_index.bitsets (cf. EpletIndex.typing_codes), without -1
+    :param eplet_index: compiled EpletIndex
+
+    :return: numpy.ndarray of shape (len(codes), number of words): bitwise OR of the bitsets of the alleles of each row
+    """
+    return _repertoires(codes, eplet_index.bitsets)
+
+
+def _bitsets_to_eplet_lists(bitsets: np.ndarray, eplet_index: EpletIndex) -> list[list[str]]:
+    """
+    :param bitsets: numpy.ndarray of shape (number of rows, number of words)
+    :param eplet_index: compiled EpletIndex
+
+    :return: for each row, list of the names of the eplets of the bitset (in eplet id order, i.e. sorted by position)
+    """
+    return _bitsets_to_eplet_names(bitsets, eplet_index.eplet_names)
+
+
+def _bitsets_to_eplet_details(bitsets: np.ndarray, eplet_index: EpletIndex) -> list[str]:
+    """
+    :param bitsets: numpy.ndarray of shape (number of rows, number of words)
+    :param eplet_index: compiled EpletIndex
+
+    :return: for each row, the names of the eplets of the bitset sorted by position and separated by ", " ("None" if
+             there are none), as they appear in the outputs
+    """
+    return [", ".join(eplets) if eplets else "None" for eplets in _bitsets_to_eplet_lists(bitsets, eplet_index)]
+
+
+def _eplet_load_detail(mismatches: np.ndarray, eplet_index: EpletIndex, index: pd.Index) -> pd.Series:
+    """
+    :param mismatches: numpy.ndarray of shape (number of pairs, number of words) with the mismatching eplets
+    :param eplet_index: compiled EpletIndex
+    :param index: index of the pairs
+
+    :return: pd.Series (named "EpMismatches") with the mismatching eplets of each pair (cf. _bitsets_to_eplet_details)
+    """
+    return pd.Series(
+        _bitsets_to_eplet_details(mismatches, eplet_index),
+        index=index,
+        name="EpMismatches",
+        dtype=str,
+    )
+
+
+def _write_eplet_index(eplet_index: EpletIndex, path: str, source_hashes: dict[str, str]) -> None:
+    """
+    Writes the EpletIndex as a single binary file that can be memory-mapped (cf. _read_eplet_index):
+    _INDEX_FILE_MAGIC, length of the json header (8 bytes, little-endian), json header (format version, source hashes,
+    rows of each locus table, and the dtype, shape and offset of each array), then the raw arrays, each aligned on
+    _INDEX_FILE_ALIGNMENT bytes.
+
+    :param eplet_index: EpletIndex to write
+    :param path: destination path
+    :param source_hashes: hashes of the csv files the index was compiled from (file name: hash)
+    """
+    arrays: dict[str, np.ndarray] = {
+        "eplet_names": eplet_index.encoded_eplet_names,
+        "eplet_loci": eplet_index.encoded_eplet_loci,
+        "verified_mask": np.ascontiguousarray(eplet_index.verified_mask, dtype=_WORD_DTYPE),
+        "verified_or_questionable_mask": np.ascontiguousarray(
+            eplet_index.verified_or_questionable_mask, dtype=_WORD_DTYPE
+        ),
+        "allele_names": eplet_index.encoded_allele_names,
+        "bitsets": np.ascontiguousarray(eplet_index.bitsets, dtype=_WORD_DTYPE),
+    }
+
+    # offsets are relative to the end of the header, which is itself padded
+    array_headers: dict[str, dict[str, object]] = {}
+    offset: int = 0
+    name: str
+    array: np.ndarray
+    for name, array in arrays.items():
+        array_headers[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // _INDEX_FILE_ALIGNMENT) * _INDEX_FILE_ALIGNMENT
+
+    header: bytes = json.dumps(
+        {
+            "format_version": _INDEX_FORMAT_VERSION,
+            "source_hashes": source_hashes,
+            "locus_rows": eplet_index.locus_rows,
+            "arrays": array_headers,
+        }
+    ).encode()
+    data_start: int = -(-(len(_INDEX_FILE_MAGIC) + 8 + len(header)) // _INDEX_FILE_ALIGNMENT) * _INDEX_FILE_ALIGNMENT
+
+    with open(path, "wb") as file:
+        file.write(_INDEX_FILE_MAGIC)
+        file.write(len(header).to_bytes(8, "little"))
+        file.write(header)
+        for name, array in arrays.items():
+            file.seek(data_start + int(array_headers[name]["offset"]))  # type: ignore # offset is an int
+            file.write(array.tobytes())
+        file.truncate(data_start + offset)
+
+
+def _read_eplet_index(path: str) -> EpletIndex:
+    """
+    :param path: path to a file written by _write_eplet_index
+    :return: the EpletIndex, whose arrays are memory-mapped (read-only, shared between processes) and not loaded (cf.
+             _read_eplet_bitsets)
+
+    :raises ValueError: if the file is not an EpletIndex file or if it was compiled by another version of pelc
+    """
+    return _read_eplet_bitsets(path, EpletIndex)
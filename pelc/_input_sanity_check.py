@@ -1,6 +1,63 @@
+import numpy as np
 import pandas as pd
 
 
+_UNKNOWN_ALLELES: tuple[str, ...] = (
+    "A*",
+    "B*",
+    "C*",
+    "DRB1*",
+    # No DRB345 because it is ok for them to have Nops
+    "DQA1*",
+    "DQB1*",
+    "DPA1*",
+    "DPB1*",
+)
+
+
+def _unknown_alleles_reasons(
+    input_df_donor: pd.DataFrame, input_df_recipient: pd.DataFrame
+) -> pd.Series:
+    """
+    :param input_df_donor: Input pandas.DataFrame with the donor alleles
+    :param input_df_recipient: Input pandas.DataFrame with the recipient alleles (row-aligned with input_df_donor)
+
+    :return: pandas.Series (index of input_df_donor, named "Reason") with, for each donor / recipient pair, "" if its
+             unknown* alleles are consistent, otherwise the loci where they are not, with the individual(s) whose two
+             alleles of the locus are not both unknown (e.g. "DQB1 (recipient); DPB1 (donor and recipient)")
+
+    For each locus, if the first allele of the donor or of the recipient is unknown, then all four alleles of the locus
+    must be unknown (an unknown second allele alone is an homozygote).
+    * unknown alleles are the ones that were inputted as "A*", "B*", "C*", "DRB1*", "DQA1*", "DQB1*", "DPA1*" and/or
+    "DPB1*". Here we are not talking about the alleles that are unknown to the database.
+    """
+    reasons: np.ndarray = np.full(len(input_df_donor), "", dtype=object)
+
+    allele: str
+    for allele in _UNKNOWN_ALLELES:
+        locus: str = allele[:-1]
+        is_unknown_donor_1: np.ndarray = input_df_donor[f"{locus}1_D"].to_numpy(dtype=object) == allele
+        is_unknown_donor_2: np.ndarray = input_df_donor[f"{locus}2_D"].to_numpy(dtype=object) == allele
+        is_unknown_recipient_1: np.ndarray = input_df_recipient[f"{locus}1_R"].to_numpy(dtype=object) == allele
+        is_unknown_recipient_2: np.ndarray = input_df_recipient[f"{locus}2_R"].to_numpy(dtype=object) == allele
+
+        is_checked: np.ndarray = is_unknown_donor_1 | is_unknown_recipient_1
+        is_donor_wrong: np.ndarray = is_checked & ~(is_unknown_donor_1 & is_unknown_donor_2)
+        is_recipient_wrong: np.ndarray = is_checked & ~(is_unknown_recipient_1 & is_unknown_recipient_2)
+
+        row: int
+        for row in np.flatnonzero(is_donor_wrong | is_recipient_wrong).tolist():
+            if is_donor_wrong[row] and is_recipient_wrong[row]:
+                reason: str = f"{locus} (donor and recipient)"
+            elif is_donor_wrong[row]:
+                reason = f"{locus} (donor)"
+            else:
+                reason = f"{locus} (recipient)"
+            reasons[row] = f"{reasons[row]}; {reason}" if reasons[row] else reason
+
+    return pd.Series(reasons, index=input_df_donor.index, name="Reason", dtype=object)
+
+
 def _equal_amount_of_unknown_alleles(
     input_df_donor: pd.DataFrame, input_df_recipient: pd.DataFrame
 ) -> bool:
@@ -10,49 +67,9 @@ def _equal_amount_of_unknown_alleles(
 
     :return: True if the amount of unknown* alleles is equal in both dataframes, False otherwise
 
-    Also tests if the unknown* alleles are either for both the alleles of the locus or for none of them.
+    Also tests if the unknown* alleles are either for both the alleles of the locus or for none of them (cf.
+    _unknown_alleles_reasons).
     * unknown alleles are the ones that were inputted as "A*", "B*", "C*", "DRB1*", "DQA1*", "DQB1*", "DPA1*" and/or
     "DPB1*". Here we are not talking about the alleles that are unknown to the database.
     """
-
-    unknown_alleles: list[str] = [
-        "A*",
-        "B*",
-        "C*",
-        "DRB1*",
-        # No DRB345 because it is ok for them to have Nops
-        "DQA1*",
-        "DQB1*",
-        "DPA1*",
-        "DPB1*",
-    ]
-
-    # Check if the amount of unknown alleles is equal in both dataframes
-    for (_, row_d), (_, row_r) in zip(
-        input_df_donor.iterrows(), input_df_recipient.iterrows()
-    ):
-        allele: str
-        for allele in unknown_alleles:
-            locus: str = allele[:-1]
-            locus_donor_1: str = f"{locus}1_D"
-            locus_donor_2: str = f"{locus}2_D"
-            locus_recipient_1: str = f"{locus}1_R"
-            locus_recipient_2: str = f"{locus}2_R"
-
-            if allele in [row_r[locus_recipient_1], row_d[locus_donor_1]]:
-                # If the (first, otherwise it can be an homozygote) allele is unknown, then the other one must be
-                # unknown too and the same for the other individual
-                if not (
-                    allele
-                    ==
-                    row_r[locus_recipient_1]
-                    ==
-                    row_r[locus_recipient_2]
-                    ==
-                    row_d[locus_donor_1]
-                    ==
-                    row_d[locus_donor_2]
-                ):
-                    return False
-
-    return True
+    return not (_unknown_alleles_reasons(input_df_donor, input_df_recipient) != "").any()
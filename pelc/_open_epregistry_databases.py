@@ -1,66 +1,98 @@
 import os
+from dataclasses import dataclass
+
 import pandas as pd
 
+from pelc._cache import _cached
+
+
+@dataclass(frozen=True)
+class EpletConfirmationIndex:
+    """
+    Precomputed (eplet, locus) -> confirmation lookup of ep_data.csv.
+
+    :param confirmation: confirmation status ("Confirmed", "Questionable", "No" or "") of each (eplet, locus) pair
+    :param confirmed: (eplet, locus) pairs that are antibody-verified
+    :param confirmed_or_questionable: (eplet, locus) pairs that are antibody-verified or questionable
+    """
+    confirmation: dict[tuple[str, str], str]
+    confirmed: frozenset[tuple[str, str]]
+    confirmed_or_questionable: frozenset[tuple[str, str]]
+
+
+def _read_epregistry_database(path_to_csv: str, ghost_alleles: list[str]) -> pd.DataFrame:
+    """
+    :param path_to_csv: path to the csv EpRegistry database file
+    :param ghost_alleles: allele(s) string(s) to be used as (a) ghost allele(s) (no eplets)
+
+    :return: pandas.DataFrame with the EpRegistry database and the ghost allele, parsed from the csv file
+    """
+
+    df_db: pd.DataFrame = pd.read_csv(path_to_csv, sep=";").set_index("allele")
+    for ghost_allele in ghost_alleles:
+        # add row with nan values
+        df_db.loc[ghost_allele] = float("nan")
+
+    return df_db
+
 
 def _open_epregistry_database(
         path_to_csv: str,
         ghost_alleles: list[str],
-        no_eplets: bool = False
+        cache_directory: str | None = None
 ) -> pd.DataFrame:
     """
     :param path_to_csv: path to the csv EpRegistry database file
     :param ghost_alleles: allele(s) string(s) to be used as (a) ghost allele(s) (no eplets)
-    :param no_eplets: boolean to indicate if we want to get the dataframe or actually just an empty dataframe for
-                      performance reasons
+    :param cache_directory: where the parsed database is cached. If None, $PELC_CACHE_DIR or the user cache directory.
 
     :return: pandas.DataFrame with the EpRegistry database and the ghost allele
     """
+    file_name_no_extension: str = os.path.basename(path_to_csv).split('.csv')[0]
 
-    df_db: pd.DataFrame
-
-    file_name_no_extension: str = path_to_csv.split('.csv')[0]
-    suffix: str = ghost_alleles[0]
-    pickle_file_name: str = f"{file_name_no_extension}_{no_eplets}_{suffix}.pickle"
-
-    # replace * by _ in the pickle file name to avoid problems when * is in the file name
-    pickle_file_name = pickle_file_name.replace('*', '_')
-
-    # if pickle file exists, load it
-    if os.path.exists(pickle_file_name):
-        df_db = pd.read_pickle(pickle_file_name)
-        return df_db
-    # if pickle file does not exist, create it
-    else:
-        if no_eplets:
-            df_db = pd.read_csv(path_to_csv, sep=";", usecols=[0]).set_index("allele")
-            # add a row to an empty dataframe with concat
-            for ghost_allele in ghost_alleles:
-                df_db = pd.concat([df_db, pd.DataFrame(columns=[], index=[ghost_allele])])
-        else:
-            df_db = pd.read_csv(path_to_csv, sep=";").set_index("allele")
-            for ghost_allele in ghost_alleles:
-                # add row with nan values
-                df_db.loc[ghost_allele] = float("nan")
-
-        df_db.to_pickle(pickle_file_name)
+    return _cached(
+        file_name_no_extension,
+        [path_to_csv],
+        (tuple(ghost_alleles),),
+        lambda: _read_epregistry_database(path_to_csv, ghost_alleles),
+        cache_directory
+    )
 
-    return df_db
 
+def _build_confirmation_index(df_ep_data: pd.DataFrame) -> EpletConfirmationIndex:
+    """
+    :param df_ep_data: pandas.DataFrame with the eplet informations database
+    :return: EpletConfirmationIndex of df_ep_data
+    """
+    confirmation: dict[tuple[str, str], str] = dict(
+        zip(
+            zip(df_ep_data["eplet"], df_ep_data["locus"]),
+            df_ep_data["confirmation"].fillna("")
+        )
+    )
+
+    return EpletConfirmationIndex(
+        confirmation=confirmation,
+        confirmed=frozenset(key for key, value in confirmation.items() if value == "Confirmed"),
+        confirmed_or_questionable=frozenset(
+            key for key, value in confirmation.items() if value in ["Confirmed", "Questionable"]
+        ),
+    )
 
-def _open_ep_data(eplet_comparison_file_directory_path: str) -> pd.DataFrame:
+
+def _open_ep_data(eplet_comparison_file_directory_path: str, cache_directory: str | None = None) -> pd.DataFrame:
     """
     :param eplet_comparison_file_directory_path: path to where the data folder is located
+    :param cache_directory: where the parsed database is cached. If None, $PELC_CACHE_DIR or the user cache directory.
+
     :return: pandas.DataFrame with the eplet informations database
     """
+    path_to_csv: str = f"{eplet_comparison_file_directory_path}/data/ep_data.csv"
 
-    df_ep_data: pd.DataFrame
-
-    # if pickle file exists, load it
-    if os.path.exists(f"{eplet_comparison_file_directory_path}/data/ep_data.pickle"):
-        df_ep_data = pd.read_pickle(f"{eplet_comparison_file_directory_path}/data/ep_data.pickle")
-        return df_ep_data
-    # if pickle file does not exist, create it
-    else:
-        df_ep_data = pd.read_csv(f"{eplet_comparison_file_directory_path}/data/ep_data.csv", sep=";")
-        df_ep_data.to_pickle(f"{eplet_comparison_file_directory_path}/data/ep_data.pickle")
-        return df_ep_data
+    return _cached(
+        "ep_data",
+        [path_to_csv],
+        (),
+        lambda: pd.read_csv(path_to_csv, sep=";"),
+        cache_directory
+    )
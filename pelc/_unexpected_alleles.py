@@ -1,52 +1,100 @@
-import logging
+import re
+
+import numpy as np
 import pandas as pd
 
+from pelc._eplet_index import EpletIndex
+from pelc._alleles import _normalise_allele
+from pelc.batch_eplet_comp_aux import _normalise_typings
+
+
+_VALID_ALLELE: int = 0
+_MALFORMED_ALLELE: int = 1
+_UNKNOWN_ALLELE: int = 2
+_WRONG_LOCUS_ALLELE: int = 3
+_ALLELE_REASONS: dict[int, str] = {
+    # reason code (cf. _allele_reasons): why the allele of a cell is not valid
+    _MALFORMED_ALLELE: "malformed allele name",
+    _UNKNOWN_ALLELE: "allele not found in the EpRegistry database",
+    _WRONG_LOCUS_ALLELE: "allele of another locus than its column",
+}
+_ALLELE_NAME_PATTERN: re.Pattern = re.compile(r"^[A-Z]+[0-9]*\*([0-9]+(:[0-9]+)*[A-Z]?)?$")
 
-def _read_available_alleles(df_ref: pd.DataFrame) -> list[str]:
+
+def _allele_reasons(df: pd.DataFrame, codes: np.ndarray, eplet_index: EpletIndex) -> np.ndarray:
     """
-    :param df_ref: reference dataframe
-    :return: all known alleles in the reference dataframe (df_a, df_b, df_c, df_dr, df_dq, or df_dp)
+    :param df: typing pandas.DataFrame (donors or recipients), as inputted by the user
+    :param codes: allele codes of df (cf. EpletIndex.typing_codes)
+    :param eplet_index: EpletIndex of all the loci
+
+    :return: numpy.ndarray (int8) of the same shape as df with the reason code of each cell (_VALID_ALLELE or a key of
+             _ALLELE_REASONS). The locus of an allele is only checked in the columns named after a gene (e.g. "A1_D" or
+             "DRB3452_R").
     """
-    list_ref: list[str] = list(df_ref.index.values)
+    reasons: np.ndarray = np.full(df.shape, _VALID_ALLELE, dtype=np.int8)
 
-    return list_ref
+    # the columns named after a gene are the ones whose ghost allele (e.g. "A*") is in the EpletIndex
+    column_genes: list[str] = [column[:-3] for column in df.columns]
+    is_gene_column: np.ndarray = eplet_index.allele_rows([f"{gene}*" for gene in column_genes]) >= 0
 
+    # only the genes of the alleles present in df are looked up, then mapped back to the cells by allele code
+    is_known: np.ndarray = codes >= 0
+    known_codes: np.ndarray = np.where(is_known, codes, 0)
+    present_rows: np.ndarray = np.flatnonzero(np.bincount(codes[is_known], minlength=len(eplet_index.bitsets)))
+    gene_ids: np.ndarray
+    gene_ids, _ = pd.factorize(np.array(column_genes + eplet_index.allele_genes(present_rows), dtype=object))
+    row_gene_ids: np.ndarray = np.full(len(eplet_index.bitsets), -1, dtype=np.int64)
+    row_gene_ids[present_rows] = gene_ids[len(column_genes):]
+    reasons[
+        is_known
+        & is_gene_column[np.newaxis, :]
+        & (row_gene_ids[known_codes] != gene_ids[:len(column_genes)][np.newaxis, :])
+    ] = _WRONG_LOCUS_ALLELE
 
-def _delete_unexpected_alleles(
-    df: pd.DataFrame,
-    df_a: pd.DataFrame,
-    df_b: pd.DataFrame,
-    df_c: pd.DataFrame,
-    df_dr: pd.DataFrame,
-    df_dq: pd.DataFrame,
-    df_dp: pd.DataFrame,
-) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # only the few cells that are not in the EpletIndex are looked at one by one
+    unknown_cells: tuple[np.ndarray, ...] = np.nonzero(~is_known)
+    if len(unknown_cells[0]) > 0:
+        values: np.ndarray = df.to_numpy(dtype=object)
+        is_missing: np.ndarray = pd.isna(values)
+        row: int
+        column: int
+        for row, column in zip(*(index.tolist() for index in unknown_cells)):
+            allele: object = values[row, column]
+            is_well_formed: bool = (
+                _ALLELE_NAME_PATTERN.match(_normalise_allele(allele)) is not None if isinstance(allele, str)
+                else bool(is_missing[row, column])
+            )
+            reasons[row, column] = _UNKNOWN_ALLELE if is_well_formed else _MALFORMED_ALLELE
+
+    return reasons
+
+
+def _delete_unexpected_alleles(df: pd.DataFrame, eplet_index: EpletIndex) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
-    :param df: is the input dataframe of the donor or the recipient
-    :param df_a: reference dataframe HLA A
-    :param df_b: reference dataframe HLA B
-    :param df_c: reference dataframe HLA C
-    :param df_dr: reference dataframe HLA DRB1
-    :param df_dq: reference dataframe HLA DQB1
-    :param df_dp: reference dataframe HLA DPB1
-
-    :return: df without the lines with unexpected alleles, df with only the lines with unexpected alleles
+    :param df: is the input dataframe of the donor or the recipient, not modified
+    :param eplet_index: EpletIndex of all the loci
+
+    :return: pandas.DataFrame (int32, same index and columns as df) with the allele codes (cf.
+             EpletIndex.typing_codes) of the lines whose alleles are all valid, and df with only the lines with
+             unexpected alleles (null alleles replaced by ghost alleles) and an additional "Reason" column giving the
+             faulty cell(s), e.g. "A1_D: allele not found in the EpRegistry database (A*99:99)"
     """
-    list_ref_a: list[str]  = _read_available_alleles(df_a)
-    list_ref_b: list[str]  = _read_available_alleles(df_b)
-    list_ref_c: list[str]  = _read_available_alleles(df_c)
-    list_ref_dr: list[str] = _read_available_alleles(df_dr)
-    list_ref_dq: list[str] = _read_available_alleles(df_dq)
-    list_ref_dp: list[str] = _read_available_alleles(df_dp)
-
-    list_ref: set[str] = set(
-        list_ref_a + list_ref_b + list_ref_c + list_ref_dr + list_ref_dq + list_ref_dp
-    )
+    codes: np.ndarray = eplet_index.typing_codes(df)
+    reasons: np.ndarray = _allele_reasons(df, codes, eplet_index)
+    is_allowed: np.ndarray = np.all(reasons == _VALID_ALLELE, axis=1)
 
-    is_allowed: pd.Series = df.isin(list_ref).all(axis=1)
+    removed_reasons: list[str] = []
+    row: int
+    for row in np.flatnonzero(~is_allowed).tolist():
+        removed_reasons.append("; ".join(
+            f"{df.columns[column]}: {_ALLELE_REASONS[int(reasons[row, column])]} ({df.iat[row, column]})"
+            for column in np.flatnonzero(reasons[row]).tolist()
+        ))
 
-    df_filtered = df[is_allowed]
-    df_removed  = df[~is_allowed]
+    df_filtered: pd.DataFrame = pd.DataFrame(codes[is_allowed], index=df.index[is_allowed], columns=df.columns)
+    df_removed: pd.DataFrame = _normalise_typings(df[~is_allowed]).assign(
+        Reason=pd.Series(removed_reasons, index=df.index[~is_allowed], dtype=object)
+    )
 
     return df_filtered, df_removed
 
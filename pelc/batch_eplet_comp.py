@@ -2,23 +2,726 @@
 import csv
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Iterable, Iterator
+import numpy as np
 import pandas as pd
 
-from pelc._input_sanity_check import _equal_amount_of_unknown_alleles
-from pelc._open_epregistry_databases import (
-    _open_epregistry_database,
-    _open_ep_data,
-)
-from pelc._unexpected_alleles import (
-    _delete_unexpected_alleles,
-    _remove_unexpected_other_individual,
-)
-from pelc.batch_eplet_comp_aux import (
-    _allele_df_to_eplets_df,
-    _replace_null_alleles,
-    _transform_eplet_load_detail,
+from pelc._bitsets import (
+    EPLET_LOCI,
+    _cross_mismatch_counts,
+    _distinct_pairs,
+    _mismatches,
+    _popcount,
+    _repertoires,
 )
+from pelc._eplet_index import EpletIndex, _code_repertoires, _eplet_load_detail
+from pelc._input_sanity_check import _unknown_alleles_reasons
+from pelc._unexpected_alleles import _delete_unexpected_alleles, _remove_unexpected_other_individual
+from pelc.batch_eplet_comp_aux import split_dataframe
+from pelc.eplet_database import EpletDatabase, default_database
 from pelc.output_type import OutputType
+from pelc.result_cache import PairResultCache
+
+
+_worker_databases: dict[tuple[str, str | None], EpletDatabase] = {}
+# EpletDatabase of each worker process that is not the default one (cf. _eplet_load_result_in_worker)
+
+
+# FUNCTIONS
+def _prepare_typings(input_df: pd.DataFrame, eplet_index: EpletIndex) -> pd.DataFrame:
+    """
+    :param input_df: Input Donors or Recipients Typing (pandas.DataFrame), not modified
+    :param eplet_index: EpletIndex of all the loci
+
+    :return: allele codes of the typings of input_df without the ones with unexpected alleles (cf.
+             _delete_unexpected_alleles)
+    """
+    codes: pd.DataFrame
+    removed: pd.DataFrame
+    codes, removed = _delete_unexpected_alleles(input_df, eplet_index)
+    if len(removed) > 0:
+        logging.warning(
+            f"{len(removed)} typing(s) with alleles that are not valid will be removed: "
+            f"{dict(list(removed['Reason'].items())[:10])}."
+        )
+
+    return codes
+
+
+@dataclass(frozen=True)
+class EpletFilter:
+    """
+    Eplets taken into account in an eplet load (cf. EpletIndex.mask).
+
+    :param class_i: take class I eplets into account?
+    :param class_ii: take class II eplets into account?
+    :param verified_only: take only antibody-verified eplets into account?
+    :param include_questionable: also take questionable antibody-verified eplets into account? Ignored if verified_only
+                                 is False.
+    :param interlocus2: take interlocus eplets into account? (only relevant for HLA of class II)
+    """
+    class_i: bool = True
+    class_ii: bool = True
+    verified_only: bool = False
+    include_questionable: bool = False
+    interlocus2: bool = True
+
+    def mask(self, eplet_index: EpletIndex) -> np.ndarray:
+        """
+        :param eplet_index: EpletIndex of all the loci
+        :return: bitset of the eplets taken into account
+        """
+        return eplet_index.mask(
+            self.class_i, self.class_ii, self.verified_only, self.include_questionable, self.interlocus2
+        )
+
+
+STANDARD_EPLET_FILTERS: dict[str, EpletFilter] = {
+    # configurations usually reported side by side (cf. compute_epletic_load_configurations)
+    "All": EpletFilter(),
+    "All without interlocus": EpletFilter(interlocus2=False),
+    "Verified": EpletFilter(verified_only=True),
+    "Verified without interlocus": EpletFilter(verified_only=True, interlocus2=False),
+    "Verified and questionable": EpletFilter(verified_only=True, include_questionable=True),
+    "Verified and questionable without interlocus": EpletFilter(
+        verified_only=True, include_questionable=True, interlocus2=False
+    ),
+}
+
+
+@dataclass(frozen=True, eq=False)
+class _PairMismatches:
+    """
+    Unfiltered eplet mismatches of row-aligned donor / recipient pairs in both directions, computed once per distinct
+    pair and shared by the EpletLoadResults of every eplet filter and direction.
+
+    :param donor_codes: allele codes of the donors that were kept (cf. _delete_unexpected_alleles)
+    :param recipient_codes: allele codes of the recipients, row-aligned with donor_codes
+    :param eplet_index: EpletIndex of all the loci
+    :param database: EpletDatabase eplet_index comes from
+    :param result_cache: if not None, on-disk cache the eplet mismatches of the pairs are read from and written to
+    :param n_jobs: number of processes the eplet mismatches are computed with (cf. _parallel_mismatches)
+    """
+    donor_codes: pd.DataFrame
+    recipient_codes: pd.DataFrame
+    eplet_index: EpletIndex
+    database: EpletDatabase
+    result_cache: PairResultCache | None = None
+    n_jobs: int = 1
+
+    @cached_property
+    def distinct_pairs(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :return: distinct donor and recipient genotypes, genotypes of each distinct pair and distinct pair of each pair
+                 (cf. _distinct_pairs): each distinct pair is only computed once (one deceased donor offered to many
+                 recipients, repeated analyses, ...), the results are then scattered back to all the pairs
+        """
+        return _distinct_pairs(self.donor_codes.to_numpy(), self.recipient_codes.to_numpy())
+
+    @cached_property
+    def distinct_repertoires(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: repertoires (bitsets of all their eplets) of the distinct donor genotypes and of the distinct recipient
+                 genotypes, each computed once however many pairs it is part of
+        """
+        donor_genotypes, recipient_genotypes, _, _, _ = self.distinct_pairs
+        return (
+            _repertoires(donor_genotypes, self.eplet_index.bitsets),
+            _repertoires(recipient_genotypes, self.eplet_index.bitsets)
+        )
+
+    @property
+    def is_parallel(self) -> bool:
+        """
+        :return: whether or not the mismatches are computed in a pool of processes (more than one process and more than
+                 one distinct pair)
+        """
+        return self.n_jobs > 1 and len(self.distinct_pairs[2]) > 1
+
+    def _pool_mismatches(self, donor_codes: np.ndarray, recipient_codes: np.ndarray) -> np.ndarray:
+        """
+        :param donor_codes: allele codes of the donors of some distinct pairs
+        :param recipient_codes: allele codes of the recipients, row-aligned with donor_codes
+
+        :return: all the eplets that are present on the donor's HLA molecules but not on the recipient's ones, computed
+                 in a pool of self.n_jobs processes (cf. _parallel_mismatches)
+        """
+        return _parallel_mismatches(donor_codes, recipient_codes, self.database, self.n_jobs)
+
+    def _cached_mismatches(
+            self, result_cache: PairResultCache, donor_codes: np.ndarray, recipient_codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        :param result_cache: on-disk cache the mismatches are read from and written to (cf. self.result_cache)
+        :param donor_codes: allele codes of the donors of some distinct pairs
+        :param recipient_codes: allele codes of the recipients, row-aligned with donor_codes
+
+        :return: all the eplets that are present on the donor's HLA molecules but not on the recipient's ones, read from
+                 result_cache (the missing pairs being computed, in a pool of processes if n_jobs > 1, and stored)
+        """
+        lookups: int = result_cache.lookups
+        hits: int = result_cache.hits
+        mismatches: np.ndarray = result_cache.mismatches(
+            donor_codes,
+            recipient_codes,
+            self.eplet_index.bitsets,
+            self.eplet_index.mask(),
+            self.database.version_hash(),
+            self._pool_mismatches if self.is_parallel else None
+        )
+        logging.info(
+            f"{result_cache.hits - hits} of {result_cache.lookups - lookups} distinct donor / recipient "
+            f"pair(s) served from the result cache {result_cache.path}."
+        )
+        return mismatches
+
+    @cached_property
+    def distinct_mismatches(self) -> np.ndarray:
+        """
+        :return: numpy.ndarray of shape (number of distinct pairs, number of words) with all the eplets that are present
+                 on the donor's HLA molecules but not on the recipient's ones (host versus graft, before any eplet
+                 filter), computed in a pool of processes if n_jobs > 1
+        """
+        donor_genotypes, recipient_genotypes, pair_donors, pair_recipients, _ = self.distinct_pairs
+        if self.result_cache is None:
+            if self.is_parallel:
+                return self._pool_mismatches(donor_genotypes[pair_donors], recipient_genotypes[pair_recipients])
+            donor_repertoires, recipient_repertoires = self.distinct_repertoires
+            return donor_repertoires[pair_donors] & ~recipient_repertoires[pair_recipients] & self.eplet_index.mask()
+
+        return self._cached_mismatches(
+            self.result_cache, donor_genotypes[pair_donors], recipient_genotypes[pair_recipients]
+        )
+
+    @cached_property
+    def reverse_distinct_mismatches(self) -> np.ndarray:
+        """
+        :return: numpy.ndarray of shape (number of distinct pairs, number of words) with all the eplets that are present
+                 on the recipient's HLA molecules but not on the donor's ones (graft versus host, before any eplet
+                 filter), computed in a pool of processes if n_jobs > 1
+        """
+        donor_genotypes, recipient_genotypes, pair_donors, pair_recipients, _ = self.distinct_pairs
+        if self.result_cache is None:
+            if self.is_parallel:
+                return self._pool_mismatches(recipient_genotypes[pair_recipients], donor_genotypes[pair_donors])
+            donor_repertoires, recipient_repertoires = self.distinct_repertoires
+            return recipient_repertoires[pair_recipients] & ~donor_repertoires[pair_donors] & self.eplet_index.mask()
+
+        # the key of a pair being ordered, the swapped pair has its own entry
+        return self._cached_mismatches(
+            self.result_cache, recipient_genotypes[pair_recipients], donor_genotypes[pair_donors]
+        )
+
+    def scatter(self, distinct_result: pd.DataFrame | pd.Series) -> pd.DataFrame | pd.Series:
+        """
+        :param distinct_result: one row per distinct pair (cf. distinct_pairs)
+        :return: the rows of distinct_result scattered back to all the pairs (indexed like them)
+        """
+        pair_inverse: np.ndarray = self.distinct_pairs[4]
+        if not np.array_equal(pair_inverse, np.arange(len(pair_inverse))):
+            distinct_result = distinct_result.iloc[pair_inverse]
+        return distinct_result.set_axis(self.donor_codes.index, axis=0)
+
+
+@dataclass(frozen=True, eq=False)
+class EpletLoadResult:
+    """
+    Result of one pass of the pipeline over row-aligned donors and recipients (cf. compute_epletic_load_result): the
+    typings are validated, normalised and converted once, and each output (loads, details, per-locus loads, removed
+    typings) is only computed when it is first accessed, then kept.
+
+    :param pairs: eplet mismatches of the donor / recipient pairs that were kept
+    :param removed_donors: removed donors, with the reason of their removal in a "Reason" column
+    :param removed_recipients: removed recipients, with the reason of their removal in a "Reason" column
+    :param mask: bitset of the eplets taken into account (cf. EpletFilter.mask)
+    :param direction: "HvG" (eplets of the donor that the recipient doesn't have), "GvH" (eplets of the recipient that
+                      the donor doesn't have) or "Union" (eplets mismatched in either direction)
+    """
+    pairs: _PairMismatches
+    removed_donors: pd.DataFrame
+    removed_recipients: pd.DataFrame
+    mask: np.ndarray
+    direction: str = "HvG"
+
+    @property
+    def index(self) -> pd.Index:
+        """
+        :return: index of the donor / recipient pairs that were kept
+        """
+        return self.pairs.donor_codes.index
+
+    @property
+    def eplet_index(self) -> EpletIndex:
+        """
+        :return: EpletIndex of all the loci
+        """
+        return self.pairs.eplet_index
+
+    def with_filter(self, eplet_filter: EpletFilter) -> "EpletLoadResult":
+        """
+        :param eplet_filter: eplets to take into account
+        :return: EpletLoadResult of the same pairs for another eplet filter, sharing their unfiltered mismatches (so
+                 that only the filter is applied again)
+        """
+        return replace(self, mask=eplet_filter.mask(self.eplet_index))
+
+    def with_direction(self, direction: str) -> "EpletLoadResult":
+        """
+        :param direction: "HvG", "GvH" or "Union"
+        :return: EpletLoadResult of the same pairs in another direction, sharing their repertoires
+
+        :raises ValueError: if direction is not "HvG", "GvH" or "Union"
+        """
+        if direction not in _RESULT_DIRECTIONS:
+            raise ValueError(f"Unknown direction {direction!r} (expected one of {_RESULT_DIRECTIONS}).")
+        return replace(self, direction=direction)
+
+    @cached_property
+    def _distinct_mismatches(self) -> np.ndarray:
+        """
+        :return: numpy.ndarray of shape (number of distinct pairs, number of words) with the mismatching eplets of each
+                 distinct pair
+        """
+        if self.direction == "GvH":
+            return self.pairs.reverse_distinct_mismatches & self.mask
+        if self.direction == "Union":
+            return (self.pairs.distinct_mismatches | self.pairs.reverse_distinct_mismatches) & self.mask
+        return self.pairs.distinct_mismatches & self.mask
+
+    @cached_property
+    def counts(self) -> pd.Series:
+        """
+        :return: pandas.Series (named "Eplet Load") with the number of mismatching eplets of each pair
+        """
+        return self.pairs.scatter(pd.Series(_popcount(self._distinct_mismatches), name="Eplet Load"))  # type: ignore
+
+    @cached_property
+    def details(self) -> pd.Series:
+        """
+        :return: pandas.Series (named "EpMismatches") with the mismatching eplets of each pair, sorted by position
+                 ("None" if there is none)
+        """
+        distinct_mismatches: np.ndarray = self._distinct_mismatches
+        return self.pairs.scatter(  # type: ignore # a Series in, a Series out
+            _eplet_load_detail(distinct_mismatches, self.eplet_index, pd.RangeIndex(len(distinct_mismatches)))
+        )
+
+    @cached_property
+    def _locus_results(self) -> dict[str, "EpletLoadResult"]:
+        """
+        :return: EpletLoadResult of each eplet locus (one of EPLET_LOCI), i.e. of the same pairs with mask restricted to
+                 the eplets of the locus, sharing their mismatches
+        """
+        return {locus: replace(self, mask=self.mask & self.eplet_index.locus_mask(locus)) for locus in EPLET_LOCI}
+
+    @property
+    def per_locus_counts(self) -> pd.DataFrame:
+        """
+        :return: pandas.DataFrame with the number of mismatching eplets of each pair per eplet locus ("Eplet Load ABC",
+                 "Eplet Load DR", "Eplet Load DQ", "Eplet Load DP" and "Eplet Load i2" for interlocus eplets)
+        """
+        return pd.DataFrame(
+            {f"Eplet Load {locus}": result.counts for locus, result in self._locus_results.items()}, index=self.index
+        )
+
+    @property
+    def per_locus_details(self) -> pd.DataFrame:
+        """
+        :return: pandas.DataFrame with the mismatching eplets of each pair per eplet locus ("EpMismatches ABC",
+                 "EpMismatches DR", "EpMismatches DQ", "EpMismatches DP" and "EpMismatches i2" for interlocus eplets)
+        """
+        return pd.DataFrame(
+            {f"EpMismatches {locus}": result.details for locus, result in self._locus_results.items()}, index=self.index
+        )
+
+    def per_locus_output(self, output_type: OutputType) -> pd.DataFrame:
+        """
+        :param output_type: OutputType.COUNT, OutputType.ONLY_DETAILS or OutputType.DETAILS_AND_COUNT
+        :return: pandas.DataFrame with the total output ("Eplet Load" and/or "EpMismatches") followed by the output of
+                 each eplet locus ("Eplet Load ABC" and/or "EpMismatches ABC", ..., "i2" for interlocus eplets)
+
+        :raises ValueError: for OutputType.FILTERED_OUT_TYPINGS
+        """
+        if output_type == OutputType.FILTERED_OUT_TYPINGS:
+            raise ValueError("The removed typings are not split per locus.")
+
+        columns: dict[str, pd.Series] = {}
+        suffix: str
+        result: EpletLoadResult
+        for suffix, result in [("", self)] + [(f" {locus}", result) for locus, result in self._locus_results.items()]:
+            if output_type != OutputType.ONLY_DETAILS:
+                columns[f"Eplet Load{suffix}"] = result.counts
+            if output_type != OutputType.COUNT:
+                columns[f"EpMismatches{suffix}"] = result.details
+
+        return pd.DataFrame(columns, index=self.index)
+
+    def configurations(
+            self,
+            eplet_filters: dict[str, EpletFilter] | None = None,
+            output_type: OutputType = OutputType.COUNT
+    ) -> pd.DataFrame:
+        """
+        :param eplet_filters: eplet filters to evaluate (name: filter). If None, STANDARD_EPLET_FILTERS.
+        :param output_type: OutputType.COUNT, OutputType.ONLY_DETAILS or OutputType.DETAILS_AND_COUNT
+
+        :return: pandas.DataFrame with one "Eplet Load {name}" column (OutputType.COUNT), one "EpMismatches {name}"
+                 column (OutputType.ONLY_DETAILS) or both (OutputType.DETAILS_AND_COUNT) per eplet filter. The
+                 unfiltered mismatches are computed once, each filter only applies its mask to them.
+
+        :raises ValueError: for OutputType.FILTERED_OUT_TYPINGS (cf. removed_donors and removed_recipients)
+        """
+        if output_type == OutputType.FILTERED_OUT_TYPINGS:
+            raise ValueError("The removed typings don't depend on the eplet filters.")
+        if eplet_filters is None:
+            eplet_filters = STANDARD_EPLET_FILTERS
+
+        columns: dict[str, pd.Series] = {}
+        name: str
+        eplet_filter: EpletFilter
+        for name, eplet_filter in eplet_filters.items():
+            filtered: EpletLoadResult = self.with_filter(eplet_filter)
+            if output_type != OutputType.ONLY_DETAILS:
+                columns[f"Eplet Load {name}"] = filtered.counts
+            if output_type != OutputType.COUNT:
+                columns[f"EpMismatches {name}"] = filtered.details
+
+        return pd.DataFrame(columns, index=self.index)
+
+    def output(
+            self,
+            output_type: OutputType,
+            per_locus: bool = False,
+            direction: str | None = None
+    ) -> pd.DataFrame | pd.Series | tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        :param output_type: What is gonna be in the output
+        :param per_locus: whether or not to also split the eplet loads and/or details per eplet locus (cf.
+                          per_locus_output)
+        :param direction: "HvG", "GvH", "Union" or "both" (the columns of "HvG", "GvH" and "Union" side by side,
+                          suffixed with the direction). If None, the direction of this EpletLoadResult.
+
+        :return: the output of compute_epletic_load (with output_path None) for output_type
+        """
+        if output_type == OutputType.FILTERED_OUT_TYPINGS:
+            return self.removed_donors, self.removed_recipients
+        if direction == "both":
+            columns: dict[str, pd.Series] = {}
+            result_direction: str
+            for result_direction in _RESULT_DIRECTIONS:
+                directional_output: pd.DataFrame | pd.Series = self.with_direction(result_direction).output(
+                    output_type, per_locus
+                )  # type: ignore # not a tuple for this output type
+                if isinstance(directional_output, pd.Series):
+                    directional_output = directional_output.to_frame()
+                column: str
+                for column in directional_output.columns:
+                    columns[f"{column} {result_direction}"] = directional_output[column]
+            return pd.DataFrame(columns, index=self.index)
+        if direction is not None and direction != self.direction:
+            return self.with_direction(direction).output(output_type, per_locus)
+        if per_locus:
+            return self.per_locus_output(output_type)
+        if output_type == OutputType.COUNT:
+            return self.counts
+        if output_type == OutputType.ONLY_DETAILS:
+            return self.details
+        return pd.concat([self.counts, self.details], axis=1)  # OutputType.DETAILS_AND_COUNT
+
+    def write(self, output_path: str, output_types: Iterable[OutputType]) -> list[str]:
+        """
+        Writes each requested output to its own csv file as soon as it is computed: f"{output_path}.csv" for
+        OutputType.DETAILS_AND_COUNT, f"{output_path}_count.csv" for OutputType.COUNT, f"{output_path}_details.csv" for
+        OutputType.ONLY_DETAILS, and f"{output_path}_removed_donors.csv" and f"{output_path}_removed_recipients.csv" for
+        OutputType.FILTERED_OUT_TYPINGS.
+
+        :param output_path: Output path without the extension
+        :param output_types: outputs to write
+        :return: paths to the written files
+        """
+        paths: list[str] = []
+        output_type: OutputType
+        for output_type in dict.fromkeys(output_types):
+            if output_type == OutputType.FILTERED_OUT_TYPINGS:
+                self.removed_donors.to_csv(f"{output_path}_removed_donors.csv")
+                self.removed_recipients.to_csv(f"{output_path}_removed_recipients.csv")
+                paths += [f"{output_path}_removed_donors.csv", f"{output_path}_removed_recipients.csv"]
+            else:
+                path: str = f"{output_path}{_OUTPUT_FILE_SUFFIXES[output_type]}.csv"
+                _write_eplet_load_result(self.output(output_type), output_type, path)  # type: ignore # not a tuple
+                paths.append(path)
+
+        return paths
+
+
+_RESULT_DIRECTIONS: tuple[str, ...] = ("HvG", "GvH", "Union")
+# directions of the mismatches of an EpletLoadResult (cf. EpletLoadResult.with_direction)
+MISMATCH_DIRECTIONS: tuple[str, ...] = ("HvG", "GvH", "both")
+# values of the direction argument of compute_epletic_load
+
+_OUTPUT_FILE_SUFFIXES: dict[OutputType, str] = {
+    # suffix of the csv file of each output written by EpletLoadResult.write
+    OutputType.DETAILS_AND_COUNT: "",
+    OutputType.COUNT: "_count",
+    OutputType.ONLY_DETAILS: "_details",
+}
+
+
+def _eplet_load_pass(
+    input_df_donor: pd.DataFrame,
+    input_df_recipient: pd.DataFrame,
+    eplet_filter: EpletFilter,
+    simple_comparison: bool,
+    database: EpletDatabase,
+    n_jobs: int = 1,
+    quarantine: bool = False,
+    result_cache: PairResultCache | None = None,
+) -> EpletLoadResult:
+    """
+    Runs the checks of the whole pipeline (unknown alleles check, null alleles replacement and unexpected alleles
+    filtering) on row-aligned donors and recipients. The input dataframes are not modified.
+
+    :param input_df_donor: Input Donors Typing (pandas.DataFrame)
+    :param input_df_recipient: Input Recipients Typing (pandas.DataFrame)
+    :param eplet_filter: eplets taken into account
+    :param simple_comparison: whether or not _unknown_alleles_reasons should be skipped (cf. compute_epletic_load)
+    :param database: EpletDatabase to use
+    :param n_jobs: number of processes the eplet mismatches are computed with (-1 for all the CPUs)
+    :param quarantine: if True, the pairs with inconsistent unknown alleles are removed instead of raising a ValueError
+    :param result_cache: if not None, on-disk cache the eplet mismatches of the pairs are read from and written to
+
+    :return: EpletLoadResult of the pairs, whose removed donors and removed recipients are the typings with alleles that
+             are not found in the EpRegistry database, and the quarantined pairs
+
+    :raises ValueError: cf. compute_epletic_load
+    """
+    quarantined: tuple[pd.DataFrame, pd.DataFrame] | None = None
+    if not simple_comparison:
+        # unknown alleles are the ones that were inputted as "A*", "B*", "C*", "DRB1*", "DRB345*", "DQA1*", "DQB1*",
+        # "DPA1*" and/or "DPB1*". Here we are not talking about the alleles that are unknown to the database.
+        reasons: pd.Series = _unknown_alleles_reasons(input_df_donor, input_df_recipient)
+        is_inconsistent: np.ndarray = (reasons != "").to_numpy()
+        if is_inconsistent.any():
+            if not quarantine:
+                logging.error(
+                    "Either the number of unknown alleles is different for one donor and recipient pair or one allele "
+                    "is unknown whilst the other of the same locus isn't."
+                )
+                raise ValueError(
+                    "Either the number of unknown alleles is different for one donor and recipient pair or one allele "
+                    "is unknown whilst the other of the same locus isn't: "
+                    f"{dict(list(reasons[is_inconsistent].items())[:10])}"
+                )
+            logging.warning(
+                f"{is_inconsistent.sum()} donor / recipient pair(s) with inconsistent unknown alleles will be "
+                f"removed: {reasons[is_inconsistent].index.tolist()}."
+            )
+            unknown_alleles_reasons: np.ndarray = ("unknown alleles: " + reasons[is_inconsistent]).to_numpy()
+            quarantined = (
+                input_df_donor[is_inconsistent].assign(Reason=unknown_alleles_reasons),
+                input_df_recipient[is_inconsistent].assign(Reason=unknown_alleles_reasons),
+            )
+            input_df_donor = input_df_donor[~is_inconsistent]
+            input_df_recipient = input_df_recipient[~is_inconsistent]
+
+    eplet_index: EpletIndex = database.eplet_index()
+
+    # Replace Null alleles with ghost alleles, convert the alleles to integer codes and delete the unexpected alleles
+    # (malformed, not found in the EpRegistry database or of another locus than their column). The inputs are not
+    # modified.
+    donor_codes: pd.DataFrame
+    recipient_codes: pd.DataFrame
+    removed_donors: pd.DataFrame
+    removed_recipients: pd.DataFrame
+    donor_codes, removed_donors = _delete_unexpected_alleles(input_df_donor, eplet_index)
+    recipient_codes, removed_recipients = _delete_unexpected_alleles(input_df_recipient, eplet_index)
+
+    if len(removed_donors) + len(removed_recipients) > 0:
+        logging.warning(
+            "Some alleles inputted by the user were not found in the EpRegistry database. "
+            "They will be removed. "
+            "To find out what typings were removed, please run compute_epletic_load with the output_type argument "
+            "set to OutputType.FILTERED_TYPINGS."
+        )
+    if quarantined is not None:
+        removed_donors = pd.concat([quarantined[0], removed_donors])
+        removed_recipients = pd.concat([quarantined[1], removed_recipients])
+
+    donor_codes, recipient_codes = _remove_unexpected_other_individual(donor_codes, recipient_codes)
+
+    if not recipient_codes.index.equals(donor_codes.index):
+        # pairs are matched by index
+        recipient_codes = recipient_codes.reindex(donor_codes.index)
+
+    if n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+
+    return EpletLoadResult(
+        _PairMismatches(donor_codes, recipient_codes, eplet_index, database, result_cache, n_jobs),
+        removed_donors,
+        removed_recipients,
+        eplet_filter.mask(eplet_index)
+    )
+
+
+def _compute_epletic_load_chunk(
+    input_df_donor: pd.DataFrame,
+    input_df_recipient: pd.DataFrame,
+    output_type: OutputType,
+    class_i: bool,
+    class_ii: bool,
+    verified_only: bool,
+    include_questionable: bool,
+    interlocus2: bool,
+    simple_comparison: bool,
+    database: EpletDatabase,
+    n_jobs: int = 1,
+    quarantine: bool = False,
+    result_cache: PairResultCache | None = None,
+    per_locus: bool = False,
+    direction: str = "HvG",
+) -> tuple[pd.DataFrame | pd.Series | None, pd.DataFrame, pd.DataFrame]:
+    """
+    Runs the whole pipeline (unknown alleles check, null alleles replacement, unexpected alleles filtering and eplet
+    mismatches) on row-aligned donors and recipients. The input dataframes are not modified.
+
+    :param input_df_donor: Input Donors Typing (pandas.DataFrame)
+    :param input_df_recipient: Input Recipients Typing (pandas.DataFrame)
+    :param output_type: What is gonna be in the output
+    :param class_i: Compute class I eplets comparison?
+    :param class_ii: Compute class II eplets comparison?
+    :param verified_only: How should the epletic charge be computed? Verified eplets only? Or all eplets?
+    :param include_questionable: Should we include questionable antibody-verified eplets in the computation?
+    :param interlocus2: whether or not to take into account interlocus eplets for HLA of class II
+    :param simple_comparison: whether or not _unknown_alleles_reasons should be skipped (cf. compute_epletic_load)
+    :param database: EpletDatabase to use
+    :param n_jobs: number of processes the eplet mismatches are computed with (-1 for all the CPUs)
+    :param quarantine: if True, the pairs with inconsistent unknown alleles are removed instead of raising a ValueError
+    :param result_cache: if not None, on-disk cache the eplet mismatches of the pairs are read from and written to
+    :param per_locus: whether or not to also split the eplet loads and/or details per eplet locus
+    :param direction: "HvG", "GvH" or "both" (cf. compute_epletic_load)
+
+    :return: eplet loads and/or details as returned by compute_epletic_load (None for OutputType.FILTERED_OUT_TYPINGS),
+             removed donors and removed recipients (typings with alleles that are not found in the EpRegistry database,
+             and quarantined pairs), with the reason of their removal in an additional "Reason" column
+
+    :raises ValueError: cf. compute_epletic_load
+    """
+    if direction not in MISMATCH_DIRECTIONS:
+        raise ValueError(f"Unknown direction {direction!r} (expected one of {MISMATCH_DIRECTIONS}).")
+
+    eplet_load_result: EpletLoadResult = _eplet_load_pass(
+        input_df_donor,
+        input_df_recipient,
+        EpletFilter(class_i, class_ii, verified_only, include_questionable, interlocus2),
+        simple_comparison,
+        database,
+        n_jobs,
+        quarantine,
+        result_cache
+    )
+
+    output: pd.DataFrame | pd.Series | None = None
+    if output_type != OutputType.FILTERED_OUT_TYPINGS:
+        output = eplet_load_result.output(  # type: ignore # not a tuple for this output type
+            output_type, per_locus, direction
+        )
+
+    return output, eplet_load_result.removed_donors, eplet_load_result.removed_recipients
+
+
+def _worker_database(directory_path: str, cache_directory: str | None) -> EpletDatabase:
+    """
+    :param directory_path: path to where the data folder of the EpletDatabase is located
+    :param cache_directory: cache directory of the EpletDatabase
+
+    :return: EpletDatabase of the worker process (opened once per process), whose EpletIndex is memory-mapped so that
+             its pages are shared between all the workers
+    """
+    database: EpletDatabase = default_database()
+    if database.directory_path != directory_path or database.cache_directory != cache_directory:
+        key: tuple[str, str | None] = (directory_path, cache_directory)
+        if key not in _worker_databases:
+            _worker_databases[key] = EpletDatabase(directory_path, cache_directory)
+        database = _worker_databases[key]
+
+    return database
+
+
+def _mismatches_in_worker(
+    donor_codes: np.ndarray,
+    recipient_codes: np.ndarray,
+    directory_path: str,
+    cache_directory: str | None,
+) -> np.ndarray:
+    """
+    Computes, in a worker process, the unfiltered eplet mismatches of row-aligned donors and recipients. The
+    EpRegistry database is not sent to the worker (cf. _worker_database).
+
+    :param donor_codes: numpy.ndarray of shape (number of pairs, number of alleles) with the allele codes of the donors
+    :param recipient_codes: same for the recipients, row-aligned with donor_codes
+    :param directory_path: path to where the data folder of the EpletDatabase is located
+    :param cache_directory: cache directory of the EpletDatabase
+
+    :return: numpy.ndarray of shape (number of pairs, number of words) with all the eplets that are present on the
+             donor's HLA molecules but not on the recipient's ones
+    """
+    eplet_index: EpletIndex = _worker_database(directory_path, cache_directory).eplet_index()
+    return _mismatches(donor_codes, recipient_codes, eplet_index.bitsets, eplet_index.mask())
+
+
+def _parallel_mismatches(
+    donor_codes: np.ndarray,
+    recipient_codes: np.ndarray,
+    database: EpletDatabase,
+    n_jobs: int,
+) -> np.ndarray:
+    """
+    Splits the row-aligned donors and recipients into n_jobs contiguous parts, computes the mismatches of each part in
+    a pool of n_jobs processes (cf. _mismatches_in_worker) and concatenates them in the original order.
+
+    :param database: EpletDatabase to use (only its location is sent to the workers)
+    :param n_jobs: number of processes
+
+    :return: cf. _mismatches_in_worker (the other parameters are the same)
+    """
+    # compiles the EpletIndex (if needed) once, before the workers memory-map it
+    database.eplet_index()
+
+    parts: list[np.ndarray] = np.array_split(np.arange(len(donor_codes)), min(n_jobs, len(donor_codes)))
+    with ProcessPoolExecutor(max_workers=len(parts)) as executor:
+        results: list[np.ndarray] = list(executor.map(
+            _mismatches_in_worker,
+            [donor_codes[part] for part in parts],
+            [recipient_codes[part] for part in parts],
+            [database.directory_path] * len(parts),
+            [database.cache_directory] * len(parts),
+        ))
+
+    return np.concatenate(results)
+
+
+def _write_eplet_load_result(
+    eplet_load_result: pd.DataFrame | pd.Series,
+    output_type: OutputType,
+    path: str,
+    append: bool = False,
+) -> None:
+    """
+    :param eplet_load_result: eplet loads and/or details (cf. _compute_epletic_load_chunk)
+    :param output_type: output type eplet_load_result was computed for
+    :param path: path to the csv file (with the extension)
+    :param append: if True, the rows are appended to the file (without the header) instead of overwriting it
+    """
+    if output_type == OutputType.COUNT:
+        eplet_load_result.to_csv(path, mode="a" if append else "w", header=not append)
+    else:
+        eplet_load_result.to_csv(
+            path, mode="a" if append else "w", header=not append, quoting=csv.QUOTE_NONNUMERIC
+        )
 
 
 # MAIN
@@ -34,6 +737,12 @@ def compute_epletic_load(
     exclude: list[int | str] | None = None,
     interlocus2: bool = True,
     simple_comparison: bool = False,
+    database: EpletDatabase | None = None,
+    n_jobs: int = 1,
+    quarantine: bool = False,
+    result_cache: PairResultCache | None = None,
+    per_locus: bool = False,
+    direction: str = "HvG",
 ) -> None | pd.DataFrame | pd.Series | tuple[pd.DataFrame, pd.DataFrame]:
     """
     :param input_df_donor: Input Donors Typing (pandas.DataFrame)
@@ -48,16 +757,36 @@ def compute_epletic_load(
     :param exclude: list of indices to exclude
     :param interlocus2: whether or not to take into account interlocus eplets for HLA of class II
     :param simple_comparison: whether or not it's a simple allele to allele comparison in which case, the function
-    _equal_amount_of_unknown_alleles is not called (checks are already made in simple_comparison.py and would not
+    _unknown_alleles_reasons is not called (checks are already made in simple_comparison.py and would not
     pass here given the column names).
+    :param database: EpletDatabase to use. If None, the process-wide one (cf. eplet_database.default_database) is used
+    so that the EpRegistry reference tables are only loaded once.
+    :param n_jobs: number of processes the eplet mismatches are computed with (-1 for all the CPUs). The pairs are
+    split into n_jobs parts and the output keeps the original order. The workers memory-map the EpletIndex of the
+    database instead of receiving a copy of it.
+    :param quarantine: if True, the donor / recipient pairs whose unknown alleles are inconsistent (cf. :raises:) are
+    left out and reported in the OutputType.FILTERED_OUT_TYPINGS output instead of raising a ValueError.
+    :param result_cache: if not None, on-disk cache of the eplet mismatches of the pairs in each direction (cf.
+    result_cache.PairResultCache): the pairs already computed by a previous run are read from it and only the new ones
+    are computed (with n_jobs processes). The proportion of pairs served from the cache is logged (logging.INFO) and
+    kept in result_cache.hit_ratio.
+    :param per_locus: whether or not to also split the eplet loads and/or details per eplet locus ("ABC", "DR", "DQ",
+    "DP" and "i2" for interlocus eplets): the output is then a pandas.DataFrame with the total columns followed by the
+    columns of each eplet locus ("Eplet Load ABC", "EpMismatches ABC", ...), computed in the same pass.
+    :param direction: "HvG" for the eplets of the donor that the recipient doesn't have (host versus graft, default),
+    "GvH" for the eplets of the recipient that the donor doesn't have (graft versus host, e.g. for HSCT), or "both": the
+    output is then a pandas.DataFrame with the columns of both directions and of their union (eplets mismatched in
+    either direction) side by side, suffixed with " HvG", " GvH" and " Union", computed from the same repertoires.
 
     :return: None (if output_type is not None, the result will be saved on disk as a csv), or pandas.DataFrame
              (OutputType.COUNT_AND_DETAILS) or pandas.Series (OutputType.COUNT, or OutputType.ONLY_DETAILS) or
-             tuple[pandas.DataFrame, pandas.DataFrame] (OutputType.FILTERED_TYPINGS)
+             tuple[pandas.DataFrame, pandas.DataFrame] (OutputType.FILTERED_TYPINGS, the "Reason" column giving why
+             each typing was removed)
 
     :raises ValueError: if the number of unknown alleles is different for one donor and recipient pair or one allele is
-                        unknown whilst the other of the same locus isn't. Obviously doesn't raise anything if user
-                        inputs a homozygous like this: donor: A*01:01 A* and recipient: A*01:01 A*11:01.
+                        unknown whilst the other of the same locus isn't (unless quarantine is True). Obviously doesn't
+                        raise anything if user inputs a homozygous like this: donor: A*01:01 A* and recipient: A*01:01
+                        A*11:01. Also raised if direction is not "HvG", "GvH" or "both".
     """
     if not class_i and not class_ii:
         logging.error(
@@ -74,166 +803,414 @@ def compute_epletic_load(
         )
         return None
 
-    if not simple_comparison:
-        if not _equal_amount_of_unknown_alleles(input_df_donor, input_df_recipient):
-            # unknown alleles are the ones that were inputted as "A*", "B*", "C*", "DRB1*", "DRB345*", "DQA1*", "DQB1*",
-            # "DPA1*" and/or "DPB1*". Here we are not talking about the alleles that are unknown to the database.
-            logging.error(
-                "Either the number of unknown alleles is different for one donor and recipient pair or one allele is "
-                "unknown whilst the other of the same locus isn't."
-            )
-            raise ValueError(
-                "Either the number of unknown alleles is different for one donor and recipient pair or one allele is "
-                "unknown whilst the other of the same locus isn't."
-            )
+    if database is None:
+        database = default_database()
+
+    eplet_load_result: pd.DataFrame | pd.Series | None
+    removed_donors: pd.DataFrame
+    removed_recipients: pd.DataFrame
+    eplet_load_result, removed_donors, removed_recipients = _compute_epletic_load_chunk(
+        input_df_donor,
+        input_df_recipient,
+        output_type,
+        class_i,
+        class_ii,
+        verified_only,
+        include_questionable,
+        interlocus2,
+        simple_comparison,
+        database,
+        n_jobs,
+        quarantine,
+        result_cache,
+        per_locus,
+        direction
+    )
 
+    if output_type == OutputType.FILTERED_OUT_TYPINGS:
+        if output_path is None:
+            return removed_donors, removed_recipients
+        else:
+            removed_donors.to_csv(f"{output_path}_removed_donors.csv")
+            removed_recipients.to_csv(f"{output_path}_removed_recipients.csv")
+    elif eplet_load_result is not None:
+        if output_path is None:
+            return eplet_load_result
+        else:
+            _write_eplet_load_result(eplet_load_result, output_type, f"{output_path}.csv")
 
-    df_a: pd.DataFrame
-    df_b: pd.DataFrame
-    df_c: pd.DataFrame
-    df_dr: pd.DataFrame
-    df_dq: pd.DataFrame
-    df_dp: pd.DataFrame
-    df_data: pd.DataFrame
+    return None
+
+
+def compute_epletic_load_result(
+    input_df_donor: pd.DataFrame,
+    input_df_recipient: pd.DataFrame,
+    class_i: bool = True,
+    class_ii: bool = True,
+    verified_only: bool = False,
+    include_questionable: bool = False,
+    interlocus2: bool = True,
+    simple_comparison: bool = False,
+    database: EpletDatabase | None = None,
+    n_jobs: int = 1,
+    quarantine: bool = False,
+    result_cache: PairResultCache | None = None,
+) -> EpletLoadResult:
     """
-    df_data sums up the properties of each amino acid
+    Same as compute_epletic_load, but for all the output types at once: the typings are loaded, validated, normalised
+    and converted once, and the returned EpletLoadResult computes each output on first access (counts, details,
+    per_locus_counts, removed_donors and removed_recipients, output(output_type)) or writes several of them to disk
+    (write(output_path, output_types)).
+
+    :param input_df_donor: Input Donors Typing (pandas.DataFrame), not modified
+    :param input_df_recipient: Input Recipients Typing (pandas.DataFrame), not modified
+
+    Other parameters: cf. compute_epletic_load.
+
+    :return: EpletLoadResult of the donor / recipient pairs
+
+    :raises ValueError: if the number of donors is different from the number of recipients, or cf.
+                        compute_epletic_load
     """
+    if not class_i and not class_ii:
+        logging.error(
+            "User did not request class I eplet comparison nor did they request class II eplet comparison."
+        )
+
+    if len(input_df_donor) != len(input_df_recipient):
+        raise ValueError("The number of donors is different from the number of recipients.")
+
+    if database is None:
+        database = default_database()
+
+    return _eplet_load_pass(
+        input_df_donor,
+        input_df_recipient,
+        EpletFilter(class_i, class_ii, verified_only, include_questionable, interlocus2),
+        simple_comparison,
+        database,
+        n_jobs,
+        quarantine,
+        result_cache
+    )
+
 
-    this_file_directory_path: str = os.path.dirname(os.path.realpath(__file__))
-    if class_i and class_ii:
-        df_a = _open_epregistry_database(f"{this_file_directory_path}/data/A.csv", ["A*"])
-        df_b = _open_epregistry_database(f"{this_file_directory_path}/data/B.csv", ["B*"])
-        df_c = _open_epregistry_database(f"{this_file_directory_path}/data/C.csv", ["C*"])
-        df_dr = _open_epregistry_database(f"{this_file_directory_path}/data/DR.csv", ["DRB1*", "DRB345*"])
-        df_dq = _open_epregistry_database(f"{this_file_directory_path}/data/DQ.csv", ["DQB1*", "DQA1*"])
-        df_dp = _open_epregistry_database(f"{this_file_directory_path}/data/DP.csv", ["DPB1*", "DPA1*"])
+def compute_epletic_load_configurations(
+    input_df_donor: pd.DataFrame,
+    input_df_recipient: pd.DataFrame,
+    output_path: str | None,
+    output_type: OutputType = OutputType.COUNT,
+    eplet_filters: dict[str, EpletFilter] | None = None,
+    simple_comparison: bool = False,
+    database: EpletDatabase | None = None,
+    n_jobs: int = 1,
+    quarantine: bool = False,
+    result_cache: PairResultCache | None = None,
+) -> pd.DataFrame | None:
+    """
+    Eplet loads and/or details of the same donor / recipient pairs for several eplet filters (e.g. all eplets,
+    antibody-verified only, verified and questionable, each with and without interlocus eplets), in a single pass.
+
+    :param input_df_donor: Input Donors Typing (pandas.DataFrame), not modified
+    :param input_df_recipient: Input Recipients Typing (pandas.DataFrame), not modified
+    :param output_path: Output path without the extension. If None, the output will be returned as a pandas.DataFrame.
+    :param output_type: OutputType.COUNT, OutputType.ONLY_DETAILS or OutputType.DETAILS_AND_COUNT
+    :param eplet_filters: eplet filters to evaluate (name: filter). If None, STANDARD_EPLET_FILTERS.
+
+    Other parameters: cf. compute_epletic_load.
+
+    :return: None (the result is then saved to f"{output_path}.csv") or pandas.DataFrame with one column per eplet
+             filter and per output (cf. EpletLoadResult.configurations)
+
+    :raises ValueError: for OutputType.FILTERED_OUT_TYPINGS, or cf. compute_epletic_load_result
+    """
+    wide_result: pd.DataFrame = compute_epletic_load_result(
+        input_df_donor,
+        input_df_recipient,
+        simple_comparison=simple_comparison,
+        database=database,
+        n_jobs=n_jobs,
+        quarantine=quarantine,
+        result_cache=result_cache
+    ).configurations(eplet_filters, output_type)
+
+    if output_path is None:
+        return wide_result
+    _write_eplet_load_result(wide_result, output_type, f"{output_path}.csv")
+
+    return None
+
+
+def _read_typing_chunks(
+    source: str | Iterable[pd.DataFrame],
+    chunk_size: int,
+) -> Iterator[pd.DataFrame]:
+    """
+    :param source: path to a .csv or .parquet file, or iterable of pandas.DataFrames, with one donor / recipient pair
+                   per row and the same columns as the input file of the batch mode (cf. split_dataframe), the first
+                   column of a file being the index
+    :param chunk_size: maximum number of rows per chunk (ignored for an iterable of pandas.DataFrames)
+
+    :return: iterator over the chunks of typings
+
+    :raises ImportError: if source is a .parquet file and pyarrow is not installed
+    :raises ValueError: if source is a file with another extension
+    """
+    if not isinstance(source, str):
+        yield from source
+        return
+
+    extension: str = os.path.splitext(source)[1].lower()
+    if extension == ".csv":
+        yield from pd.read_csv(source, index_col=0, chunksize=chunk_size)
+    elif extension == ".parquet":
+        try:
+            import pyarrow.parquet  # type: ignore[import-not-found, unused-ignore]  # optional dependency
+        except ImportError as exception:
+            raise ImportError(
+                "Reading typings from a parquet file requires pyarrow (pip install pyarrow)."
+            ) from exception
+        n_read_rows: int = 0
+        for record_batch in pyarrow.parquet.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            chunk: pd.DataFrame = record_batch.to_pandas()
+            if isinstance(chunk.index, pd.RangeIndex):
+                # the index was not stored as such: it is either the first column (as for csv files) or the row number
+                if chunk.columns[0].endswith(("_D", "_R")):
+                    chunk.index = pd.RangeIndex(n_read_rows, n_read_rows + len(chunk))
+                else:
+                    chunk = chunk.set_index(chunk.columns[0])
+            n_read_rows += len(chunk)
+            yield chunk
     else:
-        if class_i:
-            df_a = _open_epregistry_database(f"{this_file_directory_path}/data/A.csv", ["A*"])
-            df_b = _open_epregistry_database(f"{this_file_directory_path}/data/B.csv", ["B*"])
-            df_c = _open_epregistry_database(f"{this_file_directory_path}/data/C.csv", ["C*"])
-            # we don't want to load .csv files if they are not needed
-            df_dr = _open_epregistry_database(
-                f"{this_file_directory_path}/data/DR.csv", ["DRB1*", "DRB345*"], no_eplets=True
-            )
-            df_dq = _open_epregistry_database(
-                f"{this_file_directory_path}/data/DQ.csv", ["DQB1*", "DQA1*"], no_eplets=True
-            )
-            df_dp = _open_epregistry_database(
-                f"{this_file_directory_path}/data/DP.csv", ["DPB1*", "DPA1*"], no_eplets=True
-            )
-        else:
-            df_dr = _open_epregistry_database(f"{this_file_directory_path}/data/DR.csv", ["DRB1*", "DRB345*"])
-            df_dq = _open_epregistry_database(f"{this_file_directory_path}/data/DQ.csv", ["DQB1*", "DQA1*"])
-            df_dp = _open_epregistry_database(f"{this_file_directory_path}/data/DP.csv", ["DPB1*", "DPA1*"])
-            # we don't want to load .csv files if they are not needed
-            df_a = _open_epregistry_database(
-                f"{this_file_directory_path}/data/A.csv", ["A*"], no_eplets=True
-            )
-            df_b = _open_epregistry_database(
-                f"{this_file_directory_path}/data/B.csv", ["B*"], no_eplets=True
-            )
-            df_c = _open_epregistry_database(
-                f"{this_file_directory_path}/data/C.csv", ["C*"], no_eplets=True
-            )
+        raise ValueError(f"Unsupported typings file extension {extension!r} (expected .csv or .parquet).")
 
-    df_data = _open_ep_data(this_file_directory_path)
 
-    # Replace Null alleles with ghost alleles in input_df_donors and input_df_recipients
-    _replace_null_alleles(input_df_donor)
-    _replace_null_alleles(input_df_recipient)
+def compute_epletic_load_streaming(
+    source: str | Iterable[pd.DataFrame],
+    output_path: str,
+    output_type: OutputType,
+    class_i: bool = True,
+    class_ii: bool = True,
+    verified_only: bool = False,
+    include_questionable: bool = False,
+    exclude: list[int | str] | None = None,
+    interlocus2: bool = True,
+    chunk_size: int = 10_000,
+    database: EpletDatabase | None = None,
+    n_jobs: int = 1,
+    quarantine: bool = False,
+    result_cache: PairResultCache | None = None,
+    per_locus: bool = False,
+    direction: str = "HvG",
+) -> None:
+    """
+    Same as compute_epletic_load, but the typings are read and processed chunk by chunk and the results are appended to
+    the output files after each chunk, so that the memory used doesn't depend on the size of the cohort.
 
-    # Delete unexpected alleles (those who are not found in the EpRegistry database)
-    input_df_donor, removed_donors = _delete_unexpected_alleles(
-        input_df_donor, df_a, df_b, df_c, df_dr, df_dq, df_dp
-    )
-    input_df_recipient, removed_recipients = _delete_unexpected_alleles(
-        input_df_recipient, df_a, df_b, df_c, df_dr, df_dq, df_dp
-    )
+    :param source: path to a .csv or .parquet file (the first column being the index), or iterable of
+                   pandas.DataFrames, with one donor / recipient pair per row and the columns of the input file of the
+                   batch mode (donor columns ending with "_D", recipient columns ending with "_R", cf.
+                   split_dataframe). A .parquet file requires pyarrow.
+    :param output_path: Output path without the extension
+    :param output_type: What is gonna be in the output file
+    :param class_i: Compute class I eplets comparison?
+    :param class_ii: Compute class II eplets comparison?
+    :param verified_only: How should the epletic charge be computed? Verified eplets only? Or all eplets?
+    :param include_questionable: Should we include questionable antibody-verified eplets in the computation?
+    This argument is ignored if verified_only is False.
+    :param exclude: list of indices to exclude
+    :param interlocus2: whether or not to take into account interlocus eplets for HLA of class II
+    :param chunk_size: number of donor / recipient pairs read and processed at once (for files)
+    :param database: EpletDatabase to use. If None, the process-wide one is used.
+    :param n_jobs: number of processes the eplet mismatches of each chunk are computed with (cf.
+    compute_epletic_load)
+    :param quarantine: if True, the pairs with inconsistent unknown alleles are written to the removed typings files
+    instead of raising a ValueError (cf. compute_epletic_load)
+    :param result_cache: if not None, on-disk cache of the eplet mismatches of the pairs (cf. compute_epletic_load)
+    :param per_locus: whether or not to also split the eplet loads and/or details per eplet locus (cf.
+    compute_epletic_load)
+    :param direction: "HvG", "GvH" or "both" (cf. compute_epletic_load)
 
-    if len(removed_donors) + len(removed_recipients) > 0:
-        logging.warning(
-            "Some alleles inputted by the user were not found in the EpRegistry database. "
-            "They will be removed. "
-            "To find out what typings were removed, please run compute_epletic_load with the output_type argument "
-            "set to OutputType.FILTERED_TYPINGS."
+    :return: None. The output is written to f"{output_path}.csv" (except for OutputType.FILTERED_OUT_TYPINGS), and the
+             typings with alleles that are not found in the EpRegistry database are always written to
+             f"{output_path}_removed_donors.csv" and f"{output_path}_removed_recipients.csv", so that a single pass
+             over the typings is needed. The files hold the chunks processed so far if an error occurs.
+
+    :raises ValueError: if the number of unknown alleles is different for one donor and recipient pair or one allele is
+                        unknown whilst the other of the same locus isn't, unless quarantine is True (cf.
+                        compute_epletic_load)
+    """
+    if not class_i and not class_ii:
+        logging.error(
+            "User did not request class I eplet comparison nor did they request class II eplet comparison."
         )
 
-    if output_type == OutputType.FILTERED_OUT_TYPINGS:
-        if output_path is None:
-            return removed_donors, removed_recipients
-        else:
-            removed_donors.to_csv(f"{output_path}_removed_donors.csv")
-            removed_recipients.to_csv(f"{output_path}_removed_recipients.csv")
-    else:
-        input_df_donor, input_df_recipient = _remove_unexpected_other_individual(input_df_donor, input_df_recipient)
+    if database is None:
+        database = default_database()
 
-        donors_eplets_per_allele: pd.DataFrame = _allele_df_to_eplets_df(
+    append: bool = False
+    chunk: pd.DataFrame
+    for chunk in _read_typing_chunks(source, chunk_size):
+        if exclude is not None:
+            chunk = chunk.drop(exclude, axis=0, errors="ignore")
+
+        input_df_donor: pd.DataFrame
+        input_df_recipient: pd.DataFrame
+        input_df_donor, input_df_recipient = split_dataframe(chunk)
+
+        eplet_load_result: pd.DataFrame | pd.Series | None
+        removed_donors: pd.DataFrame
+        removed_recipients: pd.DataFrame
+        eplet_load_result, removed_donors, removed_recipients = _compute_epletic_load_chunk(
             input_df_donor,
-            df_a,
-            df_b,
-            df_c,
-            df_dr,
-            df_dq,
-            df_dp,
-            df_data,
-            interlocus2,
-            verified_only,
-            include_questionable
-        )
-        recipients_eplets_per_allele: pd.DataFrame = _allele_df_to_eplets_df(
             input_df_recipient,
-            df_a,
-            df_b,
-            df_c,
-            df_dr,
-            df_dq,
-            df_dp,
-            df_data,
-            interlocus2,
+            output_type,
+            class_i,
+            class_ii,
             verified_only,
-            include_questionable
+            include_questionable,
+            interlocus2,
+            False,
+            database,
+            n_jobs,
+            quarantine,
+            result_cache,
+            per_locus,
+            direction
         )
 
-        # Concatenate all loci
-        donor_all_eplets: pd.Series = donors_eplets_per_allele.sum(axis=1).rename("Donors' eplets")
-        recipient_all_eplets: pd.Series = recipients_eplets_per_allele.sum(axis=1).rename("Recipients' eplets")
+        removed_donors.to_csv(f"{output_path}_removed_donors.csv", mode="a" if append else "w", header=not append)
+        removed_recipients.to_csv(
+            f"{output_path}_removed_recipients.csv", mode="a" if append else "w", header=not append
+        )
+        if eplet_load_result is not None:
+            _write_eplet_load_result(eplet_load_result, output_type, f"{output_path}.csv", append)
+        append = True
 
-        # Eliminate eplet doublons
-        donor_all_eplets = donor_all_eplets.apply(lambda x: set(x))
-        recipient_all_eplets = recipient_all_eplets.apply(lambda x: set(x))
 
-        # Return eplets that are present on the donor's HLA molecules but not on the recipient's ones
-        both_all_eplets: pd.DataFrame = pd.concat(
-            [donor_all_eplets, recipient_all_eplets],
-            axis=1
-        )
+def compute_epletic_load_matrix(
+    input_df_donor: pd.DataFrame,
+    input_df_recipient: pd.DataFrame,
+    class_i: bool = True,
+    class_ii: bool = True,
+    verified_only: bool = False,
+    include_questionable: bool = False,
+    interlocus2: bool = True,
+    per_locus: bool = False,
+    database: EpletDatabase | None = None,
+) -> pd.DataFrame | dict[str, pd.DataFrame]:
+    """
+    Eplet load of every donor against every recipient (all-vs-all), whereas compute_epletic_load compares row-aligned
+    donor / recipient pairs. The loads are computed by blocks so that the memory used (apart from the output) doesn't
+    depend on the number of donors and recipients.
 
-        eplet_load_detail: pd.Series = (
-                both_all_eplets["Donors' eplets"] - both_all_eplets["Recipients' eplets"]
-        ).rename("EpMismatches")
-        if output_type == OutputType.DETAILS_AND_COUNT or output_type == OutputType.COUNT:
-            eplet_load: pd.Series = eplet_load_detail.apply(len).rename("Eplet Load")
-            if output_type == OutputType.DETAILS_AND_COUNT:
-                eplet_load_detail = _transform_eplet_load_detail(eplet_load_detail)
-                eplet_load_and_detail = pd.concat(
-                    [eplet_load, eplet_load_detail],
-                    axis=1
-                )
-                if output_path is None:
-                    return eplet_load_and_detail
-                else:
-                    eplet_load_and_detail.to_csv(f"{output_path}.csv", quoting=csv.QUOTE_NONNUMERIC)
-            else:  # OutputType.COUNT
-                if output_path is None:
-                    return eplet_load
-                else:
-                    eplet_load.to_csv(f"{output_path}.csv")
-        elif output_type == OutputType.ONLY_DETAILS:
-            eplet_load_detail = _transform_eplet_load_detail(eplet_load_detail)
-            if output_path is None:
-                return eplet_load_detail
-            else:
-                eplet_load_detail.to_csv(f"{output_path}.csv", quoting=csv.QUOTE_NONNUMERIC)
+    :param input_df_donor: Input Donors Typing (pandas.DataFrame), not modified
+    :param input_df_recipient: Input Recipients Typing (pandas.DataFrame), not modified
+    :param class_i: Compute class I eplets comparison?
+    :param class_ii: Compute class II eplets comparison?
+    :param verified_only: How should the epletic charge be computed? Verified eplets only? Or all eplets?
+    :param include_questionable: Should we include questionable antibody-verified eplets in the computation?
+    This argument is ignored if verified_only is False.
+    :param interlocus2: whether or not to take into account interlocus eplets for HLA of class II
+    :param per_locus: whether or not to also split the eplet load per eplet locus
+    :param database: EpletDatabase to use. If None, the process-wide one is used.
 
-    return None
+    :return: pandas.DataFrame (index: donors, columns: recipients) with the eplet load of each donor / recipient pair,
+             or if per_locus is True, dict with such a pandas.DataFrame for "Total" and for each eplet locus ("ABC",
+             "DR", "DQ", "DP" and "i2" for interlocus eplets). Donors and recipients with alleles that are not found in
+             the EpRegistry database are left out. Contrary to compute_epletic_load, the number of unknown alleles
+             ("A*", "B*", ...) of each donor / recipient pair isn't checked.
+    """
+    if database is None:
+        database = default_database()
+
+    eplet_index: EpletIndex = database.eplet_index()
+    donor_codes: pd.DataFrame = _prepare_typings(input_df_donor, eplet_index)
+    recipient_codes: pd.DataFrame = _prepare_typings(input_df_recipient, eplet_index)
+
+    mask: np.ndarray = eplet_index.mask(class_i, class_ii, verified_only, include_questionable, interlocus2)
+    masks: list[np.ndarray] = [mask]
+    if per_locus:
+        masks += [mask & eplet_index.locus_mask(locus) for locus in EPLET_LOCI]
+
+    counts: np.ndarray = _cross_mismatch_counts(
+        _code_repertoires(donor_codes.to_numpy(), eplet_index),
+        _code_repertoires(recipient_codes.to_numpy(), eplet_index),
+        masks
+    )
+    load_matrices: list[pd.DataFrame] = [
+        pd.DataFrame(count_matrix, index=donor_codes.index, columns=recipient_codes.index) for count_matrix in counts
+    ]
+
+    if per_locus:
+        return dict(zip(("Total",) + EPLET_LOCI, load_matrices))
+    return load_matrices[0]
+
+
+def rank_donors(
+    recipient: pd.Series | pd.DataFrame,
+    input_df_donor: pd.DataFrame,
+    k: int,
+    class_i: bool = True,
+    class_ii: bool = True,
+    verified_only: bool = False,
+    include_questionable: bool = False,
+    interlocus2: bool = True,
+    database: EpletDatabase | None = None,
+) -> pd.DataFrame:
+    """
+    Finds the k donors with the lowest eplet load for one recipient, without formatting any eplet detail.
+
+    :param recipient: Input Recipient Typing (pandas.Series, or pandas.DataFrame with a single row), not modified
+    :param input_df_donor: Input Donors Typing (pandas.DataFrame), not modified
+    :param k: number of donors to return
+    :param class_i: Compute class I eplets comparison?
+    :param class_ii: Compute class II eplets comparison?
+    :param verified_only: How should the epletic charge be computed? Verified eplets only? Or all eplets?
+    :param include_questionable: Should we include questionable antibody-verified eplets in the computation?
+    This argument is ignored if verified_only is False.
+    :param interlocus2: whether or not to take into account interlocus eplets for HLA of class II
+    :param database: EpletDatabase to use. If None, the process-wide one is used.
+
+    :return: pandas.DataFrame with the (at most) k donors with the lowest eplet load, sorted by increasing eplet load
+             (donors with the same load stay in their input order), with their "Eplet Load" and their eplet load per
+             eplet locus ("Eplet Load ABC", "Eplet Load DR", "Eplet Load DQ", "Eplet Load DP" and "Eplet Load i2").
+             Donors with alleles that are not found in the EpRegistry database are left out. Contrary to
+             compute_epletic_load, the number of unknown alleles ("A*", "B*", ...) of each pair isn't checked.
+
+    :raises ValueError: if the recipient has alleles that are not found in the EpRegistry database
+    """
+    if database is None:
+        database = default_database()
+
+    df_recipient: pd.DataFrame = recipient.to_frame().T if isinstance(recipient, pd.Series) else recipient
+    if len(df_recipient) != 1:
+        raise ValueError("rank_donors takes a single recipient.")
+    eplet_index: EpletIndex = database.eplet_index()
+    recipient_codes: pd.DataFrame = _prepare_typings(df_recipient, eplet_index)
+    if len(recipient_codes) == 0:
+        raise ValueError("The recipient has alleles that were not found in the EpRegistry database.")
+    donor_codes: pd.DataFrame = _prepare_typings(input_df_donor, eplet_index)
+
+    mismatches: np.ndarray = (
+        _code_repertoires(donor_codes.to_numpy(), eplet_index)
+        & ~_code_repertoires(recipient_codes.to_numpy(), eplet_index)
+        & eplet_index.mask(class_i, class_ii, verified_only, include_questionable, interlocus2)
+    )
+    eplet_loads: np.ndarray = _popcount(mismatches)
+
+    # the position breaks ties so that the selection and the order are deterministic
+    ranking_keys: np.ndarray = eplet_loads * len(eplet_loads) + np.arange(len(eplet_loads))
+    selected: np.ndarray
+    if k < len(ranking_keys):
+        selected = np.argpartition(ranking_keys, max(k, 1) - 1)[:max(k, 0)]
+    else:
+        selected = np.arange(len(ranking_keys))
+    selected = selected[np.argsort(ranking_keys[selected])]
+
+    ranking: pd.DataFrame = pd.DataFrame({"Eplet Load": eplet_loads[selected]}, index=donor_codes.index[selected])
+    locus: str
+    for locus in EPLET_LOCI:
+        ranking[f"Eplet Load {locus}"] = _popcount(mismatches[selected] & eplet_index.locus_mask(locus))
+
+    return ranking
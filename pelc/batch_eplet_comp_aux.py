@@ -1,10 +1,13 @@
 # IMPORTS
 import logging
-from argparse import ArgumentError
 
+import numpy as np
 import pandas as pd
 import re
 
+from pelc._alleles import _normalise_allele
+
+
 # FUNCTIONS
 def split_dataframe(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
@@ -17,207 +20,6 @@ def split_dataframe(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     return df.filter(regex='_D').copy(), df.filter(regex='_R').copy()
 
 
-def _is_eplet_to_be_added(
-        eplet: str,
-        suffix: str,
-        df_data: pd.DataFrame,
-        verified_only: bool = False,
-        include_questionable: bool = False
-) -> bool:
-    """
-    Checks whether the eplet should be added
-    :param eplet: is it the correct eplet
-    :param suffix: is it the correct gene (needed because for example 26L is a DR eplet but also a DQ eplet)
-    :param df_data: reference pandas.DataFrame with details about the eplets
-    :param verified_only: whether or not to take into account only verified eplets
-    :param include_questionable: whether or not to take into account questionable antibody verified eplets.
-
-    :return: whether or not the eplet should be added to the list of eplets
-    """
-
-    if not verified_only:
-        # if verified only is False, then we don't care about the 'confirmation' column
-        return True
-
-    locus_det: str
-    if eplet[0] in ["R", "Q", "P"]:
-        locus_det = "i2"
-    else:
-        locus_det = suffix
-
-    if include_questionable:
-        return (
-            df_data[
-                (df_data["eplet"] == eplet)
-                &
-                (df_data["locus"] == locus_det)
-            ]["confirmation"].item() in ["Confirmed", "Questionable"]
-        )
-    return (
-        df_data[
-            (df_data["eplet"] == eplet)
-            &
-            (df_data["locus"] == locus_det)
-        ]["confirmation"].item() == "Confirmed"
-    )
-
-
-
-def _convert_to_eplets(
-        allele: str,
-        df_ref: pd.DataFrame,
-        suffix: str,
-        df_data: pd.DataFrame,
-        interlocus2: bool,
-        verified_only: bool = False,
-        include_questionable: bool = False
-) -> list[str]:
-    """
-    :param allele: allele to convert
-    :param df_ref: reference pandas.DataFrame for the locus of the allele
-    :param suffix: which locus the allele belongs to
-    :param df_data: reference pandas.DataFrame with details about all the eplets (ep_data.csv)
-    :param interlocus2: whether or not to take into account interlocus eplets for HLA of class II
-    :param verified_only: whether or not to take into account only verified eplets
-    :param include_questionable: whether or not to take into account questionable antibody verified eplets.
-
-    :return: list of eplets corresponding to the input allele
-    """
-
-    eplet_list: list[str] = []
-    for eplet in df_ref.loc[allele].values:
-        assert df_ref.index.is_unique
-        if not pd.isnull(eplet):  # noqa, df_ref.index doesn't have duplicates, eplet is a scalar
-            assert isinstance(eplet, str)
-            if _is_eplet_to_be_added(eplet, suffix, df_data, verified_only, include_questionable):
-                if eplet[0] in ["R", "Q", "P"]:
-                    if interlocus2:
-                        eplet_list.append(eplet)
-                else:
-                    eplet_list.append(f"{eplet}_{suffix}")
-
-    return eplet_list
-
-
-
-def _allele_df_to_eplets_df(
-        df: pd.DataFrame,
-        df_a: pd.DataFrame,
-        df_b: pd.DataFrame,
-        df_c: pd.DataFrame,
-        df_dr: pd.DataFrame,
-        df_dq: pd.DataFrame,
-        df_dp: pd.DataFrame,
-        df_data: pd.DataFrame,
-        interlocus2: bool,
-        verified_only: bool = False,
-        include_questionable: bool = False
-) -> pd.DataFrame:
-    """
-    Transformation of the allele dataframe (index + alleles) into an eplet dataframe (index + eplets)
-
-    :param df: is the input dataframe of the donor or the recipient
-    :param df_a: reference dataframe HLA A
-    :param df_b: reference dataframe HLA B
-    :param df_c: reference dataframe HLA C
-    :param df_dr: reference dataframe HLA DRB1
-    :param df_dq: reference dataframe HLA DQB1
-    :param df_dp: reference dataframe HLA DPB1
-    :param df_data: reference pandas.DataFrame with details about all the eplets (ep_data.csv)
-    :param interlocus2: whether or not to take into account interlocus eplets for HLA of class II
-    :param verified_only: whether or not to take into account only verified eplets
-    :param include_questionable: whether or not to take into account questionable antibody verified eplets.
-
-    :return: pd.DataFrame with eplets for each patient, for each locus
-    """
-
-    eplets_per_allele_dataframe: pd.DataFrame = df.map(
-        lambda allele:
-        _convert_to_eplets(
-            allele,
-            df_a,
-            "ABC",
-            df_data,
-            interlocus2,
-            verified_only,
-            include_questionable
-        )
-        if allele[0] == "A"
-        else (
-            _convert_to_eplets(
-                allele,
-                df_b,
-                "ABC",
-                df_data,
-                interlocus2,
-                verified_only,
-                include_questionable
-            )
-            if allele[0] == "B"
-            else
-            (
-                _convert_to_eplets(
-                    allele,
-                    df_c,
-                    "ABC",
-                    df_data,
-                    interlocus2,
-                    verified_only,
-                    include_questionable
-                )
-                if allele[0] == "C"
-                else
-                (
-                    _convert_to_eplets(
-                        allele,
-                        df_dr,
-                        "DR",
-                        df_data,
-                        interlocus2,
-                        verified_only,
-                        include_questionable
-                    )
-                    if allele[0:2] == "DR"
-                    else
-                    (
-                        _convert_to_eplets(
-                            allele,
-                            df_dq,
-                            "DQ",
-                            df_data,
-                            interlocus2,
-                            verified_only,
-                            include_questionable
-                        )
-                        if allele[0:2] == "DQ"
-                        else
-                        (
-                            _convert_to_eplets(
-                                allele,
-                                df_dp,
-                                "DP",
-                                df_data,
-                                interlocus2,
-                                verified_only,
-                                include_questionable
-                            )
-                            if allele[0:2] == "DP"
-                            else
-                            (
-                                logging.error(f"Allele {allele} belongs to an undefined locus")
-                            )
-                        )
-                    )
-                )
-            )
-        )
-    )
-    # Keep this dataframe in case we would want the user to be able to hover over one of the alleles and to get the
-    # eplet content of its allele.
-
-    return eplets_per_allele_dataframe
-
-
 def _extract_key_to_rank_eplets(eplet: str) -> int:
     """
     :param eplet: e.g. "9Y" or "26L"
@@ -238,56 +40,37 @@ def _extract_key_to_rank_eplets(eplet: str) -> int:
             exit(55)
 
 
-def _transform_eplet_load_detail(eplet_load_detail: pd.Series) -> pd.Series:
+def _normalise_typings(df: pd.DataFrame) -> pd.DataFrame:
     """
-    :param eplet_load_detail: pd.Series with the eplet load details
-    :return: pd.Series with the eplet load details sorted and cleaned up
+    :param df: pd.DataFrame with the typing details, not modified
+    :return: new pd.DataFrame where the null alleles are replaced by the ghost allele of their locus, the DRB3*, DRB4*
+             and DRB5* ghost alleles by DRB345* and the missing alleles by the ghost allele of their column
+
+    The alleles are normalised once per unique value (cf. _normalise_allele) and then mapped back onto the cells.
     """
-    eplet_load_detail = eplet_load_detail.apply(list)
-    eplet_load_detail = eplet_load_detail.apply(
-        lambda list_: sorted(
-            list_,
-            key=_extract_key_to_rank_eplets
-        )
+    codes: np.ndarray
+    unique_alleles: np.ndarray
+    codes, unique_alleles = pd.factorize(df.to_numpy(dtype=object).ravel())
+    normalised_alleles: np.ndarray = np.array(
+        [_normalise_allele(allele) if isinstance(allele, str) else allele for allele in unique_alleles] + [None],
+        dtype=object
     )
-    eplet_load_detail = eplet_load_detail.astype(str)
-    eplet_load_detail = (
-        eplet_load_detail.replace("[]", "None")  # no regex no need to escape
-        .replace("\\[", "", regex=True)
-        .replace("\\]", "", regex=True)
-        .replace("'", "", regex=True)
+    # missing alleles have the code -1, i.e. the trailing None
+    normalised: np.ndarray = normalised_alleles[codes].reshape(df.shape)
+    ghost_alleles: np.ndarray = np.array([column[:-3] + "*" for column in df.columns], dtype=object)
+    normalised = np.where((codes == -1).reshape(df.shape), ghost_alleles[np.newaxis, :], normalised)
+
+    return pd.DataFrame(
+        {column: normalised[:, i] for i, column in enumerate(df.columns)},
+        index=df.index
     )
 
-    return eplet_load_detail
-
 
 def _replace_null_alleles(df: pd.DataFrame) -> None:
     """
     :param df: pd.DataFrame with the typing details
-    :return: None, the dataframe is modified inplace
+    :return: None, the dataframe is modified inplace (cf. _normalise_typings)
     """
-    # Replace Null Alleles
-    df.replace(
-        r'^(.*\*).*N$',
-        r"\1",
-        regex=True,
-        inplace=True
-    )
-    df.replace(
-        "DRB3*",
-        "DRB345*",
-        inplace=True
-    )
-    df.replace(
-        "DRB4*",
-        "DRB345*",
-        inplace=True
-    )
-    df.replace(
-        "DRB5*",
-        "DRB345*",
-        inplace=True
-    )
-    # Replace NaNs with ghost alleles
+    normalised: pd.DataFrame = _normalise_typings(df)
     for column in df.columns:
-        df[column] = df[column].fillna(column[:-3] + "*")
+        df[column] = normalised[column]
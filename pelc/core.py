@@ -0,0 +1,295 @@
+import os
+import threading
+from typing import Iterable
+
+import numpy as np
+
+from pelc._alleles import _normalise_allele
+from pelc._bitsets import (
+    EpletBitsets,
+    _bitsets_to_eplet_names,
+    _eplet_index_source_hashes,
+    _mismatches,
+    _popcount,
+    _read_eplet_bitsets,
+    _shipped_eplet_index_path,
+)
+
+
+class EpletCore:
+    """
+    Eplets of the EpRegistry database as bitsets (the compiled EpletIndex shipped in the data folder), usable on plain
+    strings and numpy arrays without importing pandas.
+
+    The index is loaded on first use, read and looked up by the same EpletBitsets as compute_epletic_load. pandas is
+    only imported if the shipped index is not up to date with the csv files of directory_path, to compile it (cf.
+    pelc.eplet_database.EpletDatabase.eplet_index). An EpletCore can be shared between calls (and threads).
+    """
+
+    def __init__(self, directory_path: str | None = None, cache_directory: str | None = None) -> None:
+        """
+        :param directory_path: path to where the data folder is located. If None, the data shipped with pelc is used.
+        :param cache_directory: where the index is cached on disk if it has to be compiled. If None, $PELC_CACHE_DIR if
+                                set, otherwise the user cache directory of the platform (e.g. ~/.cache/pelc).
+        """
+        if directory_path is None:
+            directory_path = os.path.dirname(os.path.realpath(__file__))
+        self._directory_path: str = directory_path
+        self._cache_directory: str | None = cache_directory
+        self._lock: threading.Lock = threading.Lock()
+        self._eplet_bitsets: EpletBitsets | None = None
+
+    @property
+    def eplet_bitsets(self) -> EpletBitsets:
+        """
+        :return: EpletBitsets of the compiled EpletIndex (memory-mapped from the shipped file if it is up to date)
+        """
+        with self._lock:
+            if self._eplet_bitsets is None:
+                shipped_path: str | None = _shipped_eplet_index_path(
+                    self._directory_path, _eplet_index_source_hashes(self._directory_path)
+                )
+                if shipped_path is not None:
+                    self._eplet_bitsets = _read_eplet_bitsets(shipped_path, EpletBitsets)
+                else:
+                    from pelc.eplet_database import EpletDatabase  # pandas is needed to compile the index
+
+                    self._eplet_bitsets = EpletDatabase(self._directory_path, self._cache_directory).eplet_index()
+            return self._eplet_bitsets
+
+    @property
+    def eplet_names(self) -> np.ndarray:
+        """
+        :return: name of each eplet id (object numpy.ndarray of str, in rank order)
+        """
+        return self.eplet_bitsets.eplet_names
+
+    @property
+    def bitsets(self) -> np.ndarray:
+        """
+        :return: numpy.ndarray of shape (number of alleles, number of words) with the eplets of each allele
+        """
+        return self.eplet_bitsets.bitsets
+
+    def mask(
+            self,
+            class_i: bool = True,
+            class_ii: bool = True,
+            verified_only: bool = False,
+            include_questionable: bool = False,
+            interlocus2: bool = True
+    ) -> np.ndarray:
+        """
+        Cf. EpletBitsets.mask.
+
+        :return: bitset (numpy.ndarray of shape (number of words,)) of the eplets that should be taken into account
+        """
+        return self.eplet_bitsets.mask(class_i, class_ii, verified_only, include_questionable, interlocus2)
+
+    def allele_row(self, allele: str) -> int:
+        """
+        :param allele: allele name (e.g. "A*01:01", null alleles are replaced by the ghost allele of their locus)
+        :return: row of the allele in self.bitsets, -1 if it is not in the EpRegistry database
+        """
+        return int(self.eplet_bitsets.allele_rows([_normalise_allele(allele)])[0])
+
+    def genotype_codes(self, genotypes: Iterable[Iterable[str | None]]) -> np.ndarray:
+        """
+        :param genotypes: alleles of each genotype (e.g. a list of lists, or a 2D object numpy.ndarray). None, "" and
+                          NaN stand for no allele.
+
+        :return: numpy.ndarray (int32) of shape (number of genotypes, maximum number of alleles) with the row of each
+                 allele in self.bitsets, -1 for no allele
+
+        :raises KeyError: if an allele is not in the EpRegistry database
+        """
+        alleles_per_genotype: list[list[str]] = [
+            [allele for allele in genotype if isinstance(allele, str) and allele]  # not None nor NaN
+            for genotype in genotypes
+        ]
+        alleles: list[str] = [allele for genotype_alleles in alleles_per_genotype for allele in genotype_alleles]
+        rows: np.ndarray = self.eplet_bitsets.allele_rows([_normalise_allele(allele) for allele in alleles])
+        if (rows < 0).any():
+            raise KeyError(f"{alleles[int(np.argmax(rows < 0))]} is not in the EpRegistry database.")
+
+        codes: np.ndarray = np.full(
+            (len(alleles_per_genotype), max((len(alleles) for alleles in alleles_per_genotype), default=0)),
+            -1,
+            dtype=np.int32
+        )
+        start: int = 0
+        genotype_number: int
+        genotype_alleles: list[str]
+        for genotype_number, genotype_alleles in enumerate(alleles_per_genotype):
+            codes[genotype_number, :len(genotype_alleles)] = rows[start:start + len(genotype_alleles)]
+            start += len(genotype_alleles)
+
+        return codes
+
+
+def allele_eplets(
+        allele: str,
+        verified_only: bool = False,
+        include_questionable: bool = False,
+        interlocus2: bool = True,
+        core: EpletCore | None = None
+) -> list[str]:
+    """
+    :param allele: allele name (e.g. "DQA1*05:01")
+    :param verified_only: keep only antibody-verified eplets?
+    :param include_questionable: also keep questionable antibody-verified eplets? Ignored if verified_only is False.
+    :param interlocus2: keep interlocus eplets? (only relevant for HLA of class II)
+    :param core: EpletCore to use. If None, the process-wide one of the data shipped with pelc.
+
+    :return: eplets of the allele, sorted by position
+
+    :raises KeyError: if the allele is not in the EpRegistry database
+    """
+    return genotype_mismatches(
+        [allele], [], verified_only=verified_only, include_questionable=include_questionable,
+        interlocus2=interlocus2, core=core
+    )
+
+
+def mismatches(
+        donors: Iterable[Iterable[str | None]],
+        recipients: Iterable[Iterable[str | None]],
+        class_i: bool = True,
+        class_ii: bool = True,
+        verified_only: bool = False,
+        include_questionable: bool = False,
+        interlocus2: bool = True,
+        core: EpletCore | None = None
+) -> np.ndarray:
+    """
+    :param donors: alleles of each donor (None, "" and NaN stand for no allele)
+    :param recipients: alleles of each recipient, row-aligned with donors
+    :param class_i: take class I eplets into account?
+    :param class_ii: take class II eplets into account?
+    :param verified_only: take only antibody-verified eplets into account?
+    :param include_questionable: also take questionable antibody-verified eplets into account? Ignored if
+                                 verified_only is False.
+    :param interlocus2: take interlocus eplets into account? (only relevant for HLA of class II)
+    :param core: EpletCore to use. If None, the process-wide one of the data shipped with pelc.
+
+    :return: numpy.ndarray of shape (number of pairs, number of words) with the bitsets of the eplets that are present
+             on the donor's HLA molecules but not on the recipient's ones (cf. mismatch_counts and
+             mismatch_eplets)
+
+    :raises KeyError: if an allele is not in the EpRegistry database
+    :raises ValueError: if donors and recipients don't have the same number of rows
+    """
+    if core is None:
+        core = default_core()
+    donor_codes: np.ndarray = core.genotype_codes(donors)
+    recipient_codes: np.ndarray = core.genotype_codes(recipients)
+    if len(donor_codes) != len(recipient_codes):
+        raise ValueError(f"{len(donor_codes)} donors but {len(recipient_codes)} recipients.")
+
+    return _mismatches(
+        donor_codes,
+        recipient_codes,
+        core.bitsets,
+        core.mask(class_i, class_ii, verified_only, include_questionable, interlocus2)
+    )
+
+
+def mismatch_counts(
+        donors: Iterable[Iterable[str | None]],
+        recipients: Iterable[Iterable[str | None]],
+        class_i: bool = True,
+        class_ii: bool = True,
+        verified_only: bool = False,
+        include_questionable: bool = False,
+        interlocus2: bool = True,
+        core: EpletCore | None = None
+) -> np.ndarray:
+    """
+    Same parameters as mismatches.
+
+    :return: numpy.ndarray (int64) with the number of mismatching eplets of each (donor, recipient) pair
+    """
+    return _popcount(
+        mismatches(donors, recipients, class_i, class_ii, verified_only, include_questionable, interlocus2, core)
+    )
+
+
+def mismatch_eplets(
+        donors: Iterable[Iterable[str | None]],
+        recipients: Iterable[Iterable[str | None]],
+        class_i: bool = True,
+        class_ii: bool = True,
+        verified_only: bool = False,
+        include_questionable: bool = False,
+        interlocus2: bool = True,
+        core: EpletCore | None = None
+) -> list[list[str]]:
+    """
+    Same parameters as mismatches.
+
+    :return: for each (donor, recipient) pair, the mismatching eplets sorted by position
+    """
+    if core is None:
+        core = default_core()
+    return _bitsets_to_eplet_names(
+        mismatches(donors, recipients, class_i, class_ii, verified_only, include_questionable, interlocus2, core),
+        core.eplet_names
+    )
+
+
+def genotype_mismatches(
+        donor: Iterable[str | None],
+        recipient: Iterable[str | None],
+        class_i: bool = True,
+        class_ii: bool = True,
+        verified_only: bool = False,
+        include_questionable: bool = False,
+        interlocus2: bool = True,
+        core: EpletCore | None = None
+) -> list[str]:
+    """
+    :param donor: alleles of the donor (e.g. ["A*01:01", "A*02:01", "DQB1*03:01"])
+    :param recipient: alleles of the recipient
+
+    Other parameters: cf. mismatches.
+
+    :return: eplets that are present on the donor's HLA molecules but not on the recipient's ones, sorted by position
+    """
+    return mismatch_eplets(
+        [donor], [recipient], class_i, class_ii, verified_only, include_questionable, interlocus2, core
+    )[0]
+
+
+def genotype_mismatch_count(
+        donor: Iterable[str | None],
+        recipient: Iterable[str | None],
+        class_i: bool = True,
+        class_ii: bool = True,
+        verified_only: bool = False,
+        include_questionable: bool = False,
+        interlocus2: bool = True,
+        core: EpletCore | None = None
+) -> int:
+    """
+    Same parameters as genotype_mismatches.
+
+    :return: number of eplets that are present on the donor's HLA molecules but not on the recipient's ones
+    """
+    return int(mismatch_counts(
+        [donor], [recipient], class_i, class_ii, verified_only, include_questionable, interlocus2, core
+    )[0])
+
+
+_default_core: EpletCore | None = None
+_default_core_lock: threading.Lock = threading.Lock()
+
+
+def default_core() -> EpletCore:
+    """
+    :return: the process-wide EpletCore of the data shipped with pelc (created on first call)
+    """
+    global _default_core
+    with _default_core_lock:
+        if _default_core is None:
+            _default_core = EpletCore()
+        return _default_core
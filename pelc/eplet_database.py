@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+
+from pelc._cache import _cached
+from pelc._bitsets import (
+    EPLET_INDEX_FILE_NAME,
+    _INDEX_FORMAT_VERSION,
+    _eplet_index_source_hashes,
+    _eplet_index_source_paths,
+    _shipped_eplet_index_path,
+)
+from pelc._eplet_index import EpletIndex, _build_eplet_index, _read_eplet_index, _write_eplet_index
+from pelc._open_epregistry_databases import (
+    EpletConfirmationIndex,
+    _build_confirmation_index,
+    _open_epregistry_database,
+    _open_ep_data,
+)
+
+
+LOCI_GHOST_ALLELES: dict[str, tuple[str, ...]] = {
+    # name of the EpRegistry csv file (without extension): ghost alleles of the locus
+    "A": ("A*",),
+    "B": ("B*",),
+    "C": ("C*",),
+    "DR": ("DRB1*", "DRB345*"),
+    "DQ": ("DQB1*", "DQA1*"),
+    "DP": ("DPB1*", "DPA1*"),
+}
+
+
+class EpletDatabase:
+    """
+    EpRegistry reference tables (A.csv, B.csv, C.csv, DR.csv, DQ.csv, DP.csv and ep_data.csv), loaded from disk once
+    and then kept in memory.
+
+    The tables are loaded on first use and cached, keyed by (locus, ghost alleles). An EpletDatabase can be
+    shared between calls (and threads): the pandas.DataFrames it returns are shared too and must not be modified.
+    """
+
+    def __init__(self, directory_path: str | None = None, cache_directory: str | None = None) -> None:
+        """
+        :param directory_path: path to where the data folder is located. If None, the data shipped with pelc is used.
+        :param cache_directory: where the parsed tables are cached on disk. If None, $PELC_CACHE_DIR if set, otherwise
+                                the user cache directory of the platform (e.g. ~/.cache/pelc).
+        """
+        if directory_path is None:
+            directory_path = os.path.dirname(os.path.realpath(__file__))
+        self._directory_path: str = directory_path
+        self._cache_directory: str | None = cache_directory
+        self._lock: threading.RLock = threading.RLock()
+        self._locus_tables: dict[tuple[str, tuple[str, ...]], pd.DataFrame] = {}
+        self._ep_data: pd.DataFrame | None = None
+        self._confirmation_index: EpletConfirmationIndex | None = None
+        self._eplet_index: EpletIndex | None = None
+        self._version_hash: str | None = None
+
+    @property
+    def directory_path(self) -> str:
+        """
+        :return: path to where the data folder is located
+        """
+        return self._directory_path
+
+    @property
+    def cache_directory(self) -> str | None:
+        """
+        :return: where the parsed tables are cached on disk (None for the default cache directory)
+        """
+        return self._cache_directory
+
+    def locus_table(self, locus: str) -> pd.DataFrame:
+        """
+        :param locus: "A", "B", "C", "DR", "DQ" or "DP"
+        :return: pandas.DataFrame with the EpRegistry database of the locus and its ghost allele(s)
+        """
+        ghost_alleles: tuple[str, ...] = LOCI_GHOST_ALLELES[locus]
+        key: tuple[str, tuple[str, ...]] = (locus, ghost_alleles)
+        with self._lock:
+            if key not in self._locus_tables:
+                self._locus_tables[key] = _open_epregistry_database(
+                    f"{self._directory_path}/data/{locus}.csv",
+                    list(ghost_alleles),
+                    cache_directory=self._cache_directory
+                )
+            return self._locus_tables[key]
+
+    @property
+    def ep_data(self) -> pd.DataFrame:
+        """
+        :return: pandas.DataFrame with the eplet informations database (cf. _open_ep_data)
+        """
+        with self._lock:
+            if self._ep_data is None:
+                self._ep_data = _open_ep_data(self._directory_path, self._cache_directory)
+            return self._ep_data
+
+    @property
+    def confirmation_index(self) -> EpletConfirmationIndex:
+        """
+        :return: (eplet, locus) -> confirmation lookup of the eplet informations database, the verified masks of the
+                 EpletIndex are compiled from
+        """
+        with self._lock:
+            if self._confirmation_index is None:
+                self._confirmation_index = _build_confirmation_index(self.ep_data)
+            return self._confirmation_index
+
+    def source_paths(self) -> list[str]:
+        """
+        :return: paths to the csv files of the EpRegistry database
+        """
+        return _eplet_index_source_paths(self._directory_path)
+
+    def _source_hashes(self) -> dict[str, str]:
+        """
+        :return: hash of each csv file of the EpRegistry database (file name: hash)
+        """
+        return _eplet_index_source_hashes(self._directory_path)
+
+    def version_hash(self) -> str:
+        """
+        :return: hash identifying the EpletIndex of the database, i.e. the content of its csv files and the format of
+                 the compiled index (cf. pelc.result_cache.PairResultCache)
+        """
+        with self._lock:
+            if self._version_hash is None:
+                self._version_hash = hashlib.sha256(
+                    json.dumps([_INDEX_FORMAT_VERSION, self._source_hashes()], sort_keys=True).encode()
+                ).hexdigest()[:32]
+            return self._version_hash
+
+    def _build_eplet_index(self) -> EpletIndex:
+        """
+        :return: EpletIndex compiled from the csv files (through the parsed tables)
+        """
+        return _build_eplet_index(
+            self.locus_table("A"),
+            self.locus_table("B"),
+            self.locus_table("C"),
+            self.locus_table("DR"),
+            self.locus_table("DQ"),
+            self.locus_table("DP"),
+            self.ep_data,
+            self.confirmation_index
+        )
+
+    def eplet_index(self) -> EpletIndex:
+        """
+        :return: EpletIndex of all the loci (class I / class II eplets are then selected with EpletIndex.mask). It is
+                 memory-mapped from the compiled file shipped in the data folder if it is up to date with the csv
+                 files and with this version of pelc, otherwise from the cache directory (where it is compiled on first
+                 use).
+        """
+        with self._lock:
+            if self._eplet_index is None:
+                source_hashes: dict[str, str] = self._source_hashes()
+                shipped_path: str | None = _shipped_eplet_index_path(self._directory_path, source_hashes)
+                if shipped_path is not None:
+                    self._eplet_index = _read_eplet_index(shipped_path)
+                else:
+                    self._eplet_index = _cached(
+                        "eplet_index",
+                        self.source_paths(),
+                        (_INDEX_FORMAT_VERSION,),
+                        self._build_eplet_index,
+                        self._cache_directory,
+                        write=lambda eplet_index, path: _write_eplet_index(eplet_index, path, source_hashes),
+                        read=_read_eplet_index,
+                        extension=".bin"
+                    )
+            return self._eplet_index
+
+
+def compile_eplet_index(directory_path: str | None = None) -> str:
+    """
+    Compiles the csv files of the EpRegistry database into the binary file shipped in the data folder (to be run after
+    each update of the csv files).
+
+    :param directory_path: path to where the data folder is located. If None, the data shipped with pelc is used.
+    :return: path to the compiled file
+    """
+    database: EpletDatabase = EpletDatabase(directory_path)
+    path: str = f"{database.directory_path}/data/{EPLET_INDEX_FILE_NAME}"
+    _write_eplet_index(database._build_eplet_index(), path, database._source_hashes())  # noqa
+
+    return path
+
+
+_default_database: EpletDatabase | None = None
+_default_database_lock: threading.Lock = threading.Lock()
+
+
+def default_database() -> EpletDatabase:
+    """
+    :return: the process-wide EpletDatabase of the data shipped with pelc (created on first call)
+    """
+    global _default_database
+    with _default_database_lock:
+        if _default_database is None:
+            _default_database = EpletDatabase()
+        return _default_database
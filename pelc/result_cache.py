@@ -0,0 +1,181 @@
+import contextlib
+import os
+import sqlite3
+import threading
+from typing import Callable, Iterator
+
+import numpy as np
+
+from pelc._bitsets import _WORD_DTYPE, _mismatches
+
+
+_RESULT_CACHE_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS pair_mismatches (
+    database TEXT NOT NULL,
+    donor BLOB NOT NULL,
+    recipient BLOB NOT NULL,
+    mismatches BLOB NOT NULL,
+    PRIMARY KEY (database, donor, recipient)
+) WITHOUT ROWID
+"""
+_SQLITE_TIMEOUT: float = 60.
+# seconds a connection waits for the lock of another process (e.g. two nightly jobs sharing the same cache file)
+
+
+def _genotype_keys(codes: np.ndarray) -> list[bytes]:
+    """
+    :param codes: numpy.ndarray (int32) of shape (number of typings, number of alleles) with the allele codes of each
+                  typing (cf. EpletIndex.typing_codes)
+
+    :return: key of each typing: its sorted allele codes as bytes, so that the same genotype gets the same key whatever
+             the column of each allele
+    """
+    sorted_codes: np.ndarray = np.ascontiguousarray(np.sort(codes, axis=1), dtype="<i4")
+    return [row.tobytes() for row in sorted_codes]
+
+
+@contextlib.contextmanager
+def _transaction(connection: sqlite3.Connection, begin: str = "BEGIN") -> Iterator[sqlite3.Connection]:
+    """
+    :param connection: connection in autocommit mode (cf. PairResultCache._connect)
+    :param begin: statement starting the transaction ("BEGIN IMMEDIATE" to take the write lock of the file right away,
+                  waiting for the other processes up to _SQLITE_TIMEOUT)
+
+    :return: the connection, the transaction being committed on exit (or rolled back on an exception)
+    """
+    connection.execute(begin)
+    try:
+        yield connection
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+class PairResultCache:
+    """
+    On-disk (SQLite) cache of the eplet mismatches of donor / recipient pairs, so that repeated runs over slightly
+    different cohorts only compute the new pairs (cf. compute_epletic_load).
+
+    The key of a pair is the version hash of the EpletDatabase (cf. EpletDatabase.version_hash) and the normalised
+    donor and recipient genotypes (allele codes, null alleles being replaced by ghost alleles). All the eplets are
+    cached, class I / class II, antibody-verified and interlocus filters being applied afterwards: one cached pair
+    serves every combination of them. The file can be shared between processes.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: path to the SQLite file (created on first use)
+        """
+        self._path: str = path
+        self._lock: threading.Lock = threading.Lock()
+        self.lookups: int = 0
+        self.hits: int = 0
+
+    @property
+    def path(self) -> str:
+        """
+        :return: path to the SQLite file
+        """
+        return self._path
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        :return: proportion of the pairs looked up so far that were served from the cache (0 if none was looked up)
+        """
+        return self.hits / self.lookups if self.lookups > 0 else 0.
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        :return: connection to the SQLite file (in autocommit mode, cf. _transaction), whose table is created if needed
+        """
+        directory: str = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        connection: sqlite3.Connection = sqlite3.connect(self._path, timeout=_SQLITE_TIMEOUT, isolation_level=None)
+        connection.execute(_RESULT_CACHE_SCHEMA)
+
+        return connection
+
+    def mismatches(
+            self,
+            donor_codes: np.ndarray,
+            recipient_codes: np.ndarray,
+            bitsets: np.ndarray,
+            all_eplets_mask: np.ndarray,
+            database_hash: str,
+            compute: Callable[[np.ndarray, np.ndarray], np.ndarray] | None = None
+    ) -> np.ndarray:
+        """
+        :param donor_codes: numpy.ndarray of shape (number of pairs, number of alleles) with the row of each donor
+                            allele in bitsets
+        :param recipient_codes: same for the recipients, row-aligned with donor_codes
+        :param bitsets: numpy.ndarray of shape (number of alleles, number of words) with the eplets of each allele
+        :param all_eplets_mask: bitset of all the eplets (cf. EpletIndex.mask with its default arguments)
+        :param database_hash: version hash of the EpletDatabase the codes and bitsets come from
+        :param compute: function computing the mismatches of the pairs that are not in the cache from their donor and
+                        recipient codes (e.g. in a pool of processes). If None, they are computed in this process.
+
+        :return: numpy.ndarray of shape (number of pairs, number of words) with all the eplets that are present on the
+                 donor's HLA molecules but not on the recipient's ones. The pairs that are not in the cache are computed
+                 and stored.
+        """
+        n_words: int = bitsets.shape[1]
+        mismatches: np.ndarray = np.zeros((len(donor_codes), n_words), dtype=_WORD_DTYPE)
+        if len(donor_codes) == 0:
+            return mismatches
+
+        donor_keys: list[bytes] = _genotype_keys(donor_codes)
+        recipient_keys: list[bytes] = _genotype_keys(recipient_codes)
+        is_cached: np.ndarray = np.zeros(len(donor_codes), dtype=bool)
+        # the cached pairs are read, the new ones computed and then written in three steps: a shared lock of the file
+        # held by two processes while they compute would keep both of them from writing
+        with self._lock, contextlib.closing(self._connect()) as connection:
+            with _transaction(connection):
+                connection.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS wanted (position INTEGER PRIMARY KEY, donor BLOB, recipient BLOB)"
+                )
+                connection.execute("DELETE FROM wanted")
+                connection.executemany(
+                    "INSERT INTO wanted VALUES (?, ?, ?)", zip(range(len(donor_keys)), donor_keys, recipient_keys)
+                )
+                cached_rows: list[tuple[int, bytes]] = connection.execute(
+                    "SELECT wanted.position, pair_mismatches.mismatches FROM wanted JOIN pair_mismatches "
+                    "ON pair_mismatches.database = ? AND pair_mismatches.donor = wanted.donor "
+                    "AND pair_mismatches.recipient = wanted.recipient",
+                    (database_hash,)
+                ).fetchall()
+            if len(cached_rows) > 0:
+                positions: np.ndarray = np.array([position for position, _ in cached_rows], dtype=np.int64)
+                mismatches[positions] = np.frombuffer(
+                    b"".join(blob for _, blob in cached_rows), dtype=_WORD_DTYPE
+                ).reshape(len(cached_rows), n_words)
+                is_cached[positions] = True
+
+            new_positions: np.ndarray = np.flatnonzero(~is_cached)
+            if len(new_positions) > 0:
+                if compute is None:
+                    mismatches[new_positions] = _mismatches(
+                        donor_codes[new_positions], recipient_codes[new_positions], bitsets, all_eplets_mask
+                    )
+                else:
+                    mismatches[new_positions] = compute(donor_codes[new_positions], recipient_codes[new_positions])
+                # a pair written by another process in the meantime is kept (its mismatches are the same)
+                with _transaction(connection, "BEGIN IMMEDIATE"):
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO pair_mismatches VALUES (?, ?, ?, ?)",
+                        [
+                            (
+                                database_hash,
+                                donor_keys[position],
+                                recipient_keys[position],
+                                mismatches[position].astype(_WORD_DTYPE).tobytes()
+                            )
+                            for position in new_positions.tolist()
+                        ]
+                    )
+
+            self.lookups += len(donor_codes)
+            self.hits += len(cached_rows)
+
+        return mismatches
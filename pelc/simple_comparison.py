@@ -1,7 +1,16 @@
+import csv
+import logging
+from typing import Iterable
+
+import numpy as np
 import pandas as pd
 
+from pelc._alleles import _normalise_allele
+from pelc._bitsets import _DETAILS_CHUNK_SIZE, _cross_mismatch_counts, _popcount
+from pelc._eplet_index import EpletIndex, _bitsets_to_eplet_details, _eplet_load_detail
 from pelc.output_type import OutputType
 from pelc.batch_eplet_comp import compute_epletic_load
+from pelc.eplet_database import LOCI_GHOST_ALLELES, EpletDatabase, default_database
 
 
 def _is_valid_allele(allele: str) -> bool:
@@ -19,18 +28,19 @@ def _same_locus(allele1: str, allele2: str) -> bool:
 
     :return: whether or not the alleles are of the same locus
     """
-    prefix_allele1 = allele1.split("*")[0]
-    prefix_allele2 = allele2.split("*")[0]
-    if prefix_allele1 == prefix_allele2:
-        # A*01:01 and A*68:01 are of the same locus
-        return True
-    else:
-        if "DRB" in prefix_allele1 and "DRB" in prefix_allele2:
-            # DRB1*01:01 and DRB3*01:01 are of the same locus
-            return True
-        else:
-            # A*01:01 and B*07:02 are not of the same locus
-            return False
+    # A*01:01 and A*68:01 are of the same locus, DRB1*01:01 and DRB3*01:01 too, A*01:01 and B*07:02 are not
+    return _comparison_locus(allele1) == _comparison_locus(allele2)
+
+
+def _comparison_locus(allele: str) -> str:
+    """
+    :param allele: allele (e.g. "A*01:01" or "DRB3*01:01")
+    :return: locus of the allele as far as simple_comparison is concerned ("DRB" for DRB1, DRB3, DRB4 and DRB5)
+    """
+    prefix: str = allele.split("*")[0]
+    if "DRB" in prefix:
+        return "DRB"
+    return prefix
 
 
 def simple_comparison(
@@ -39,7 +49,8 @@ def simple_comparison(
         output_path: str | None,
         verified_only: bool = False,
         include_questionable: bool = False,
-        interlocus2: bool = True
+        interlocus2: bool = True,
+        database: EpletDatabase | None = None
 ) -> None | pd.DataFrame:
     """
     :param allele1: First allele to compare
@@ -49,6 +60,7 @@ def simple_comparison(
     :param include_questionable: Should we include questionable antibody-verified eplets in the computation?
     This argument is ignored if verified_only is False.
     :param interlocus2: whether or not to take into account interlocus eplets (only relevant for HLA of class II)
+    :param database: EpletDatabase to use. If None, the process-wide one is used.
 
     :return: None or a pandas.DataFrame with the results according to output_path
     """
@@ -61,34 +73,254 @@ def simple_comparison(
         if not _same_locus(allele1, allele2):
             raise ValueError("The alleles are not of the same locus")
         else:
-            # Create a pandas DataFrame with the two alleles
-            input_df_donor = pd.DataFrame(
-                data={
-                    "Donor": [allele1, allele2]
-                },
-                index=[
-                    f"In {allele1} but not in {allele2}",
-                    f"In {allele2} but not in {allele1}"
-                ]
-            )
-            input_df_recipient = pd.DataFrame(
-                data={
-                    "Recipient": [allele2, allele1]
-                },
-                index=[
-                    f"In {allele1} but not in {allele2}",
-                    f"In {allele2} but not in {allele1}"
-                ]
+            if database is None:
+                database = default_database()
+            eplet_index: EpletIndex = database.eplet_index()
+
+            codes: np.ndarray = eplet_index.allele_rows([_normalise_allele(allele1), _normalise_allele(allele2)])
+            if (codes < 0).any():
+                # alleles that are not in the EpRegistry database are filtered out by the batch pipeline
+                return _simple_comparison_batch_pipeline(
+                    allele1, allele2, output_path, verified_only, include_questionable, interlocus2, database
+                )
+
+            # Eplets of each allele that are not in the other one (looked up directly in the EpletIndex)
+            bitsets: np.ndarray = eplet_index.bitsets[codes]
+            mismatches: np.ndarray = (
+                bitsets
+                & ~bitsets[::-1]
+                & eplet_index.mask(verified_only=verified_only, include_questionable=include_questionable,
+                                   interlocus2=interlocus2)
             )
 
-            # Compute the epletic load
-            return compute_epletic_load(  # type: ignore # we know that the output is a pandas.DataFrame or None
-                input_df_donor,
-                input_df_recipient,
-                output_path,
-                OutputType.DETAILS_AND_COUNT,
-                verified_only=verified_only,
-                include_questionable=include_questionable,
-                interlocus2=interlocus2,
-                simple_comparison=True
+            index: pd.Index = pd.Index([
+                f"In {allele1} but not in {allele2}",
+                f"In {allele2} but not in {allele1}"
+            ])
+            comparison: pd.DataFrame = pd.concat(
+                [
+                    pd.Series(_popcount(mismatches), index=index, name="Eplet Load"),
+                    _eplet_load_detail(mismatches, eplet_index, index)
+                ],
+                axis=1
             )
+
+            if output_path is None:
+                return comparison
+            comparison.to_csv(f"{output_path}.csv", quoting=csv.QUOTE_NONNUMERIC)
+            return None
+
+
+def _simple_comparison_batch_pipeline(
+        allele1: str,
+        allele2: str,
+        output_path: str | None,
+        verified_only: bool,
+        include_questionable: bool,
+        interlocus2: bool,
+        database: EpletDatabase
+) -> None | pd.DataFrame:
+    """
+    simple_comparison through compute_epletic_load (used when one of the alleles is not in the EpRegistry database,
+    so that it is reported and filtered out as in the batch mode)
+
+    :return: cf. simple_comparison (the parameters are the same)
+    """
+    # Create a pandas DataFrame with the two alleles
+    input_df_donor = pd.DataFrame(
+        data={
+            "Donor": [allele1, allele2]
+        },
+        index=[
+            f"In {allele1} but not in {allele2}",
+            f"In {allele2} but not in {allele1}"
+        ]
+    )
+    input_df_recipient = pd.DataFrame(
+        data={
+            "Recipient": [allele2, allele1]
+        },
+        index=[
+            f"In {allele1} but not in {allele2}",
+            f"In {allele2} but not in {allele1}"
+        ]
+    )
+
+    # Compute the epletic load
+    return compute_epletic_load(  # type: ignore # we know that the output is a pandas.DataFrame or None
+        input_df_donor,
+        input_df_recipient,
+        output_path,
+        OutputType.DETAILS_AND_COUNT,
+        verified_only=verified_only,
+        include_questionable=include_questionable,
+        interlocus2=interlocus2,
+        simple_comparison=True,
+        database=database
+    )
+
+
+def batch_simple_comparison(
+        pairs: pd.DataFrame | Iterable[tuple[str, str]],
+        verified_only: bool = False,
+        include_questionable: bool = False,
+        interlocus2: bool = True,
+        details: bool = False,
+        database: EpletDatabase | None = None
+) -> pd.DataFrame:
+    """
+    simple_comparison of many pairs of alleles at once. Each distinct pair is only compared once, by blocks, directly
+    on the bitsets of the EpletIndex.
+
+    :param pairs: pandas.DataFrame whose first two columns are the first and second allele of each pair, or iterable
+                  of (first allele, second allele)
+    :param verified_only: How should the epletic charge be computed? Verified eplets only? Or all eplets?
+    :param include_questionable: Should we include questionable antibody-verified eplets in the computation?
+    This argument is ignored if verified_only is False.
+    :param interlocus2: whether or not to take into account interlocus eplets (only relevant for HLA of class II)
+    :param details: whether or not to also return the mismatching eplets (slower)
+    :param database: EpletDatabase to use. If None, the process-wide one is used.
+
+    :return: pandas.DataFrame (with the index of pairs if it is a pandas.DataFrame) with the number of eplets in the
+             first allele but not in the second one ("Eplet Load 1 not 2") and the other way around ("Eplet Load 2 not
+             1"), and if details is True, the corresponding eplets ("EpMismatches 1 not 2" and "EpMismatches 2 not 1").
+             The pairs with an allele that is not in the EpRegistry database are <NA>.
+
+    :raises ValueError: if some alleles are not valid or some pairs are not of the same locus
+    """
+    if database is None:
+        database = default_database()
+    eplet_index: EpletIndex = database.eplet_index()
+
+    alleles: np.ndarray
+    index: pd.Index
+    if isinstance(pairs, pd.DataFrame):
+        alleles = pairs.iloc[:, :2].to_numpy(dtype=object)
+        index = pairs.index
+    else:
+        alleles = np.array(list(pairs), dtype=object).reshape(-1, 2)
+        index = pd.RangeIndex(len(alleles))
+
+    # The checks are made once per distinct allele
+    allele_codes, unique_alleles = pd.factorize(alleles.ravel())
+    allele_codes = allele_codes.reshape(alleles.shape)
+    unique_allele_list: list[str] = unique_alleles.tolist()
+    is_valid: np.ndarray = np.array([_is_valid_allele(allele) for allele in unique_allele_list], dtype=bool)
+    if (allele_codes < 0).any() or not is_valid.all():
+        raise ValueError(
+            f"The alleles are not valid: {[allele for allele, valid in zip(unique_allele_list, is_valid) if not valid]}"
+        )
+    comparison_loci: np.ndarray = np.array([_comparison_locus(allele) for allele in unique_allele_list], dtype=object)
+    is_same_locus: np.ndarray = comparison_loci[allele_codes[:, 0]] == comparison_loci[allele_codes[:, 1]]
+    if not is_same_locus.all():
+        raise ValueError(
+            f"The alleles are not of the same locus: {alleles[~is_same_locus][:10].tolist()}"
+        )
+
+    bitset_rows: np.ndarray = eplet_index.allele_rows(
+        [_normalise_allele(allele) for allele in unique_allele_list]
+    )[allele_codes]
+    is_known: np.ndarray = np.all(bitset_rows >= 0, axis=1)
+    if not is_known.all():
+        logging.warning(
+            f"{int((~is_known).sum())} pair(s) with alleles that were not found in the EpRegistry database will not be "
+            f"compared."
+        )
+
+    # Each distinct pair of bitsets is compared once, then broadcast back to the pairs
+    n_alleles: int = len(eplet_index.bitsets)
+    pair_codes, distinct_pair_keys = pd.factorize(
+        bitset_rows[is_known, 0].astype(np.int64) * n_alleles + bitset_rows[is_known, 1]
+    )
+    distinct_pairs: np.ndarray = np.stack(np.divmod(distinct_pair_keys, n_alleles), axis=1)
+    mask: np.ndarray = eplet_index.mask(
+        verified_only=verified_only, include_questionable=include_questionable, interlocus2=interlocus2
+    )
+    distinct_loads: np.ndarray = np.zeros((len(distinct_pairs), 2), dtype=np.int64)
+    distinct_details: np.ndarray = np.empty((len(distinct_pairs), 2), dtype=object)
+    start: int
+    for start in range(0, len(distinct_pairs), _DETAILS_CHUNK_SIZE):
+        block: np.ndarray = distinct_pairs[start:start + _DETAILS_CHUNK_SIZE]
+        first_bitsets: np.ndarray = eplet_index.bitsets[block[:, 0]]
+        second_bitsets: np.ndarray = eplet_index.bitsets[block[:, 1]]
+        mismatches: np.ndarray = np.stack(
+            [first_bitsets & ~second_bitsets & mask, second_bitsets & ~first_bitsets & mask], axis=1
+        )
+        distinct_loads[start:start + len(block)] = _popcount(mismatches)
+        if details:
+            distinct_details[start:start + len(block)] = np.array(
+                _bitsets_to_eplet_details(mismatches.reshape(-1, eplet_index.n_words), eplet_index), dtype=object
+            ).reshape(-1, 2)
+
+    loads: np.ndarray = np.zeros((len(alleles), 2), dtype=np.int64)
+    loads[is_known] = distinct_loads[pair_codes]
+    comparison: pd.DataFrame = pd.DataFrame(
+        {
+            "Eplet Load 1 not 2": pd.arrays.IntegerArray(loads[:, 0], ~is_known),
+            "Eplet Load 2 not 1": pd.arrays.IntegerArray(loads[:, 1], ~is_known),
+        },
+        index=index
+    )
+    if details:
+        eplet_details: np.ndarray = np.full((len(alleles), 2), None, dtype=object)
+        eplet_details[is_known] = distinct_details[pair_codes]
+        comparison["EpMismatches 1 not 2"] = eplet_details[:, 0]
+        comparison["EpMismatches 2 not 1"] = eplet_details[:, 1]
+
+    return comparison
+
+
+def allele_distance_matrix(
+        locus: str,
+        output_path: str | None = None,
+        verified_only: bool = False,
+        include_questionable: bool = False,
+        interlocus2: bool = True,
+        database: EpletDatabase | None = None
+) -> pd.DataFrame | np.memmap:
+    """
+    Directional eplet mismatch count between every pair of alleles of an EpRegistry locus table, computed by tiles on
+    the bitsets of the EpletIndex (the equivalent of simple_comparison for all the pairs at once).
+
+    :param locus: EpRegistry locus table ("A", "B", "C", "DR", "DQ" or "DP")
+    :param output_path: Output path without the extension. If None, the matrix is returned as a pandas.DataFrame,
+    otherwise it is written to f"{output_path}.npy" (memory-mapped while it is computed, so that it doesn't have to
+    fit in memory) and the alleles of its rows and columns to f"{output_path}_alleles.csv".
+    :param verified_only: How should the epletic charge be computed? Verified eplets only? Or all eplets?
+    :param include_questionable: Should we include questionable antibody-verified eplets in the computation?
+    This argument is ignored if verified_only is False.
+    :param interlocus2: whether or not to take into account interlocus eplets (only relevant for HLA of class II)
+    :param database: EpletDatabase to use. If None, the process-wide one is used.
+
+    :return: square matrix (int32) whose element [i, j] is the number of eplets of the i-th allele that are not in the
+             j-th allele, the alleles being those of the locus table (ghost alleles excluded) in the order of the
+             table: pandas.DataFrame (index and columns: alleles) if output_path is None, otherwise numpy.memmap of
+             the .npy file
+    """
+    if locus not in LOCI_GHOST_ALLELES:
+        raise ValueError(f"Unknown locus {locus!r}, expected one of {list(LOCI_GHOST_ALLELES)}.")
+    if database is None:
+        database = default_database()
+    eplet_index: EpletIndex = database.eplet_index()
+
+    # the alleles are read from the EpletIndex, the locus table itself isn't loaded
+    start, stop = eplet_index.locus_rows[locus]
+    alleles: pd.Index = pd.Index(eplet_index.locus_allele_names(locus))
+    is_kept: np.ndarray = ~alleles.isin(LOCI_GHOST_ALLELES[locus])
+    alleles = alleles[is_kept]
+    bitsets: np.ndarray = eplet_index.bitsets[start:stop][is_kept]
+    mask: np.ndarray = eplet_index.mask(
+        verified_only=verified_only, include_questionable=include_questionable, interlocus2=interlocus2
+    )
+
+    if output_path is None:
+        return pd.DataFrame(_cross_mismatch_counts(bitsets, bitsets, [mask])[0], index=alleles, columns=alleles)
+
+    distance_matrix: np.memmap = np.lib.format.open_memmap(
+        f"{output_path}.npy", mode="w+", dtype=np.int32, shape=(len(alleles), len(alleles))
+    )
+    _cross_mismatch_counts(bitsets, bitsets, [mask], out=distance_matrix[np.newaxis])
+    distance_matrix.flush()
+    pd.Series(alleles, name="Allele").to_csv(f"{output_path}_alleles.csv", index=False)
+
+    return distance_matrix
@@ -0,0 +1,65 @@
+import os
+import shutil
+import pandas as pd
+
+from pelc._cache import clear_cache
+from pelc._open_epregistry_databases import _open_epregistry_database  # noqa
+
+
+def _copy_dp_csv(directory: str) -> str:
+    """
+    :param directory: where to copy DP.csv
+    :return: path to the copy of DP.csv
+    """
+    this_file_directory_path: str = os.path.dirname(os.path.realpath(__file__))
+    path_to_csv: str = os.path.join(directory, "DP.csv")
+    shutil.copyfile(
+        f"{this_file_directory_path}{os.sep}..{os.sep}pelc{os.sep}data{os.sep}DP.csv",
+        path_to_csv
+    )
+
+    return path_to_csv
+
+
+def test_cache_files(tmp_path: str) -> None:
+    cache_directory: str = os.path.join(tmp_path, "cache")
+    path_to_csv: str = _copy_dp_csv(str(tmp_path))
+
+    df_dp: pd.DataFrame = _open_epregistry_database(path_to_csv, ["DPB1*", "DPA1*"], cache_directory=cache_directory)
+    cache_files: list[str] = os.listdir(cache_directory)
+    assert len(cache_files) == 1
+    assert cache_files[0].startswith("DP_") and cache_files[0].endswith(".pickle")
+    # the cached file is read back
+    assert _open_epregistry_database(
+        path_to_csv, ["DPB1*", "DPA1*"], cache_directory=cache_directory
+    ).equals(df_dp)
+    assert os.listdir(cache_directory) == cache_files
+
+    # a change in the source csv file invalidates the cache
+    with open(path_to_csv, "a") as csv_file:
+        csv_file.write("DPB1*9999:01;11A\n")
+    df_dp_updated: pd.DataFrame = _open_epregistry_database(
+        path_to_csv, ["DPB1*", "DPA1*"], cache_directory=cache_directory
+    )
+    assert "DPB1*9999:01" in df_dp_updated.index
+    assert len(os.listdir(cache_directory)) == 2
+
+    clear_cache(cache_directory)
+    assert os.listdir(cache_directory) == []
+
+
+def test_corrupted_cache_file(tmp_path: str) -> None:
+    cache_directory: str = os.path.join(tmp_path, "cache")
+    path_to_csv: str = _copy_dp_csv(str(tmp_path))
+
+    df_dp: pd.DataFrame = _open_epregistry_database(
+        path_to_csv, ["DPB1*", "DPA1*"], cache_directory=cache_directory
+    )
+    cache_file: str = os.path.join(cache_directory, os.listdir(cache_directory)[0])
+    with open(cache_file, "wb") as file:
+        file.write(b"half-written")
+
+    assert _open_epregistry_database(
+        path_to_csv, ["DPB1*", "DPA1*"], cache_directory=cache_directory
+    ).equals(df_dp)
+    assert os.path.getsize(cache_file) > len(b"half-written")
@@ -0,0 +1,76 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pelc._bitsets import EpletBitsets  # noqa
+from pelc.batch_eplet_comp import compute_epletic_load
+from pelc.core import (  # noqa
+    EpletCore,  # noqa
+    allele_eplets,  # noqa
+    default_core,  # noqa
+    genotype_mismatch_count,  # noqa
+    genotype_mismatches,  # noqa
+    mismatch_counts,  # noqa
+    mismatch_eplets,  # noqa
+)
+from pelc.eplet_database import default_database
+from pelc.output_type import OutputType
+from pelc.simple_comparison import simple_comparison
+from tests.base_loading_for_tests import base_loading
+
+
+def test_core_matches_compute_epletic_load() -> None:
+    donordf, recipientdf, _ = base_loading("pytest.xlsx", "False Pos")
+    donors: np.ndarray = donordf.to_numpy(dtype=object)
+    recipients: np.ndarray = recipientdf.to_numpy(dtype=object)
+
+    expected: pd.DataFrame = compute_epletic_load(  # type: ignore # a DataFrame is returned when output_path is None
+        donordf, recipientdf, None, OutputType.DETAILS_AND_COUNT, verified_only=True
+    )
+
+    assert mismatch_counts(donors, recipients, verified_only=True).tolist() == expected["Eplet Load"].tolist()
+    assert [
+        ", ".join(eplets) if eplets else "None" for eplets in mismatch_eplets(donors, recipients, verified_only=True)
+    ] == expected["EpMismatches"].tolist()
+
+
+def test_core_matches_simple_comparison() -> None:
+    expected: pd.DataFrame = simple_comparison(  # type: ignore # a DataFrame is returned when output_path is None
+        "A*68:01", "A*68:02", None, verified_only=False, interlocus2=True
+    )
+
+    mismatches: list[str] = genotype_mismatches(["A*68:02"], ["A*68:01"])
+    assert ", ".join(mismatches) == expected.loc["In A*68:02 but not in A*68:01", "EpMismatches"]
+    assert genotype_mismatch_count(["A*68:02"], ["A*68:01"]) == len(mismatches)
+    assert set(mismatches) <= set(allele_eplets("A*68:02"))
+    assert allele_eplets("A*01:01N") == allele_eplets("A*") == []
+
+    with pytest.raises(KeyError):
+        allele_eplets("A*99:99")
+    assert default_core().allele_row("A*99:99") == -1
+    assert default_core() is default_core()
+    assert isinstance(EpletCore().mask(class_i=False), np.ndarray)
+
+
+def test_core_reads_the_same_eplet_index() -> None:
+    core: EpletCore = EpletCore()
+
+    # the batch EpletIndex is the same pandas-free EpletBitsets, with the conversion of the typing dataframes on top
+    assert type(core.eplet_bitsets) is EpletBitsets
+    assert isinstance(default_database().eplet_index(), EpletBitsets)
+    alleles: list[str] = ["DQA1*05:01", "A*01:01N", "DRB4*01:01", "B*99:99"]
+    assert [core.allele_row(allele) for allele in alleles] == default_database().eplet_index().typing_codes(
+        pd.DataFrame({"A1_D": alleles})
+    )[:, 0].tolist()
+
+
+def test_core_does_not_import_pandas() -> None:
+    code: str = (
+        "import sys, pelc, pelc.core; "
+        "assert pelc.core.genotype_mismatch_count(['DQA1*05:01', None], ['DQA1*03:02']) > 0; "
+        "assert 'pandas' not in sys.modules, 'pandas was imported'"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
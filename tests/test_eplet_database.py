@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from pelc._bitsets import _read_eplet_index_header  # noqa
+from pelc._open_epregistry_databases import EpletConfirmationIndex  # noqa
+from pelc.eplet_database import EPLET_INDEX_FILE_NAME, EpletDatabase, default_database
+from pelc.simple_comparison import simple_comparison
+
+
+def test_tables_are_loaded_once() -> None:
+    database: EpletDatabase = EpletDatabase()
+
+    df_dq: pd.DataFrame = database.locus_table("DQ")
+    assert database.locus_table("DQ") is df_dq
+    assert "DQA1*" in df_dq.index and "DQB1*" in df_dq.index
+
+    assert database.ep_data is database.ep_data
+    assert database.eplet_index() is database.eplet_index()
+
+
+def test_default_database() -> None:
+    assert default_database() is default_database()
+
+
+def test_explicit_database() -> None:
+    database: EpletDatabase = EpletDatabase()
+
+    output_df = simple_comparison("A*68:01", "A*68:02", None, database=database)
+    assert isinstance(output_df, pd.DataFrame)
+    assert "12M_ABC" in output_df.loc["In A*68:02 but not in A*68:01"]["EpMismatches"]
+
+
+def test_shipped_eplet_index() -> None:
+    database: EpletDatabase = EpletDatabase()
+
+    # the compiled file shipped in the data folder is up to date with the csv files
+    shipped_path: str = f"{database.directory_path}/data/{EPLET_INDEX_FILE_NAME}"
+    assert _read_eplet_index_header(shipped_path)[0]["source_hashes"] == database._source_hashes()  # noqa
+    assert isinstance(database.eplet_index().bitsets, np.memmap)
+
+
+def test_confirmation_index() -> None:
+    database: EpletDatabase = EpletDatabase()
+    confirmation_index: EpletConfirmationIndex = database.confirmation_index
+
+    assert database.confirmation_index is confirmation_index
+    assert confirmation_index.confirmation[("45EV", "DQ")] == "Confirmed"
+    assert ("45EV", "DQ") in confirmation_index.confirmed
+    assert ("75S", "DQ") not in confirmation_index.confirmed
+    assert ("75S", "DQ") in confirmation_index.confirmed_or_questionable
+    assert ("1C", "ABC") not in confirmation_index.confirmed_or_questionable
+    assert confirmation_index.confirmed <= confirmation_index.confirmed_or_questionable
+
+    # the index is kept by the database, not attached to the shared eplet informations dataframe
+    assert "confirmation_index" not in database.ep_data.attrs
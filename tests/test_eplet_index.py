@@ -0,0 +1,212 @@
+import os
+import numpy as np
+import pandas as pd
+
+from pelc._eplet_index import (  # noqa
+    EpletIndex,  # noqa
+    _build_eplet_index,  # noqa
+    _bitsets_to_eplet_details,  # noqa
+    _bitsets_to_eplet_lists,  # noqa
+    _read_eplet_index,  # noqa
+    _write_eplet_index,  # noqa
+)
+from pelc._bitsets import _popcount, _read_eplet_index_header, _repertoires  # noqa
+from pelc._open_epregistry_databases import (  # noqa
+    _build_confirmation_index,  # noqa
+    _open_ep_data,  # noqa
+    _open_epregistry_database,  # noqa
+)
+from pelc.batch_eplet_comp_aux import _extract_key_to_rank_eplets  # noqa
+
+
+def _load_eplet_index() -> tuple[EpletIndex, pd.DataFrame, pd.DataFrame]:
+    """
+    :return: EpletIndex of all the loci, reference dataframe HLA DQ and ep_data
+    """
+    data_path: str = f"{os.path.dirname(os.path.realpath(__file__))}{os.sep}..{os.sep}pelc{os.sep}data"
+    df_dq: pd.DataFrame = _open_epregistry_database(f"{data_path}{os.sep}DQ.csv", ["DQB1*", "DQA1*"])
+    df_data: pd.DataFrame = _open_ep_data(f"{data_path}{os.sep}..")
+    eplet_index: EpletIndex = _build_eplet_index(
+        _open_epregistry_database(f"{data_path}{os.sep}A.csv", ["A*"]),
+        _open_epregistry_database(f"{data_path}{os.sep}B.csv", ["B*"]),
+        _open_epregistry_database(f"{data_path}{os.sep}C.csv", ["C*"]),
+        _open_epregistry_database(f"{data_path}{os.sep}DR.csv", ["DRB1*", "DRB345*"]),
+        df_dq,
+        _open_epregistry_database(f"{data_path}{os.sep}DP.csv", ["DPB1*", "DPA1*"]),
+        df_data,
+        _build_confirmation_index(df_data),
+    )
+
+    return eplet_index, df_dq, df_data
+
+
+def _allele_eplets(eplet_index: EpletIndex, allele: str, mask: np.ndarray) -> list[str]:
+    """
+    :param eplet_index: compiled EpletIndex
+    :param allele: allele name
+    :param mask: bitset of the eplets to keep (cf. EpletIndex.mask)
+
+    :return: eplets of the allele kept by mask
+    """
+    return _bitsets_to_eplet_lists(eplet_index.bitsets[eplet_index.allele_rows([allele])] & mask, eplet_index)[0]
+
+
+def _typing_repertoires(df: pd.DataFrame, eplet_index: EpletIndex) -> np.ndarray:
+    """
+    :param df: typing pandas.DataFrame
+    :param eplet_index: compiled EpletIndex
+
+    :return: bitwise OR of the bitsets of the alleles of each typing (as in compute_epletic_load)
+    """
+    return _repertoires(eplet_index.typing_codes(df), eplet_index.bitsets)
+
+
+def test_bitsets_match_reference_table() -> None:
+    eplet_index, df_dq, _ = _load_eplet_index()
+
+    allele: str
+    for allele in ["DQA1*05:01", "DQB1*03:01", "DQB1*03:02", "DQB1*"]:
+        repertoire: np.ndarray = _typing_repertoires(pd.DataFrame({"DQ1_D": [allele]}), eplet_index)
+        expected: list[str] = [
+            eplet if eplet[0] in ["R", "Q", "P"] else f"{eplet}_DQ"
+            for eplet in df_dq.to_numpy(dtype=object)[df_dq.index.get_loc(allele)].tolist() if isinstance(eplet, str)
+        ]
+
+        assert sorted(_bitsets_to_eplet_lists(repertoire, eplet_index)[0]) == sorted(expected)
+        assert _popcount(repertoire)[0] == len(expected)
+
+
+def test_allele_eplets() -> None:
+    eplet_index, _, _ = _load_eplet_index()
+
+    expected: list[str] = [
+        "2D_DQ", "25YT_DQ", "40GR_DQ", "61FT_DQ", "66IL_DQ", "75S_DQ", "76L_DQ", "129H_DQ", "160A_DQ"
+    ]
+    assert _allele_eplets(eplet_index, "DQA1*05:01", eplet_index.mask(interlocus2=False)) == expected
+    assert _allele_eplets(eplet_index, "DQA1*05:05", eplet_index.mask(interlocus2=False)) == expected
+
+    dqb1_02_01: list[str] = _allele_eplets(eplet_index, "DQB1*02:01", eplet_index.mask(interlocus2=False))
+    assert "2D_DQ" not in dqb1_02_01
+    assert "3S_DQ" in dqb1_02_01
+
+    c_18_24: list[str] = _allele_eplets(eplet_index, "C*18:24", eplet_index.mask(interlocus2=False))
+    assert "1C_ABC" in c_18_24
+    assert "9F_ABC" not in c_18_24
+
+    dqa1_03_02_all: list[str] = _allele_eplets(eplet_index, "DQA1*03:02", eplet_index.mask())
+    dqa1_03_02_questionable: list[str] = _allele_eplets(
+        eplet_index, "DQA1*03:02", eplet_index.mask(verified_only=True, include_questionable=True)
+    )
+    dqa1_03_02_verified: list[str] = _allele_eplets(eplet_index, "DQA1*03:02", eplet_index.mask(verified_only=True))
+    assert "160D_DQ" in dqa1_03_02_all
+    assert "160D_DQ" not in dqa1_03_02_verified
+    assert len(dqa1_03_02_all) >= len(dqa1_03_02_questionable) >= len(dqa1_03_02_verified)
+
+
+def test_mask() -> None:
+    eplet_index, _, df_data = _load_eplet_index()
+
+    repertoire: np.ndarray = _typing_repertoires(pd.DataFrame({"DQA11_D": ["DQA1*03:02"]}), eplet_index)
+
+    all_eplets: list[str] = _bitsets_to_eplet_lists(repertoire & eplet_index.mask(), eplet_index)[0]
+    assert "160D_DQ" in all_eplets
+
+    verified_only: list[str] = _bitsets_to_eplet_lists(
+        repertoire & eplet_index.mask(verified_only=True), eplet_index
+    )[0]
+    assert "160D_DQ" not in verified_only
+    confirmed: set[str] = {
+        eplet if locus == "i2" else f"{eplet}_{locus}"
+        for eplet, locus, confirmation in zip(df_data["eplet"], df_data["locus"], df_data["confirmation"])
+        if confirmation == "Confirmed"
+    }
+    assert verified_only == [eplet for eplet in all_eplets if eplet in confirmed]
+
+    assert _popcount(repertoire & eplet_index.mask(class_ii=False))[0] == 0
+    assert not any(
+        eplet[0] in ["R", "Q", "P"]
+        for eplet in _bitsets_to_eplet_lists(repertoire & eplet_index.mask(interlocus2=False), eplet_index)[0]
+    )
+
+
+def test_write_read_eplet_index(tmp_path: str) -> None:
+    eplet_index, _, _ = _load_eplet_index()
+    path: str = os.path.join(tmp_path, "eplet_index.bin")
+    _write_eplet_index(eplet_index, path, {"A.csv": "hash"})
+
+    header, _ = _read_eplet_index_header(path)
+    assert header["source_hashes"] == {"A.csv": "hash"}
+
+    read_eplet_index: EpletIndex = _read_eplet_index(path)
+    assert isinstance(read_eplet_index.bitsets, np.memmap)
+    assert np.array_equal(read_eplet_index.bitsets, eplet_index.bitsets)
+    assert np.array_equal(read_eplet_index.encoded_allele_names, eplet_index.encoded_allele_names)
+    assert read_eplet_index.eplet_names.tolist() == eplet_index.eplet_names.tolist()
+    assert read_eplet_index.eplet_loci.tolist() == eplet_index.eplet_loci.tolist()
+    assert read_eplet_index.locus_rows == eplet_index.locus_rows
+    assert np.array_equal(
+        read_eplet_index.mask(verified_only=True, include_questionable=True),
+        eplet_index.mask(verified_only=True, include_questionable=True)
+    )
+
+
+def test_eplet_ids_in_rank_order() -> None:
+    eplet_index, _, _ = _load_eplet_index()
+
+    rank_keys: list[int] = [_extract_key_to_rank_eplets(eplet_name) for eplet_name in eplet_index.eplet_names]
+    assert rank_keys == sorted(rank_keys)
+
+    repertoire: np.ndarray = _typing_repertoires(
+        pd.DataFrame({"DQA11_D": ["DQA1*05:01"], "DQB11_D": ["DQB1*03:01"]}), eplet_index
+    )
+    details: list[str] = _bitsets_to_eplet_details(np.concatenate([repertoire, repertoire & 0]), eplet_index)
+    assert details[0] == ", ".join(_bitsets_to_eplet_lists(repertoire, eplet_index)[0])
+    assert details[1] == "None"
+
+
+def test_typing_codes() -> None:
+    eplet_index, _, _ = _load_eplet_index()
+
+    df: pd.DataFrame = pd.DataFrame({
+        "A1_D": ["A*01:01", "A*01:04N", None],
+        "DRB31_D": ["DRB4*", "DRB3*01:01", "not an allele"],
+    })
+    codes: np.ndarray = eplet_index.typing_codes(df)
+
+    assert codes.dtype == np.int32
+    assert eplet_index.allele_names(codes[:, 0]) == ["A*01:01", "A*", "A*"]
+    assert eplet_index.allele_names(codes[:2, 1]) == ["DRB345*", "DRB3*01:01"]
+    assert codes[2, 1] == -1
+
+
+def test_only_the_loci_in_the_typings_are_looked_up() -> None:
+    eplet_index, _, _ = _load_eplet_index()
+
+    codes: np.ndarray = eplet_index.typing_codes(
+        pd.DataFrame({"DQA11_D": ["DQA1*05:01", None], "DQB11_D": ["DQB1*03:01", "DQB1*99:99"]})
+    )
+
+    assert set(eplet_index._locus_allele_rows) == {"DQ"}  # noqa
+    start, stop = eplet_index.locus_rows["DQ"]
+    assert ((codes[0] >= start) & (codes[0] < stop)).all()
+    assert eplet_index.allele_names(codes[1, :1]) == ["DQA1*"]
+    assert codes[1, 1] == -1
+
+
+def test_names_are_decoded_on_first_use(tmp_path: str) -> None:
+    path: str = os.path.join(tmp_path, "eplet_index.bin")
+    _write_eplet_index(_load_eplet_index()[0], path, {})
+    eplet_index: EpletIndex = _read_eplet_index(path)
+
+    codes: np.ndarray = eplet_index.typing_codes(pd.DataFrame({"DQA11_D": ["DQA1*05:01"], "DQB11_D": ["DQB1*03:01"]}))
+    repertoire: np.ndarray = _typing_repertoires(pd.DataFrame({"DQA11_D": ["DQA1*05:01"]}), eplet_index)
+    assert _popcount(repertoire & eplet_index.mask(verified_only=True))[0] > 0
+
+    # counting eplets only decodes the names of the DQ alleles, not the ones of the other loci nor the eplet names
+    assert isinstance(eplet_index.encoded_allele_names, np.memmap)
+    assert set(eplet_index._locus_allele_rows) == {"DQ"}  # noqa
+    assert "eplet_names" not in vars(eplet_index)
+    assert (codes >= 0).all()
+
+    assert "2D_DQ" in _bitsets_to_eplet_lists(repertoire, eplet_index)[0]
+    assert "eplet_names" in vars(eplet_index)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from pelc.batch_eplet_comp import compute_epletic_load, compute_epletic_load_matrix
+from pelc.output_type import OutputType
+from tests.base_loading_for_tests import base_loading
+
+
+def test_eplet_load_matrix() -> None:
+    donordf, recipientdf, _ = base_loading("pytest_standard_input.xlsx", "My Sheet")
+    donordf, recipientdf = donordf.iloc[:10], recipientdf.iloc[:12]
+    recipientdf.columns = donordf.columns  # column names don't matter, only the alleles
+
+    load_matrix = compute_epletic_load_matrix(donordf, recipientdf, verified_only=True)
+    assert isinstance(load_matrix, pd.DataFrame)
+    assert load_matrix.shape == (10, 12)
+    assert load_matrix.index.equals(donordf.index) and load_matrix.columns.equals(recipientdf.index)
+
+    # every donor / recipient pair, computed row by row
+    pairs_donor: pd.DataFrame = donordf.loc[donordf.index.repeat(len(recipientdf))].reset_index(drop=True)
+    pairs_recipient: pd.DataFrame = pd.concat([recipientdf] * len(donordf)).reset_index(drop=True)
+    expected_loads = compute_epletic_load(
+        pairs_donor, pairs_recipient, None, OutputType.COUNT, verified_only=True, simple_comparison=True
+    )
+    assert isinstance(expected_loads, pd.Series)
+    assert np.array_equal(load_matrix.to_numpy().ravel(), expected_loads.to_numpy())
+
+
+def test_eplet_load_matrix_per_locus() -> None:
+    donordf, recipientdf, _ = base_loading("pytest_standard_input.xlsx", "My Sheet")
+
+    load_matrices = compute_epletic_load_matrix(donordf, recipientdf, per_locus=True)
+    assert isinstance(load_matrices, dict)
+    assert list(load_matrices) == ["Total", "ABC", "DR", "DQ", "DP", "i2"]
+    assert load_matrices["Total"].equals(
+        load_matrices["ABC"] + load_matrices["DR"] + load_matrices["DQ"] + load_matrices["DP"] + load_matrices["i2"]
+    )
+    assert (load_matrices["DP"] == 0).all().all()  # DPA1* and DPB1* only
+
+    class_i_only = compute_epletic_load_matrix(donordf, recipientdf, class_ii=False)
+    assert isinstance(class_i_only, pd.DataFrame)
+    assert class_i_only.equals(load_matrices["ABC"])
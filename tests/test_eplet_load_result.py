@@ -0,0 +1,124 @@
+import os
+import pandas as pd
+
+from pelc.batch_eplet_comp import (
+    STANDARD_EPLET_FILTERS,
+    EpletFilter,
+    EpletLoadResult,
+    compute_epletic_load,
+    compute_epletic_load_configurations,
+    compute_epletic_load_result,
+)
+from pelc.output_type import OutputType
+from tests.base_loading_for_tests import base_loading
+
+
+def test_eplet_load_result_outputs(tmp_path: str) -> None:
+    donordf, recipientdf, _ = base_loading("pytest.xlsx", "False Pos")
+    donordf.iloc[0, 0] = "A*99:99"
+
+    result: EpletLoadResult = compute_epletic_load_result(donordf, recipientdf, verified_only=True)
+
+    output_type: OutputType
+    for output_type in [OutputType.COUNT, OutputType.ONLY_DETAILS, OutputType.DETAILS_AND_COUNT]:
+        expected = compute_epletic_load(donordf, recipientdf, None, output_type, verified_only=True)
+        assert isinstance(expected, (pd.DataFrame, pd.Series))
+        assert result.output(output_type).equals(expected)  # type: ignore # not a tuple for these output types
+
+    removed_typings = compute_epletic_load(
+        donordf, recipientdf, None, OutputType.FILTERED_OUT_TYPINGS, verified_only=True
+    )
+    assert isinstance(removed_typings, tuple)
+    assert result.removed_donors.equals(removed_typings[0]) and result.removed_recipients.equals(removed_typings[1])
+    assert len(result.removed_donors) == 1
+
+    assert result.per_locus_counts.sum(axis=1).equals(result.counts.rename(None))
+
+    output_path: str = os.path.join(tmp_path, "output")
+    paths: list[str] = result.write(output_path, [OutputType.COUNT, OutputType.FILTERED_OUT_TYPINGS])
+    assert paths == [
+        f"{output_path}_count.csv", f"{output_path}_removed_donors.csv", f"{output_path}_removed_recipients.csv"
+    ]
+    assert pd.read_csv(paths[0], index_col=0)["Eplet Load"].tolist() == result.counts.tolist()
+
+
+def test_eplet_filter_configurations() -> None:
+    donordf, recipientdf, _ = base_loading("pytest_questionable.xlsx", "Sheet 1")
+
+    wide_result = compute_epletic_load_configurations(donordf, recipientdf, None, OutputType.DETAILS_AND_COUNT)
+    assert isinstance(wide_result, pd.DataFrame)
+    assert len(wide_result.columns) == 2 * len(STANDARD_EPLET_FILTERS)
+
+    name: str
+    eplet_filter: EpletFilter
+    for name, eplet_filter in STANDARD_EPLET_FILTERS.items():
+        expected = compute_epletic_load(
+            donordf,
+            recipientdf,
+            None,
+            OutputType.DETAILS_AND_COUNT,
+            verified_only=eplet_filter.verified_only,
+            include_questionable=eplet_filter.include_questionable,
+            interlocus2=eplet_filter.interlocus2
+        )
+        assert isinstance(expected, pd.DataFrame)
+        assert wide_result[f"Eplet Load {name}"].tolist() == expected["Eplet Load"].tolist()
+        assert wide_result[f"EpMismatches {name}"].tolist() == expected["EpMismatches"].tolist()
+
+
+def test_per_locus_breakdown() -> None:
+    donordf, recipientdf, _ = base_loading("pytest_standard_input.xlsx", "My Sheet")
+
+    breakdown = compute_epletic_load(donordf, recipientdf, None, OutputType.DETAILS_AND_COUNT, per_locus=True)
+    assert isinstance(breakdown, pd.DataFrame)
+    assert breakdown.columns.tolist() == ["Eplet Load", "EpMismatches"] + [
+        f"{column} {locus}" for locus in ["ABC", "DR", "DQ", "DP", "i2"] for column in ["Eplet Load", "EpMismatches"]
+    ]
+
+    total = compute_epletic_load(donordf, recipientdf, None, OutputType.DETAILS_AND_COUNT)
+    assert isinstance(total, pd.DataFrame)
+    assert breakdown[["Eplet Load", "EpMismatches"]].equals(total)
+
+    per_locus_loads: pd.DataFrame = breakdown[[f"Eplet Load {locus}" for locus in ["ABC", "DR", "DQ", "DP", "i2"]]]
+    assert per_locus_loads.sum(axis=1).tolist() == total["Eplet Load"].tolist()
+    loci_details: list[list[str]] = [
+        breakdown[f"EpMismatches {locus}"].tolist() for locus in ["ABC", "DR", "DQ", "DP", "i2"]
+    ]
+    row: int
+    total_details: str
+    for row, total_details in enumerate(total["EpMismatches"].tolist()):
+        per_locus_eplets: list[str] = [
+            eplet for details in loci_details if details[row] != "None" for eplet in details[row].split(", ")
+        ]
+        assert sorted(per_locus_eplets) == sorted([] if total_details == "None" else total_details.split(", "))
+
+
+def test_both_directions() -> None:
+    donordf, recipientdf, _ = base_loading("pytest_standard_input.xlsx", "My Sheet")
+
+    both = compute_epletic_load(donordf, recipientdf, None, OutputType.DETAILS_AND_COUNT, direction="both")
+    assert isinstance(both, pd.DataFrame)
+    assert both.columns.tolist() == [
+        f"{column} {direction}" for direction in ["HvG", "GvH", "Union"] for column in ["Eplet Load", "EpMismatches"]
+    ]
+
+    host_versus_graft = compute_epletic_load(donordf, recipientdf, None, OutputType.DETAILS_AND_COUNT)
+    assert isinstance(host_versus_graft, pd.DataFrame)
+    assert both[["Eplet Load HvG", "EpMismatches HvG"]].set_axis(host_versus_graft.columns, axis=1).equals(
+        host_versus_graft
+    )
+
+    graft_versus_host = compute_epletic_load(
+        recipientdf.set_axis(donordf.columns, axis=1),
+        donordf.set_axis(recipientdf.columns, axis=1),
+        None,
+        OutputType.DETAILS_AND_COUNT
+    )
+    assert isinstance(graft_versus_host, pd.DataFrame)
+    assert both["Eplet Load GvH"].tolist() == graft_versus_host["Eplet Load"].tolist()
+    assert both["EpMismatches GvH"].tolist() == graft_versus_host["EpMismatches"].tolist()
+    graft_versus_host_loads = compute_epletic_load(donordf, recipientdf, None, OutputType.COUNT, direction="GvH")
+    assert isinstance(graft_versus_host_loads, pd.Series)
+    assert both["Eplet Load GvH"].tolist() == graft_versus_host_loads.tolist()
+
+    assert (both["Eplet Load Union"] == both["Eplet Load HvG"] + both["Eplet Load GvH"]).all()
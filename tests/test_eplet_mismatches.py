@@ -461,3 +461,28 @@ def test_abv_questionable() -> None:
         # The only Antibody-Verified mismatches between a DQA1*05:01 donor and a DQA1*04:01 recipient are questionable
 
         os.remove(f"{output_path}.csv")
+
+
+def test_repeated_pairs() -> None:
+    donordf, recipientdf, _ = base_loading("pytest_standard_input.xlsx", "My Sheet")
+    donordf, recipientdf = donordf.iloc[:20], recipientdf.iloc[:20]
+
+    # one donor offered to every recipient, each pair being repeated with another index
+    repeated_donors: pd.DataFrame = pd.concat([donordf.iloc[[0] * 20], donordf.iloc[[0] * 20]])
+    repeated_recipients: pd.DataFrame = pd.concat([recipientdf, recipientdf])
+    repeated_donors.index = repeated_recipients.index = pd.RangeIndex(100, 140, name="Index")
+
+    result = compute_epletic_load(
+        repeated_donors, repeated_recipients, None, OutputType.DETAILS_AND_COUNT, simple_comparison=True
+    )
+    expected = compute_epletic_load(
+        donordf.iloc[[0] * 20].set_axis(recipientdf.index),
+        recipientdf,
+        None,
+        OutputType.DETAILS_AND_COUNT,
+        simple_comparison=True
+    )
+    assert isinstance(result, pd.DataFrame) and isinstance(expected, pd.DataFrame)
+    assert result.index.equals(repeated_donors.index)
+    assert result.iloc[:20].to_numpy().tolist() == result.iloc[20:].to_numpy().tolist()
+    assert result.iloc[:20].to_numpy().tolist() == expected.to_numpy().tolist()
@@ -2,7 +2,7 @@ import os
 import pandas as pd
 
 from pelc.simple_comparison import simple_comparison
-from pelc.batch_eplet_comp_aux import _replace_null_alleles  # noqa
+from pelc.batch_eplet_comp_aux import _normalise_typings, _replace_null_alleles  # noqa
 
 
 def test_replace_null_alleles() -> None:
@@ -26,6 +26,24 @@ def test_replace_null_alleles() -> None:
     assert input_df_recipient.equals(expected_df_recipient)
 
 
+def test_normalise_typings() -> None:
+    data: dict[str, list[str | None]] = {
+        'A1_R': ['A*01:04N', 'A*02:01', None],
+        'DRB31_R': ['DRB3*', 'DRB4*01:03N', None],
+    }
+    input_df_recipient: pd.DataFrame = pd.DataFrame(data, index=['R1', 'R2', 'R3'])
+    copy_df_recipient: pd.DataFrame = input_df_recipient.copy()
+
+    normalised_df_recipient: pd.DataFrame = _normalise_typings(input_df_recipient)
+
+    expected_data: dict[str, list[str]] = {
+        'A1_R': ['A*', 'A*02:01', 'A*'],
+        'DRB31_R': ['DRB345*', 'DRB345*', 'DRB3*'],
+    }
+    assert normalised_df_recipient.equals(pd.DataFrame(expected_data, index=['R1', 'R2', 'R3']))
+    assert input_df_recipient.equals(copy_df_recipient)
+
+
 def test_null_allele() -> None:
     simple_comparison(
         "A*01:01",
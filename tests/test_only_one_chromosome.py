@@ -2,6 +2,7 @@ import os
 import pandas as pd
 import pytest
 
+from pelc._input_sanity_check import _unknown_alleles_reasons  # noqa
 from pelc.batch_eplet_comp import compute_epletic_load
 from pelc.output_type import OutputType
 from tests.base_loading_for_tests import base_loading
@@ -66,3 +67,27 @@ def test_one_chromosome() -> None:
                 True,  # class_ii
                 False,  # abv_only
             )
+
+
+def test_quarantine() -> None:
+    donordf, recipientdf, _ = base_loading("pytest_only_one_chromosome_not_ok_2.xlsx", "Sheet 1")
+
+    reasons: pd.Series = _unknown_alleles_reasons(donordf, recipientdf)
+    assert reasons.loc[9] == "C (recipient)"
+    assert (reasons.drop(9) == "").all()
+
+    # the pair is left out and reported instead of raising a ValueError
+    output_df = compute_epletic_load(
+        donordf.copy(), recipientdf.copy(), None, OutputType.DETAILS_AND_COUNT, quarantine=True
+    )
+    assert isinstance(output_df, pd.DataFrame)
+    assert 9 not in output_df.index
+    assert len(output_df) == len(donordf) - 1
+
+    filtered_out = compute_epletic_load(
+        donordf.copy(), recipientdf.copy(), None, OutputType.FILTERED_OUT_TYPINGS, quarantine=True
+    )
+    assert isinstance(filtered_out, tuple)
+    removed_donors, removed_recipients = filtered_out
+    assert removed_donors.loc[9, "Reason"] == "unknown alleles: C (recipient)"
+    assert removed_recipients.loc[9, "Reason"] == "unknown alleles: C (recipient)"
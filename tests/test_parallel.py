@@ -0,0 +1,59 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+from pelc import batch_eplet_comp
+from pelc.batch_eplet_comp import compute_epletic_load
+from pelc.eplet_database import EpletDatabase
+from pelc.output_type import OutputType
+from tests.base_loading_for_tests import base_loading
+
+
+def test_n_jobs() -> None:
+    donordf, recipientdf, _ = base_loading("pytest_standard_input.xlsx", "My Sheet")
+
+    expected = compute_epletic_load(donordf.copy(), recipientdf.copy(), None, OutputType.DETAILS_AND_COUNT)
+    parallel = compute_epletic_load(donordf.copy(), recipientdf.copy(), None, OutputType.DETAILS_AND_COUNT, n_jobs=3)
+    assert isinstance(expected, pd.DataFrame)
+    assert isinstance(parallel, pd.DataFrame)
+    assert parallel.equals(expected)
+
+    # explicit database (opened again by each worker) and a Series output
+    parallel_count = compute_epletic_load(
+        donordf.copy(), recipientdf.copy(), None, OutputType.COUNT, verified_only=True, database=EpletDatabase(),
+        n_jobs=2
+    )
+    expected_count = compute_epletic_load(
+        donordf.copy(), recipientdf.copy(), None, OutputType.COUNT, verified_only=True
+    )
+    assert isinstance(parallel_count, pd.Series)
+    assert isinstance(expected_count, pd.Series)
+    assert parallel_count.equals(expected_count)
+
+
+def test_n_jobs_computes_the_mismatches_in_the_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    donordf, recipientdf, _ = base_loading("pytest_standard_input.xlsx", "My Sheet")
+    expected = compute_epletic_load(donordf.copy(), recipientdf.copy(), None, OutputType.COUNT, direction="both")
+
+    pools: list[ProcessPoolExecutor] = []
+
+    class RecordingPool(ProcessPoolExecutor):
+        def __init__(self, max_workers: int) -> None:
+            super().__init__(max_workers)
+            pools.append(self)
+
+    def no_in_process_repertoires(self: object) -> None:
+        raise AssertionError("the mismatches were computed in the calling process")
+
+    monkeypatch.setattr(batch_eplet_comp, "ProcessPoolExecutor", RecordingPool)
+    monkeypatch.setattr(batch_eplet_comp._PairMismatches, "distinct_repertoires", property(no_in_process_repertoires))
+
+    parallel = compute_epletic_load(
+        donordf.copy(), recipientdf.copy(), None, OutputType.COUNT, n_jobs=2, direction="both"
+    )
+    assert isinstance(parallel, pd.DataFrame)
+    assert isinstance(expected, pd.DataFrame)
+    assert parallel.equals(expected)
+    # one pool per direction, the union being derived from both
+    assert len(pools) == 2
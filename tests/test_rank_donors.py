@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from pelc.batch_eplet_comp import compute_epletic_load, rank_donors
+from pelc.output_type import OutputType
+from tests.base_loading_for_tests import base_loading
+
+
+def test_rank_donors() -> None:
+    donordf, recipientdf, _ = base_loading("pytest_standard_input.xlsx", "My Sheet")
+    recipient: pd.Series = recipientdf.iloc[0]
+
+    ranking: pd.DataFrame = rank_donors(recipient, donordf, 5, verified_only=True)
+    assert len(ranking) == 5
+    assert ranking["Eplet Load"].is_monotonic_increasing
+
+    # same loads as compute_epletic_load with the recipient replicated for each donor
+    replicated_recipientdf: pd.DataFrame = pd.DataFrame(
+        [recipient.tolist()] * len(donordf), index=donordf.index, columns=recipientdf.columns
+    )
+    eplet_loads = compute_epletic_load(
+        donordf.copy(), replicated_recipientdf, None, OutputType.COUNT, verified_only=True, simple_comparison=True
+    )
+    assert isinstance(eplet_loads, pd.Series)
+    expected: pd.Series = eplet_loads.sort_values(kind="stable").iloc[:5]
+    assert ranking.index.equals(expected.index)
+    assert np.array_equal(ranking["Eplet Load"].to_numpy(), expected.to_numpy())
+
+    # per locus breakdown
+    assert ranking["Eplet Load"].equals(
+        ranking["Eplet Load ABC"] + ranking["Eplet Load DR"] + ranking["Eplet Load DQ"] + ranking["Eplet Load DP"]
+        + ranking["Eplet Load i2"]
+    )
+
+    # all the donors when k is greater than their number
+    assert len(rank_donors(recipient, donordf, 1000)) == len(donordf)
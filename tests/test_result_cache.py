@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from pelc._bitsets import _mismatches
+from pelc.batch_eplet_comp import compute_epletic_load
+from pelc.output_type import OutputType
+from pelc.result_cache import PairResultCache
+from tests.base_loading_for_tests import base_loading
+
+
+def test_result_cache(tmp_path: str) -> None:
+    donordf, recipientdf, _ = base_loading("pytest.xlsx", "False Pos")
+    result_cache: PairResultCache = PairResultCache(os.path.join(tmp_path, "results.sqlite"))
+
+    expected: pd.DataFrame = compute_epletic_load(  # type: ignore # a DataFrame is returned when output_path is None
+        donordf, recipientdf, None, OutputType.DETAILS_AND_COUNT, verified_only=True
+    )
+    first_run: pd.DataFrame = compute_epletic_load(  # type: ignore
+        donordf, recipientdf, None, OutputType.DETAILS_AND_COUNT, verified_only=True, result_cache=result_cache
+    )
+    pd.testing.assert_frame_equal(first_run, expected)
+    # the distinct genotype pairs are looked up once
+    n_pairs: int = result_cache.lookups
+    assert result_cache.hits == 0 and 0 < n_pairs <= len(expected)
+
+    # the second run (with other filters) is served from the cache
+    cached_run: pd.Series = compute_epletic_load(  # type: ignore # a Series is returned for OutputType.COUNT
+        donordf.iloc[:10], recipientdf.iloc[:10], None, OutputType.COUNT, class_ii=False, result_cache=result_cache
+    )
+    pd.testing.assert_series_equal(cached_run, compute_epletic_load(  # type: ignore
+        donordf.iloc[:10], recipientdf.iloc[:10], None, OutputType.COUNT, class_ii=False
+    ))
+    assert result_cache.hits == result_cache.lookups - n_pairs > 0
+
+    swapped_run: pd.Series = compute_epletic_load(  # type: ignore
+        recipientdf.iloc[:10].set_axis(donordf.columns, axis=1),
+        donordf.iloc[:10].set_axis(recipientdf.columns, axis=1),
+        None,
+        OutputType.COUNT,
+        result_cache=PairResultCache(result_cache.path)
+    )
+    pd.testing.assert_series_equal(swapped_run, compute_epletic_load(  # type: ignore
+        recipientdf.iloc[:10].set_axis(donordf.columns, axis=1),
+        donordf.iloc[:10].set_axis(recipientdf.columns, axis=1),
+        None,
+        OutputType.COUNT
+    ))
+
+
+
+def test_result_cache_graft_versus_host(tmp_path: str) -> None:
+    donordf, recipientdf, _ = base_loading("pytest.xlsx", "False Pos")
+    result_cache: PairResultCache = PairResultCache(os.path.join(tmp_path, "results.sqlite"))
+
+    expected: pd.DataFrame = compute_epletic_load(  # type: ignore # a DataFrame is returned when output_path is None
+        donordf, recipientdf, None, OutputType.COUNT, direction="both"
+    )
+    first_run: pd.DataFrame = compute_epletic_load(  # type: ignore
+        donordf, recipientdf, None, OutputType.COUNT, direction="both", result_cache=result_cache
+    )
+    pd.testing.assert_frame_equal(first_run, expected)
+    # the distinct pairs are looked up once in each direction
+    n_pairs: int = result_cache.lookups // 2
+    hits: int = result_cache.hits
+
+    gvh_run: pd.Series = compute_epletic_load(  # type: ignore # a Series is returned for OutputType.COUNT
+        donordf, recipientdf, None, OutputType.COUNT, direction="GvH", result_cache=result_cache
+    )
+    pd.testing.assert_series_equal(gvh_run, compute_epletic_load(  # type: ignore
+        donordf, recipientdf, None, OutputType.COUNT, direction="GvH"
+    ))
+    # the graft versus host mismatches are served from the cache
+    assert result_cache.lookups == 3 * n_pairs and result_cache.hits == hits + n_pairs
+
+
+def _slow_mismatches(
+        donor_codes: np.ndarray, recipient_codes: np.ndarray, bitsets: np.ndarray, mask: np.ndarray
+) -> np.ndarray:
+    time.sleep(1.)
+    return _mismatches(donor_codes, recipient_codes, bitsets, mask)
+
+
+def _cached_mismatches(path: str, first_pair: int) -> np.ndarray:
+    rng: np.random.Generator = np.random.default_rng(0)
+    bitsets: np.ndarray = rng.integers(0, 2 ** 63, size=(20, 2), dtype=np.uint64)
+    mask: np.ndarray = np.full(2, np.iinfo(np.uint64).max, dtype=np.uint64)
+    codes: np.ndarray = rng.integers(0, 20, size=(2, 80, 4), dtype=np.int32)
+    # the workers overlap on half of their pairs
+    donor_codes, recipient_codes = codes[0, first_pair:first_pair + 60], codes[1, first_pair:first_pair + 60]
+    return PairResultCache(path).mismatches(
+        donor_codes, recipient_codes, bitsets, mask, "database", partial(_slow_mismatches, bitsets=bitsets, mask=mask)
+    )
+
+
+def test_result_cache_shared_between_processes(tmp_path: str) -> None:
+    path: str = os.path.join(tmp_path, "results.sqlite")
+    with multiprocessing.Pool(3) as pool:
+        results: list[np.ndarray] = pool.starmap(_cached_mismatches, [(path, 0), (path, 10), (path, 20)])
+
+    np.testing.assert_array_equal(results[0][10:], results[1][:50])
+    np.testing.assert_array_equal(results[1][10:], results[2][:50])
+    # a later run reads the same mismatches from the file
+    assert np.array_equal(_cached_mismatches(path, 0), results[0])
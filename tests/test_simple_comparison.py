@@ -3,7 +3,13 @@ import os
 import pandas as pd
 import pytest
 
-from pelc.simple_comparison import simple_comparison
+from pelc.eplet_database import EpletDatabase, default_database
+from pelc.simple_comparison import (  # noqa
+    _simple_comparison_batch_pipeline,  # noqa
+    allele_distance_matrix,
+    batch_simple_comparison,
+    simple_comparison,
+)
 
 
 def in_a6802_but_not_in_a6801(df: pd.DataFrame) -> None:
@@ -174,3 +180,63 @@ def test_simple_comparison_175E() -> None:
     # delete files
     os.remove("tests/pytest_175E_simple_comparison_abv.csv")
     os.remove("tests/pytest_175E_simple_comparison_abv_questionable.csv")
+
+
+def test_simple_comparison_same_as_batch_pipeline() -> None:
+    # The direct lookup in the EpletIndex gives the same output as the batch pipeline
+    database: EpletDatabase = default_database()
+    allele1: str
+    allele2: str
+    for allele1, allele2 in [("A*68:01", "A*68:02"), ("DRB1*01:01", "DRB3*01:01"), ("B*07:02", "B*08:01N")]:
+        for verified_only in [False, True]:
+            comparison = simple_comparison(allele1, allele2, None, verified_only=verified_only)
+            expected = _simple_comparison_batch_pipeline(
+                allele1, allele2, None, verified_only, False, True, database
+            )
+            assert isinstance(comparison, pd.DataFrame)
+            assert isinstance(expected, pd.DataFrame)
+            assert comparison.equals(expected)
+
+
+def test_batch_simple_comparison() -> None:
+    pairs: list[tuple[str, str]] = [
+        ("A*68:01", "A*68:02"), ("DQA1*06:01", "DQA1*05:01"), ("A*68:01", "A*99:99"), ("A*68:01", "A*68:02")
+    ]
+    comparison: pd.DataFrame = batch_simple_comparison(pairs, verified_only=True, include_questionable=True,
+                                                       details=True)
+
+    assert len(comparison) == 4
+    assert pd.isna(comparison.loc[2, "Eplet Load 1 not 2"])
+    row: int
+    for row in [0, 1]:
+        allele1, allele2 = pairs[row]
+        expected = simple_comparison(allele1, allele2, None, verified_only=True, include_questionable=True)
+        assert isinstance(expected, pd.DataFrame)
+        assert comparison.loc[row, "Eplet Load 1 not 2"] == expected.iloc[0]["Eplet Load"]
+        assert comparison.loc[row, "Eplet Load 2 not 1"] == expected.iloc[1]["Eplet Load"]
+        assert comparison.loc[row, "EpMismatches 1 not 2"] == expected.iloc[0]["EpMismatches"]
+        assert comparison.loc[row, "EpMismatches 2 not 1"] == expected.iloc[1]["EpMismatches"]
+    assert comparison.loc[3, "EpMismatches 1 not 2"] == comparison.loc[0, "EpMismatches 1 not 2"]
+
+    with pytest.raises(ValueError):
+        batch_simple_comparison([("A*68:01", "B*07:02")])
+    with pytest.raises(ValueError):
+        batch_simple_comparison([("A*68:01", "A68:02")])
+
+
+def test_allele_distance_matrix(tmp_path: str) -> None:
+    distance_matrix = allele_distance_matrix("DQ", verified_only=True)
+    assert isinstance(distance_matrix, pd.DataFrame)
+    assert "DQB1*" not in distance_matrix.index
+    assert (np.diag(distance_matrix.to_numpy()) == 0).all()
+
+    alleles: list[str] = [allele for allele in distance_matrix.index[::100] if allele.startswith("DQB1")]
+    pairs: list[tuple[str, str]] = [(allele1, allele2) for allele1 in alleles for allele2 in alleles]
+    comparison: pd.DataFrame = batch_simple_comparison(pairs, verified_only=True)
+    assert comparison["Eplet Load 1 not 2"].tolist() == [distance_matrix.loc[pair] for pair in pairs]
+
+    # written to a .npy file
+    output_path: str = os.path.join(tmp_path, "dq")
+    allele_distance_matrix("DQ", output_path, verified_only=True)
+    assert np.array_equal(np.load(f"{output_path}.npy", mmap_mode="r"), distance_matrix.to_numpy())
+    assert pd.read_csv(f"{output_path}_alleles.csv")["Allele"].tolist() == distance_matrix.index.tolist()
@@ -0,0 +1,46 @@
+import os
+import pandas as pd
+
+from pelc.batch_eplet_comp import compute_epletic_load, compute_epletic_load_streaming
+from pelc.output_type import OutputType
+from tests.base_loading_for_tests import base_loading
+
+
+def test_streaming_matches_batch_mode(tmp_path: str) -> None:
+    donordf, recipientdf, _ = base_loading("pytest.xlsx", "False Negs")
+    input_path: str = os.path.join(tmp_path, "typings.csv")
+    pd.concat([donordf, recipientdf], axis=1).to_csv(input_path)
+
+    output_path: str = os.path.join(tmp_path, "output")
+    expected_output_path: str = os.path.join(tmp_path, "expected")
+    compute_epletic_load_streaming(input_path, output_path, OutputType.DETAILS_AND_COUNT, chunk_size=500)
+    compute_epletic_load(donordf.copy(), recipientdf.copy(), expected_output_path, OutputType.DETAILS_AND_COUNT)
+    compute_epletic_load(
+        donordf.copy(), recipientdf.copy(), expected_output_path, OutputType.FILTERED_OUT_TYPINGS
+    )
+
+    suffix: str
+    for suffix in ["", "_removed_donors", "_removed_recipients"]:
+        assert pd.read_csv(f"{output_path}{suffix}.csv").equals(pd.read_csv(f"{expected_output_path}{suffix}.csv"))
+    assert len(pd.read_csv(f"{output_path}_removed_donors.csv")) == 1
+
+
+def test_streaming_iterable_of_dataframes(tmp_path: str) -> None:
+    donordf, recipientdf, _ = base_loading("pytest_standard_input.xlsx", "My Sheet")
+    typings: pd.DataFrame = pd.concat([donordf, recipientdf], axis=1)
+
+    output_path: str = os.path.join(tmp_path, "output")
+    compute_epletic_load_streaming(
+        (typings.iloc[start:start + 500] for start in range(0, len(typings), 500)),
+        output_path,
+        OutputType.COUNT,
+        exclude=[typings.index[0]],
+    )
+
+    expected: pd.Series | None = compute_epletic_load(  # type: ignore[assignment]
+        donordf.drop(typings.index[0]), recipientdf.drop(typings.index[0]), None, OutputType.COUNT
+    )
+    assert isinstance(expected, pd.Series)
+    streamed: pd.DataFrame = pd.read_csv(f"{output_path}.csv", index_col=0)
+    assert streamed["Eplet Load"].tolist() == expected.tolist()
+    assert streamed.index.tolist() == expected.index.tolist()
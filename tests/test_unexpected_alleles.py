@@ -50,3 +50,33 @@ def test_unexpected_alleles() -> None:
 
     os.remove(f"{output_path}_removed_donors.csv")
     os.remove(f"{output_path}_removed_recipients.csv")
+
+
+def test_removal_reasons() -> None:
+    input_df_donor: pd.DataFrame = pd.DataFrame(
+        {
+            "A1_D": ["A*01:01", "A*01:01", "A*99:99", "A*01:01"],
+            "DQB11_D": ["DQB1*03:01", "DQA1*05:01", "DQB1*03:01", "not an allele"],
+        },
+        index=[1, 2, 3, 4]
+    )
+    input_df_recipient: pd.DataFrame = pd.DataFrame(
+        {"A1_R": ["A*01:01"] * 4, "DQB11_R": ["DQB1*03:01"] * 4}, index=[1, 2, 3, 4]
+    )
+
+    removed_donors: pd.DataFrame
+    removed_recipients: pd.DataFrame
+    removed_donors, removed_recipients = compute_epletic_load(  # type: ignore
+        input_df_donor,
+        input_df_recipient,
+        None,
+        OutputType.FILTERED_OUT_TYPINGS,
+        simple_comparison=True
+    )
+
+    assert removed_donors["Reason"].to_dict() == {
+        2: "DQB11_D: allele of another locus than its column (DQA1*05:01)",
+        3: "A1_D: allele not found in the EpRegistry database (A*99:99)",
+        4: "DQB11_D: malformed allele name (not an allele)",
+    }
+    assert len(removed_recipients) == 0